@@ -0,0 +1,84 @@
+"""
+4단계 기여도(attribution) 계산: gradient × input / integrated gradients (CPU)
+- 단어 임베딩(inputs_embeds)에 대한 대상 레이블 logit 의 기울기로 토큰별 기여도 계산
+- 대상 레이블: 입력에 대한 모델 예측 레이블
+- integrated gradients: 기준 입력([CLS]/[SEP] 등 특수 토큰은 그대로, 나머지는 [PAD])에서 실제 입력까지
+  steps 개 보간점을 한 배치로 만들어 forward/backward 한 번에 계산 (중점 리만 합)
+- 결과는 CLS Attention 과 같은 토큰별 점수 배열이라 4단계의 토큰/단어 집계를 그대로 사용
+"""
+
+import torch
+
+ATTRIBUTION_METHODS = ('grad_x_input', 'integrated_gradients')
+
+
+def _split_inputs(model, model_inputs):
+    """(단어 임베딩 [1, 길이, 차원], input_ids 를 뺀 나머지 입력)"""
+    embeddings = model.get_input_embeddings()(model_inputs['input_ids']).detach()
+    other_inputs = {k: v for k, v in model_inputs.items() if k != 'input_ids'}
+    return embeddings, other_inputs
+
+
+def baseline_ids(tokenizer, input_ids):
+    """integrated gradients 기준 입력: 특수 토큰은 유지하고 나머지 토큰은 [PAD]"""
+    special = torch.isin(input_ids, torch.tensor(tokenizer.all_special_ids))
+    return torch.where(special, input_ids, torch.full_like(input_ids, tokenizer.pad_token_id))
+
+
+def gradient_x_input(model, model_inputs, target=None):
+    """
+    gradient × input (입력 1개, 배치 1)
+    - 반환: (토큰별 기여도 [길이], 대상 레이블 id)
+    """
+    embeddings, other_inputs = _split_inputs(model, model_inputs)
+    embeddings.requires_grad_(True)
+
+    logits = model(inputs_embeds=embeddings, **other_inputs).logits
+    if target is None:
+        target = int(logits[0].argmax())
+    grad, = torch.autograd.grad(logits[0, target], embeddings)
+    return (grad * embeddings).sum(dim=-1)[0].detach(), target
+
+
+def integrated_gradients(model, tokenizer, model_inputs, target=None, steps=32):
+    """
+    integrated gradients (입력 1개, 배치 1) - 보간점 steps 개를 한 배치로 forward/backward
+    - 반환: (토큰별 기여도 [길이], 대상 레이블 id)
+    """
+    embeddings, other_inputs = _split_inputs(model, model_inputs)
+    baseline = model.get_input_embeddings()(baseline_ids(tokenizer, model_inputs['input_ids'])).detach()
+
+    if target is None:
+        with torch.no_grad():
+            target = int(model(inputs_embeds=embeddings, **other_inputs).logits[0].argmax())
+
+    alphas = (torch.arange(steps, dtype=embeddings.dtype) + 0.5) / steps
+    path = (baseline + alphas[:, None, None] * (embeddings - baseline)).requires_grad_(True)
+    path_inputs = {k: v.expand(steps, *v.shape[1:]) for k, v in other_inputs.items()}
+
+    logits = model(inputs_embeds=path, **path_inputs).logits
+    grads, = torch.autograd.grad(logits[:, target].sum(), path)
+    return ((embeddings - baseline)[0] * grads.mean(dim=0)).sum(dim=-1).detach(), target
+
+
+def token_attributions(model, tokenizer, model_inputs, method='integrated_gradients', steps=32):
+    """
+    배치 입력의 토큰별 기여도 (numpy [배치, 길이], 패딩 위치는 0)
+    - 행마다 패딩을 잘라낸 입력 1개씩 계산
+    """
+    if method not in ATTRIBUTION_METHODS:
+        raise ValueError(f"알 수 없는 기여도 방법: {method} (선택: {', '.join(ATTRIBUTION_METHODS)})")
+
+    input_ids = model_inputs['input_ids']
+    mask = model_inputs.get('attention_mask', torch.ones_like(input_ids))
+    scores = torch.zeros(input_ids.shape, dtype=torch.float32)
+
+    for row in range(len(input_ids)):
+        length = int(mask[row].sum())
+        single = {k: v[row:row + 1, :length] for k, v in model_inputs.items()}
+        if method == 'grad_x_input':
+            attribution, _ = gradient_x_input(model, single)
+        else:
+            attribution, _ = integrated_gradients(model, tokenizer, single, steps=steps)
+        scores[row, :length] = attribution.float()
+    return scores.numpy()
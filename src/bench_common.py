@@ -0,0 +1,89 @@
+"""
+벤치마크 공통 도구
+- 합성 Q/A 문장(SAMPLE_LINES), TXT 문서 / 합성 문서 로드, 평가 문장 표본, 작은 BERT 모델 생성
+- bench_*.py 와 test_*.py 에서 import 해서 사용
+"""
+
+import os
+import random
+
+from step2_morpheme_analysis import extract_qa_turns
+
+SAMPLE_LINES = [
+    "Q) 오늘 VR 체험은 어떠셨나요?",
+    "A) 처음에는 조금 어지러웠는데 금방 적응했어요.",
+    "Q) 상담사와 대화하면서 불안감이 줄어들었나요?",
+    "A) 네, 마음이 많이 편안해졌습니다. 다음에도 참여하고 싶어요.",
+    "A) 솔직히 너무 답답하고 화가 났어요.",
+    "A) 별로 달라진 건 없는 것 같아요.",
+]
+
+
+def synthetic_documents(count, lines=40, vary=0):
+    """합성 문서 count 개 (i 번째 문서는 lines + i % vary 줄, 시작 줄을 하나씩 밀어 가며 생성)"""
+    documents = []
+    for i in range(count):
+        line_count = lines + (i % vary if vary else 0)
+        documents.append('\n'.join(SAMPLE_LINES[(i + j) % len(SAMPLE_LINES)] for j in range(line_count)))
+    return documents
+
+
+def load_txt_documents(txt_folder="data/txt_files"):
+    """TXT 폴더의 문서 (파일명 순, 빈 문서 제외, 폴더가 없으면 빈 리스트)"""
+    if not os.path.isdir(txt_folder):
+        return []
+
+    documents = []
+    for txt_file in sorted(f for f in os.listdir(txt_folder) if f.endswith('.txt')):
+        with open(os.path.join(txt_folder, txt_file), 'r', encoding='utf-8') as f:
+            documents.append(f.read())
+    return [d for d in documents if d]
+
+
+def load_documents(txt_folder="data/txt_files", count=64, lines=40, vary=0):
+    """TXT 문서 → 없으면 합성 문서"""
+    return load_txt_documents(txt_folder) or synthetic_documents(count, lines, vary)
+
+
+def load_sentences(txt_folder="data/txt_files", sample_size=256, seed=0):
+    """평가용 문장 표본 (Q/A 발화 → 없으면 합성 문장)"""
+    sentences = []
+    for text in load_txt_documents(txt_folder):
+        sentences.extend(turn['text'].strip() for turn in extract_qa_turns(text)['turns'])
+    sentences = list(dict.fromkeys(s for s in sentences if s))
+
+    if not sentences:
+        rng = random.Random(seed)
+        sentences = [' '.join(rng.sample(SAMPLE_LINES, rng.randrange(1, 4))) for _ in range(sample_size)]
+
+    rng = random.Random(seed)
+    return rng.sample(sentences, min(sample_size, len(sentences)))
+
+
+def make_tiny_model(path, texts, seed=0):
+    """평가 문장의 글자로 어휘를 만든 작은 BERT 분류 모델을 무작위 초기화해 저장"""
+    import torch
+    from tokenizers import Tokenizer, models, normalizers, pre_tokenizers, processors, decoders
+    from transformers import BertConfig, BertForSequenceClassification, PreTrainedTokenizerFast
+
+    chars = sorted({c for text in texts for c in text if not c.isspace()})
+    vocab = ['[PAD]', '[UNK]', '[CLS]', '[SEP]', '[MASK]'] + chars + ['##' + c for c in chars]
+    vocab = {token: i for i, token in enumerate(vocab)}
+
+    tokenizer = Tokenizer(models.WordPiece(vocab=vocab, unk_token='[UNK]'))
+    tokenizer.normalizer = normalizers.BertNormalizer(lowercase=False)
+    tokenizer.pre_tokenizer = pre_tokenizers.BertPreTokenizer()
+    tokenizer.post_processor = processors.TemplateProcessing(
+        single='[CLS] $A [SEP]', special_tokens=[('[CLS]', vocab['[CLS]']), ('[SEP]', vocab['[SEP]'])])
+    tokenizer.decoder = decoders.WordPiece()
+    PreTrainedTokenizerFast(tokenizer_object=tokenizer, unk_token='[UNK]', pad_token='[PAD]', cls_token='[CLS]',
+                            sep_token='[SEP]', mask_token='[MASK]', model_max_length=512).save_pretrained(path)
+
+    torch.manual_seed(seed)
+    config = BertConfig(vocab_size=len(vocab), hidden_size=64, num_hidden_layers=2, num_attention_heads=4,
+                        intermediate_size=128, max_position_embeddings=512, num_labels=3,
+                        initializer_range=0.2,  # 무작위 모델에서도 레이블이 한쪽으로 몰리지 않도록
+                        id2label={0: 'LABEL_0', 1: 'LABEL_1', 2: 'LABEL_2'},
+                        label2id={'LABEL_0': 0, 'LABEL_1': 1, 'LABEL_2': 2})
+    BertForSequenceClassification(config).save_pretrained(path)
+    return path
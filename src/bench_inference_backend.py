@@ -0,0 +1,72 @@
+"""
+추론 백엔드 비교: 정확도(fp32 대비 레이블 일치율) vs 지연 시간 (CPU)
+- torch fp32 결과를 기준으로 torch_int8 / onnx / onnx_int8 의 레이블 일치율, 확률 차이, 처리량 측정
+- 평가 문장: data/txt_files 의 Q/A 발화 중 일부 (학습에 쓰지 않은 held-out 표본), 없으면 합성 문장
+- --tiny: 작은 BERT 를 로컬에서 무작위 초기화해 사용 (모델 다운로드 없이 동작 확인용)
+- 실행: python src/bench_inference_backend.py [모델 이름 또는 경로 | --tiny]
+"""
+
+import os
+import sys
+import time
+import tempfile
+
+import torch
+
+from bench_common import load_sentences, make_tiny_model
+from bert_model_service import MODEL_NAME, BertModelService
+from inference_backend import BACKENDS
+
+
+def predict(service, sentences, batch_size):
+    """(확률 배열, 소요 시간) - 길이순 배치"""
+    order = sorted(range(len(sentences)), key=lambda i: len(sentences[i]))
+    probs = torch.zeros(len(sentences), service.config.num_labels)
+
+    start = time.perf_counter()
+    for i in range(0, len(order), batch_size):
+        bucket = order[i:i + batch_size]
+        encoded = service.tokenizer([sentences[j] for j in bucket], truncation=True, padding=True,
+                                    return_tensors="pt")
+        probs[bucket] = torch.softmax(service.logits(encoded).float(), dim=-1)
+    return probs, time.perf_counter() - start
+
+
+def main():
+    sentences = load_sentences()
+    model_name = MODEL_NAME
+    temp_dir = None
+
+    if len(sys.argv) > 1 and sys.argv[1] == '--tiny':
+        temp_dir = tempfile.TemporaryDirectory()
+        model_name = make_tiny_model(temp_dir.name, sentences)
+    elif len(sys.argv) > 1:
+        model_name = sys.argv[1]
+
+    onnx_folder = os.path.join(temp_dir.name, 'onnx') if temp_dir else None
+    print(f"평가 문장 {len(sentences)}개 | torch 스레드 {torch.get_num_threads()}개")
+
+    baseline = None
+    for backend in BACKENDS:
+        try:
+            service = BertModelService(model_name, backend, onnx_folder=onnx_folder)
+        except ImportError as e:
+            print(f"{backend:<11}: 건너뜀 ({e})")
+            continue
+
+        predict(service, sentences[:8], 8)  # 준비 실행 (첫 호출 지연 제외)
+        probs, elapsed = predict(service, sentences, batch_size=16)
+        if baseline is None:
+            baseline = probs
+
+        agreement = (probs.argmax(dim=1) == baseline.argmax(dim=1)).float().mean().item()
+        max_diff = (probs - baseline).abs().max().item()
+        print(f"{backend:<11}: {len(sentences) / elapsed:8.1f} 문장/초 | "
+              f"fp32 레이블 일치 {agreement * 100:5.1f}% | 최대 확률 차이 {max_diff:.4f}")
+
+    if temp_dir:
+        temp_dir.cleanup()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+"""
+1단계 벤치마크: HWP 섹션 텍스트 추출 성능 비교
+- 합성 BodyText 섹션을 만들어 기존 추출기(legacy)와 현재 HWPParser 를 비교
+- 실행: python src/bench_step1_hwp_parser.py
+"""
+
+import random
+import struct
+import time
+import zlib
+
+from bench_common import SAMPLE_LINES
+from step1_hwp_to_txt_olefile import HWPParser, scan_text_code_units
+
+HWPTAG_PARA_HEADER = 66
+HWPTAG_PARA_TEXT = 67
+HWPTAG_PARA_CHAR_SHAPE = 68
+
+
+def legacy_extract_text_from_section(data):
+    """기존 3단계 추출기 (비교 기준, 압축 해제된 데이터를 입력으로 받음)"""
+    texts = []
+
+    # 방법 1: HWP 레코드 구조 파싱
+    pos = 0
+    while pos < len(data) - 4:
+        try:
+            header = struct.unpack('<I', data[pos:pos+4])[0]
+            tag_id = header & 0x3FF
+            size = (header >> 20) & 0xFFF
+            pos += 4
+
+            if size == 0xFFF:
+                if pos + 4 <= len(data):
+                    size = struct.unpack('<I', data[pos:pos+4])[0]
+                    pos += 4
+
+            if tag_id == HWPTAG_PARA_TEXT:
+                if pos + size <= len(data):
+                    text_data = data[pos:pos+size]
+                    try:
+                        text = text_data.decode('utf-16le', errors='ignore')
+                        text = ''.join(c for c in text if c.isprintable() or c in '\n\r\t ')
+                        if text.strip():
+                            texts.append(text.strip())
+                    except:
+                        pass
+
+            pos += size
+        except:
+            pos += 1
+            continue
+
+    # 방법 2: UTF-16LE 디코딩
+    if not texts:
+        try:
+            decoded = data.decode('utf-16le', errors='ignore')
+            cleaned = ''.join(c for c in decoded if c.isprintable() or c in '\n\r\t ')
+            if cleaned.strip():
+                texts.append(cleaned.strip())
+        except:
+            pass
+
+    # 방법 3: 바이트 패턴 검색
+    if not texts:
+        texts.extend(legacy_scan_byte_pattern(data))
+
+    return '\n'.join(texts)
+
+
+def legacy_scan_byte_pattern(data):
+    """기존 방법 3 (2바이트마다 struct.unpack 후 범위 비교)"""
+    text_parts = []
+    i = 0
+    while i < len(data) - 1:
+        try:
+            char_code = struct.unpack('<H', data[i:i+2])[0]
+            if (0xAC00 <= char_code <= 0xD7A3) or \
+               (0x0020 <= char_code <= 0x007E) or \
+               (0x3000 <= char_code <= 0x9FFF):
+                text_parts.append(chr(char_code))
+            elif char_code == 0x000D:
+                text_parts.append('\n')
+            i += 2
+        except:
+            i += 1
+
+    if text_parts:
+        text = ''.join(text_parts)
+        return [line.strip() for line in text.split('\n') if line.strip()]
+    return []
+
+
+def make_corrupted_data(size, seed=0):
+    """레코드 구조가 깨진 데이터 (무작위 바이트 사이에 UTF-16 문장 조각)"""
+    rng = random.Random(seed)
+    parts = []
+    total = 0
+    while total < size:
+        if rng.random() < 0.5:
+            chunk = rng.randbytes(rng.randrange(2, 64))
+        else:
+            chunk = (rng.choice(SAMPLE_LINES) + '\r').encode('utf-16le')
+        parts.append(chunk)
+        total += len(chunk)
+    return b''.join(parts)
+
+
+def make_record(tag_id, payload, level=0):
+    """HWP 레코드 한 개 생성 (4095 바이트 이상은 확장 크기 사용)"""
+    if len(payload) >= 0xFFF:
+        header = struct.pack('<II', tag_id | (level << 10) | (0xFFF << 20), len(payload))
+    else:
+        header = struct.pack('<I', tag_id | (level << 10) | (len(payload) << 20))
+    return header + payload
+
+
+def make_section(paragraphs=5000):
+    """합성 BodyText 섹션 (압축 해제 상태)"""
+    records = []
+    for i in range(paragraphs):
+        shift = i % len(SAMPLE_LINES)
+        line = ' '.join(SAMPLE_LINES[shift:] + SAMPLE_LINES[:shift])
+        # 문단 끝 제어문자(0x0D)와 인라인 제어문자(0x0009 탭 / 0x0002 구역 정의)를 섞어 실제 문서와 유사하게 구성
+        text = ('\x02' * 8 if i % 50 == 0 else '') + line + '\t' + '\r'
+        records.append(make_record(HWPTAG_PARA_HEADER, b'\x00' * 22))
+        records.append(make_record(HWPTAG_PARA_TEXT, text.encode('utf-16le'), level=1))
+        records.append(make_record(HWPTAG_PARA_CHAR_SHAPE, b'\x00' * 8, level=1))
+
+    # 확장 크기 레코드 1개 포함
+    long_text = ' '.join(SAMPLE_LINES) * 40
+    records.append(make_record(HWPTAG_PARA_TEXT, long_text.encode('utf-16le'), level=1))
+    return b''.join(records)
+
+
+def compress(data):
+    compressor = zlib.compressobj(9, zlib.DEFLATED, -zlib.MAX_WBITS)
+    return compressor.compress(data) + compressor.flush()
+
+
+def bench(func, arg, repeat=5):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(arg)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = HWPParser(None)
+
+    for paragraphs in (1000, 10000, 50000):
+        raw = make_section(paragraphs)
+        compressed = compress(raw)
+
+        legacy_time, legacy_text = bench(
+            lambda data: legacy_extract_text_from_section(parser.decompress_stream(data)), compressed)
+        new_time, new_text = bench(parser.extract_text_from_section, compressed)
+
+        assert legacy_text == new_text, "추출 결과가 기존 추출기와 다릅니다"
+
+        print(f"문단 {paragraphs:>6}개 ({len(raw) / 1024 / 1024:.1f} MB): "
+              f"legacy {legacy_time * 1000:8.1f} ms | "
+              f"record walker {new_time * 1000:8.1f} ms | "
+              f"x{legacy_time / new_time:.1f}")
+
+    print("\n바이트 패턴 검색 (방법 3, 손상된 데이터)")
+    for size in (64 * 1024, 1024 * 1024, 4 * 1024 * 1024):
+        data = make_corrupted_data(size)
+
+        legacy_time, legacy_lines = bench(legacy_scan_byte_pattern, data, repeat=1)
+        new_time, new_lines = bench(scan_text_code_units, data)
+
+        assert legacy_lines == new_lines, "바이트 패턴 검색 결과가 기존과 다릅니다"
+
+        print(f"{size / 1024:>6.0f} KB: "
+              f"legacy {legacy_time * 1000:8.1f} ms | "
+              f"numpy {new_time * 1000:8.1f} ms | "
+              f"x{legacy_time / new_time:.1f}")
+
+
+if __name__ == "__main__":
+    main()
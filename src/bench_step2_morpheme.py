@@ -0,0 +1,111 @@
+"""
+2단계 벤치마크: 형태소 추출 처리량 비교 (문서/초, 토큰/초)
+- 기존 방식: 문서마다 mecab.pos() + startswith 분기
+- 배치 방식: extract_morphemes_batch (여러 문서를 한 번에 태깅 + 태그 → 버킷 표 조회)
+- Q/A 구간 추출: 기존 extract_qa_sections + get_qa_statistics (전체 3회 검색) vs extract_qa_turns
+- data/txt_files 의 TXT 를 사용하고, 없으면 합성 문서를 사용
+- 실행: python src/bench_step2_morpheme.py
+"""
+
+import re
+import time
+
+from bench_common import load_documents
+from step2_morpheme_analysis import QAMorphemeAnalyzer, extract_qa_turns, join_qa_turns
+
+
+def legacy_extract_morphemes(analyzer, text):
+    """기존 방식 (비교 기준)"""
+    pos_tags = analyzer.mecab.pos(text)
+    nouns, verbs, adjectives, adverbs, interjections = [], [], [], [], []
+
+    for word, pos in pos_tags:
+        if word in analyzer.stopwords or len(word) <= 1:
+            continue
+
+        if pos.startswith('NN'):
+            nouns.append(word)
+        elif pos.startswith('VV'):
+            verbs.append(word)
+        elif pos.startswith('VA'):
+            adjectives.append(word)
+        elif pos.startswith('MA'):
+            adverbs.append(word)
+        elif pos.startswith('IC'):
+            interjections.append(word)
+
+    return {
+        'nouns': nouns, 'verbs': verbs, 'adjectives': adjectives,
+        'adverbs': adverbs, 'interjections': interjections
+    }, len(pos_tags)
+
+
+def legacy_extract_qa(text):
+    """기존 Q/A 구간 추출 + 통계 (비교 기준)"""
+    qa_lines = []
+    qa_pattern = re.compile(r'^[\s]*(Q|Q\)|Q:|질문|Q：|A|A\)|A:|답변|A：)', re.IGNORECASE)
+    for line in text.split('\n'):
+        if qa_pattern.match(line.strip()):
+            qa_lines.append(line)
+    
+    cleaned_lines = []
+    for line in qa_lines:
+        cleaned = re.sub(r'^[\s]*(Q|Q\)|Q:|질문|Q：|A|A\)|A:|답변|A：)\s*', '', line)
+        if cleaned.strip():
+            cleaned_lines.append(cleaned)
+    
+    q_count = len(re.findall(r'(Q\)|Q:|질문)', text, re.IGNORECASE))
+    a_count = len(re.findall(r'(A\)|A:|답변)', text, re.IGNORECASE))
+    return '\n'.join(cleaned_lines), {'q_count': q_count, 'a_count': a_count, 'total_qa_sections': q_count + a_count}
+
+
+def bench_qa_extraction(documents, repeat=5):
+    legacy_time = new_time = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        legacy_results = [legacy_extract_qa(text) for text in documents]
+        legacy_time = min(legacy_time, time.perf_counter() - start)
+        
+        start = time.perf_counter()
+        new_results = []
+        for text in documents:
+            qa = extract_qa_turns(text)
+            new_results.append((join_qa_turns(qa['turns']), qa['statistics']))
+        new_time = min(new_time, time.perf_counter() - start)
+    
+    assert legacy_results == new_results, "Q/A 구간 추출 결과가 기존과 다릅니다"
+    print(f"Q/A 구간 추출 : 기존 {legacy_time * 1000:8.1f} ms | extract_qa_turns {new_time * 1000:8.1f} ms | "
+          f"x{legacy_time / new_time:.1f}\n")
+
+
+def main():
+    analyzer = QAMorphemeAnalyzer()
+    documents = load_documents(analyzer.txt_folder, count=200)
+    bench_qa_extraction(documents)
+
+    start = time.perf_counter()
+    legacy_results = []
+    token_count = 0
+    for text in documents:
+        result, tokens = legacy_extract_morphemes(analyzer, text)
+        legacy_results.append(result)
+        token_count += tokens
+    legacy_time = time.perf_counter() - start
+    print(f"기존 방식     : {len(documents) / legacy_time:8.1f} 문서/초 | {token_count / legacy_time:10.0f} 토큰/초")
+
+    for batch_size in (1, 16, 64):
+        start = time.perf_counter()
+        batch_results = analyzer.extract_morphemes_batch(documents, batch_size=batch_size)
+        batch_time = time.perf_counter() - start
+
+        same = sum(
+            all(list(batch[b]) == legacy[b] for b in legacy)
+            for batch, legacy in zip(batch_results, legacy_results)
+        )
+        print(f"배치 크기 {batch_size:>3}  : "
+              f"{len(documents) / batch_time:8.1f} 문서/초 | {token_count / batch_time:10.0f} 토큰/초 | "
+              f"기존 결과와 일치 {same}/{len(documents)}")
+
+
+if __name__ == "__main__":
+    main()
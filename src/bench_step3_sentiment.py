@@ -0,0 +1,48 @@
+"""
+3단계 벤치마크: BERT 감정 분석 처리량 비교 (CPU, 문서/초)
+- 파일별 방식: 문서마다 analyze_bert_based 호출 (배치 크기 1)
+- 배치 방식: analyze_bert_batch (토큰 길이순 정렬 + 배치 추론)
+- data/txt_files 의 TXT 를 사용하고, 없으면 합성 문서를 사용
+- 실행: python src/bench_step3_sentiment.py [모델 이름 또는 경로]
+"""
+
+import sys
+import time
+
+import torch
+
+from bench_common import load_documents
+from step3_sentiment_analysis import SentimentAnalyzer
+
+
+def main():
+    if len(sys.argv) > 1:
+        SentimentAnalyzer.MODEL_NAME = sys.argv[1]
+
+    analyzer = SentimentAnalyzer()
+    # TXT 가 없으면 길이가 서로 다른 합성 문서 (패딩 효과를 보기 위해 줄 수를 바꿔 가며 생성)
+    documents = load_documents(lines=2, vary=12)
+    print(f"문서 {len(documents)}개 | torch 스레드 {torch.get_num_threads()}개 | 장치 CPU")
+
+    analyzer.analyze_bert_based(documents[0])  # 첫 호출 준비 시간 제외
+
+    start = time.perf_counter()
+    loop_results = [analyzer.analyze_bert_based(text) for text in documents]
+    loop_time = time.perf_counter() - start
+    print(f"파일별 방식   : {len(documents) / loop_time:8.1f} 문서/초")
+
+    for batch_size in (8, 16, 32):
+        start = time.perf_counter()
+        batch_results = analyzer.analyze_bert_batch(documents, batch_size=batch_size)
+        batch_time = time.perf_counter() - start
+
+        same = sum(
+            batch is not None and loop is not None and batch['sentiment'] == loop['sentiment']
+            for batch, loop in zip(batch_results, loop_results)
+        )
+        print(f"배치 크기 {batch_size:>3}  : {len(documents) / batch_time:8.1f} 문서/초 | "
+              f"x{loop_time / batch_time:.1f} | 파일별 결과와 레이블 일치 {same}/{len(documents)}")
+
+
+if __name__ == "__main__":
+    main()
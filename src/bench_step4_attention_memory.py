@@ -0,0 +1,115 @@
+"""
+4단계 벤치마크: Attention 추출 방식별 최대 메모리(peak RSS) / 처리 시간 비교 (CPU)
+- full: output_attentions=True 로 모든 층의 Attention 을 만든 뒤 마지막 층 CLS 행 사용 (기존 방식)
+- cls : SDPA forward + 마지막 층 CLS 행만 다시 계산 (BertModelService.cls_attention, lean_attention=True)
+- 모델 최대 길이 윈도우를 배치 크기별로 forward (peak RSS 는 줄지 않으므로 측정마다 새 프로세스에서 실행)
+- --tiny: 작은 BERT 를 로컬에서 무작위 초기화해 사용 (모델 다운로드 없이 동작 확인용)
+- 실행: python src/bench_step4_attention_memory.py [모델 이름 또는 경로 | --tiny]
+"""
+
+import os
+import sys
+import json
+import time
+import resource
+import tempfile
+import subprocess
+
+import torch
+
+from bert_model_service import MODEL_NAME, BertModelService
+
+MODES = ('full', 'cls')
+BATCH_SIZES = (1, 8, 32)
+
+
+def peak_rss_mb():
+    """현재 프로세스의 최대 RSS (MB, Linux 는 KB 단위, macOS 는 바이트 단위)"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def make_inputs(service, batch_size, seed=0):
+    """모델 최대 길이의 무작위 윈도우 배치 (첫 토큰은 [CLS])"""
+    tokenizer = service.tokenizer
+    length = service.max_model_length()
+    generator = torch.Generator().manual_seed(seed)
+
+    input_ids = torch.randint(len(tokenizer.all_special_ids), service.config.vocab_size,
+                              (batch_size, length), generator=generator)
+    input_ids[:, 0] = tokenizer.cls_token_id
+    input_ids[:, -1] = tokenizer.sep_token_id
+    inputs = {'input_ids': input_ids, 'attention_mask': torch.ones_like(input_ids)}
+    if 'token_type_ids' in tokenizer.model_input_names:
+        inputs['token_type_ids'] = torch.zeros_like(input_ids)
+    return inputs
+
+
+def cls_attention(service, mode, inputs):
+    if mode == 'cls':
+        return service.cls_attention(inputs)[0]
+    with torch.no_grad():
+        outputs = service.model(**inputs, output_attentions=True)
+    return outputs.attentions[-1].mean(dim=1)[:, 0, :].cpu().numpy()
+
+
+def run_child(mode, batch_size, model_name):
+    """측정 한 번 (자식 프로세스): 모델 로드 후 배치 forward 의 peak RSS 증가량과 시간"""
+    sys.stdout = open(os.devnull, 'w')  # 모델 로딩 출력 숨김
+    service = BertModelService(model_name)
+    cls_attention(service, mode, make_inputs(service, 1))  # 준비 실행
+    inputs = make_inputs(service, batch_size)
+
+    before = peak_rss_mb()
+    start = time.perf_counter()
+    cls_attention(service, mode, inputs)
+    elapsed = time.perf_counter() - start
+
+    sys.stdout = sys.__stdout__
+    print(json.dumps({'peak_mb': peak_rss_mb(), 'delta_mb': peak_rss_mb() - before, 'seconds': elapsed}))
+
+
+def measure(mode, batch_size, model_name):
+    result = subprocess.run([sys.executable, os.path.abspath(__file__), '--child', mode, str(batch_size), model_name],
+                            capture_output=True, text=True)
+    if result.returncode != 0:
+        return None
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == '--child':
+        run_child(sys.argv[2], int(sys.argv[3]), sys.argv[4])
+        return
+
+    model_name = MODEL_NAME
+    temp_dir = None
+    if len(sys.argv) > 1 and sys.argv[1] == '--tiny':
+        from bench_common import load_sentences, make_tiny_model
+        temp_dir = tempfile.TemporaryDirectory()
+        model_name = make_tiny_model(temp_dir.name, load_sentences())
+    elif len(sys.argv) > 1:
+        model_name = sys.argv[1]
+
+    print(f"모델: {model_name} | torch 스레드 {torch.get_num_threads()}개")
+    for batch_size in BATCH_SIZES:
+        for mode in MODES:
+            result = measure(mode, batch_size, model_name)
+            if result is None:
+                print(f"배치 {batch_size:>3} | {mode:<4}: 실패 (메모리 부족 등)")
+                continue
+            print(f"배치 {batch_size:>3} | {mode:<4}: peak RSS {result['peak_mb']:8.1f} MB "
+                  f"(forward 중 +{result['delta_mb']:7.1f} MB) | {result['seconds']:.3f}초")
+
+    # 두 방식의 점수가 같은지 확인
+    service = BertModelService(model_name)
+    inputs = make_inputs(service, 2)
+    diff = abs(cls_attention(service, 'full', inputs) - cls_attention(service, 'cls', inputs)).max()
+    print(f"full / cls 점수 최대 차이: {diff:.2e}")
+
+    if temp_dir:
+        temp_dir.cleanup()
+
+
+if __name__ == "__main__":
+    main()
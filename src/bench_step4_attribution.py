@@ -0,0 +1,111 @@
+"""
+4단계 벤치마크: 단어 중요도 방법별 처리 시간 / 충실도 비교 (CPU)
+- attention           : 마지막 층 CLS Attention (기존 방식)
+- grad_x_input        : gradient × input
+- integrated_gradients: 보간점 수별 (한 배치 forward/backward)
+- 충실도: 점수 상위 20% 토큰을 [PAD] 로 바꿨을 때 예측 레이블 확률 감소량 (클수록 중요한 토큰을 잘 찾음, 무작위 선택과 비교)
+- integrated gradients 는 완전성 오차 |기여도 합 - (f(입력) - f(기준 입력))| / |f(입력) - f(기준 입력)| 도 표시
+- --tiny: 작은 BERT 를 로컬에서 무작위 초기화해 사용 (모델 다운로드 없이 동작 확인용)
+- 실행: python src/bench_step4_attribution.py [모델 이름 또는 경로 | --tiny]
+"""
+
+import sys
+import time
+import tempfile
+
+import numpy as np
+import torch
+
+from attribution import baseline_ids, gradient_x_input, integrated_gradients
+from bench_common import load_sentences, make_tiny_model
+from bert_model_service import MODEL_NAME, BertModelService
+
+IG_STEPS = (16, 32, 64)
+REMOVE_RATIO = 0.2
+
+
+def target_probs(service, input_ids_list, target):
+    """input_ids 목록 각각의 대상 레이블 확률"""
+    with torch.no_grad():
+        logits = service.model(input_ids=torch.stack(input_ids_list)).logits
+    return torch.softmax(logits, dim=-1)[:, target].numpy()
+
+
+def comprehensiveness(service, input_ids, scores, target, rng):
+    """(상위 점수 토큰 제거 시 확률 감소, 같은 수의 무작위 토큰 제거 시 확률 감소)"""
+    special = np.isin(input_ids.numpy(), service.tokenizer.all_special_ids)
+    candidates = np.flatnonzero(~special)
+    if not len(candidates):
+        return 0.0, 0.0
+
+    count = max(1, int(len(candidates) * REMOVE_RATIO))
+    top = candidates[np.argsort(-scores[candidates], kind='stable')[:count]]
+    random = rng.choice(candidates, count, replace=False)
+
+    removed = []
+    for positions in (top, random):
+        ids = input_ids.clone()
+        ids[positions] = service.tokenizer.pad_token_id
+        removed.append(ids)
+    full, top_removed, random_removed = target_probs(service, [input_ids] + removed, target)
+    return full - top_removed, full - random_removed
+
+
+def completeness_gap(service, model_inputs, attribution, target):
+    with torch.no_grad():
+        logits = service.model(input_ids=torch.cat([model_inputs['input_ids'],
+                                                    baseline_ids(service.tokenizer, model_inputs['input_ids'])])).logits
+    difference = float(logits[0, target] - logits[1, target])
+    return abs(float(attribution.sum()) - difference) / max(abs(difference), 1e-6)
+
+
+def main():
+    sentences = load_sentences(sample_size=32)
+    model_name = MODEL_NAME
+    temp_dir = None
+    if len(sys.argv) > 1 and sys.argv[1] == '--tiny':
+        temp_dir = tempfile.TemporaryDirectory()
+        model_name = make_tiny_model(temp_dir.name, sentences)
+    elif len(sys.argv) > 1:
+        model_name = sys.argv[1]
+
+    service = BertModelService(model_name)
+    methods = [('attention', None), ('grad_x_input', None)] + [('integrated_gradients', steps) for steps in IG_STEPS]
+    print(f"문장 {len(sentences)}개 | torch 스레드 {torch.get_num_threads()}개 | 상위 {REMOVE_RATIO:.0%} 토큰 제거")
+
+    for name, steps in methods:
+        rng = np.random.default_rng(0)
+        elapsed, drops, random_drops, gaps = 0.0, [], [], []
+        for sentence in sentences:
+            model_inputs = dict(service.tokenizer(sentence, return_tensors="pt", truncation=True))
+            with torch.no_grad():
+                target = int(service.model(**model_inputs).logits[0].argmax())
+
+            start = time.perf_counter()
+            if name == 'attention':
+                scores = service.cls_attention(model_inputs)[0][0]
+            elif name == 'grad_x_input':
+                scores = gradient_x_input(service.model, model_inputs, target)[0].numpy()
+            else:
+                attribution, _ = integrated_gradients(service.model, service.tokenizer, model_inputs, target, steps)
+                scores = attribution.numpy()
+                gaps.append(completeness_gap(service, model_inputs, attribution, target))
+            elapsed += time.perf_counter() - start
+
+            drop, random_drop = comprehensiveness(service, model_inputs['input_ids'][0], scores, target, rng)
+            drops.append(drop)
+            random_drops.append(random_drop)
+
+        label = name if steps is None else f"{name}({steps})"
+        line = (f"{label:<26}: {elapsed / len(sentences) * 1000:8.1f} ms/문장 | "
+                f"확률 감소 {np.mean(drops):.4f} (무작위 {np.mean(random_drops):.4f})")
+        if gaps:
+            line += f" | 완전성 오차 {np.mean(gaps):.3f}"
+        print(line)
+
+    if temp_dir:
+        temp_dir.cleanup()
+
+
+if __name__ == "__main__":
+    main()
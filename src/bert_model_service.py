@@ -0,0 +1,235 @@
+"""
+BERT 감정 모델 공유 서비스
+- 토크나이저/모델을 프로세스당 한 번만 로드해 3단계(감정 분석)와 4단계(Attention 랭킹)가 함께 사용
+- forward 한 번 (output_attentions=True) 으로 감정 레이블/신뢰도와 CLS Attention 을 함께 계산
+- 감정 분류는 추론 백엔드 선택 가능 (inference_backend 참고), Attention 은 항상 PyTorch fp32 모델 사용
+- fp32 모델은 torch 백엔드이거나 Attention/기여도 계산에 필요할 때만 메모리에 둠 (그 외 백엔드는 설정만 로드)
+"""
+
+import os
+import threading
+from contextlib import contextmanager
+
+import torch
+from transformers import AutoConfig, AutoTokenizer, AutoModelForSequenceClassification, pipeline
+
+from inference_backend import create_backend
+
+MODEL_NAME = "matthewburke/korean_sentiment"
+
+# 레이블 변환 맵 (LABEL_0, 1, 2 또는 POSITIVE/NEGATIVE 등 모든 경우 처리)
+LABEL_MAP = {
+    'POSITIVE': '긍정', 'NEGATIVE': '부정', 'NEUTRAL': '중립',
+    'positive': '긍정', 'negative': '부정', 'neutral': '중립',
+    'LABEL_0': '부정', 'LABEL_1': '중립', 'LABEL_2': '긍정' # <-- 원시 레이블 매핑
+}
+
+# (모델 이름, 백엔드) → 로드된 서비스 (같은 프로세스에서 재사용)
+_services = {}
+
+
+def get_model_service(model_name=MODEL_NAME, backend='torch'):
+    """모델 이름/백엔드별 공유 서비스 반환 (처음 요청할 때만 로드)"""
+    service = _services.get((model_name, backend))
+    if service is None:
+        service = _services[(model_name, backend)] = BertModelService(model_name, backend)
+    return service
+
+
+def model_revision(model_name=MODEL_NAME):
+    """
+    모델을 로드하지 않고 구하는 모델 버전 식별자 (결과 캐시 키용, 알 수 없으면 None)
+    - 로컬 폴더: 파일별 (이름, 크기, 수정 시각)
+    - 허브 모델: 로컬 허브 캐시에 기록된 main 커밋 해시
+    """
+    if os.path.isdir(model_name):
+        return sorted((entry.name, entry.stat().st_size, entry.stat().st_mtime_ns)
+                      for entry in os.scandir(model_name) if entry.is_file())
+
+    try:
+        from huggingface_hub.constants import HF_HUB_CACHE
+        ref_path = os.path.join(HF_HUB_CACHE, 'models--' + model_name.replace('/', '--'), 'refs', 'main')
+        with open(ref_path, 'r', encoding='utf-8') as f:
+            return f.read().strip()
+    except (ImportError, OSError):
+        return None
+
+
+class BertModelService:
+    """토크나이저 + 분류 모델 한 벌 (감정 파이프라인과 Attention 추출이 공유)"""
+
+    def __init__(self, model_name=MODEL_NAME, backend='torch', onnx_folder=None):
+        self.model_name = model_name
+        self.backend_name = backend
+        print(f"\n🤖 BERT 모델 ({model_name}, {backend}) 로딩 중...")
+
+        self.tokenizer = AutoTokenizer.from_pretrained(model_name)
+        self.config = AutoConfig.from_pretrained(model_name)
+        # 로드한 뒤에는 허브 캐시에 기록이 생기므로 여기서 구한 버전으로 ONNX 내보내기가 최신인지 확인
+        self.revision = model_revision(model_name) or getattr(self.config, '_commit_hash', None)
+
+        self._model = None
+        self._attention_lock = threading.Lock()
+        # torch 백엔드는 fp32 모델을 Attention 추출과 공유, 그 외 백엔드는 fp32 모델을 따로 남기지 않음
+        load_model = (lambda: self.model) if backend == 'torch' else self.load_model
+        self.backend = create_backend(backend, load_model, self.tokenizer, model_name, onnx_folder, self.revision)
+        self._pipeline = None
+
+    def load_model(self):
+        """fp32 분류 모델 새로 로드"""
+        # output_attentions=True 로 로드해야 Attention 을 반환하는 구현(eager)이 선택됨
+        model = AutoModelForSequenceClassification.from_pretrained(self.model_name, output_attentions=True)
+        # 기본 forward 는 Attention 을 반환하지 않고, 필요한 호출에서만 요청
+        model.config.output_attentions = False
+        return model.eval()
+
+    @property
+    def model(self):
+        """fp32 PyTorch 모델 (torch 백엔드와 Attention 추출/기여도 계산용, 처음 사용할 때 로드)"""
+        if self._model is None:
+            self._model = self.load_model()
+        return self._model
+
+    @property
+    def pipeline(self):
+        """
+        감정 분류 파이프라인
+        - torch 백엔드: 이미 로드한 모델/토크나이저로 만든 sentiment-analysis 파이프라인
+        - 그 외: 같은 호출 형식의 BackendPipeline
+        - 두 경우 모두 모델 최대 길이에서 자름 (백엔드에 따라 긴 입력의 결과가 달라지지 않도록)
+        """
+        if self._pipeline is None:
+            if self.backend_name == 'torch':
+                self._pipeline = pipeline("sentiment-analysis", model=self.model, tokenizer=self.tokenizer,
+                                          truncation=True)
+            else:
+                self._pipeline = BackendPipeline(self)
+        return self._pipeline
+
+    def logits(self, encoded):
+        """토크나이저 출력(텐서 dict) → 선택한 백엔드의 분류 logits"""
+        return self.backend.logits(encoded)
+
+    def max_model_length(self):
+        """모델이 한 번에 받을 수 있는 토큰 수 (특수 토큰 포함)"""
+        model_length = getattr(self.config, 'max_position_embeddings', 512)
+        return min(self.tokenizer.model_max_length, model_length)
+
+    def label_name(self, label_id):
+        label = self.config.id2label[label_id]
+        return LABEL_MAP.get(label, label)
+
+    def forward(self, text, output_attentions=True):
+        """
+        텍스트 한 개를 모델 최대 길이까지 잘라 forward 한 번 실행
+        - 반환: (토크나이저 입력, 모델 출력)
+        """
+        inputs = self.tokenizer(text, return_tensors="pt", truncation=True, padding=True)
+        with torch.no_grad():
+            outputs = self.model(**inputs, output_attentions=output_attentions)
+        return inputs, outputs
+
+    def last_self_attention(self):
+        """마지막 인코더 층의 self-attention 모듈 (BERT 계열 구조)"""
+        try:
+            return self.model.base_model.encoder.layer[-1].attention.self
+        except AttributeError:
+            raise ValueError(f"CLS Attention 만 추출할 수 없는 모델 구조입니다: {type(self.model).__name__}")
+
+    @contextmanager
+    def attention_implementation(self, name):
+        """
+        fp32 모델의 Attention 구현을 잠시 바꿔 실행 (예: 'sdpa' - Attention 확률 텐서를 만들지 않는 융합 커널)
+        - 구현을 바꿀 수 없는 transformers 버전/모델이면 그대로 실행
+        """
+        model = self.model
+        previous = getattr(model.config, '_attn_implementation', None)
+        if previous == name or not hasattr(model, 'set_attn_implementation'):
+            yield
+            return
+
+        with self._attention_lock:
+            try:
+                model.set_attn_implementation(name)
+            except (ValueError, ImportError):
+                yield
+                return
+            try:
+                yield
+            finally:
+                model.set_attn_implementation(previous)
+
+    def cls_attention(self, model_inputs):
+        """
+        마지막 층 CLS 행 Attention 만 계산 (헤드 평균, shape [배치, 길이]) + 분류 logits
+        - forward 는 SDPA 구현 + Attention 출력 없이 실행 → 어떤 층도 [배치, 헤드, 길이, 길이] 확률 텐서를 만들지 않음
+        - 마지막 self-attention 의 forward pre-hook 에서 입력 hidden states 로 CLS 질의 한 줄의 점수만 다시 계산
+        - output_attentions=True 의 attentions[-1].mean(dim=1)[:, 0, :] 와 같은 값
+        - 반환: (CLS Attention numpy 배열, logits)
+        """
+        if getattr(self.config, 'position_embedding_type', 'absolute') != 'absolute':
+            raise ValueError("상대 위치 임베딩 모델은 CLS Attention 만 따로 계산할 수 없습니다")
+
+        module = self.last_self_attention()
+        mask = model_inputs.get('attention_mask')
+        captured = {}
+
+        def cls_row(_, args, kwargs):
+            hidden_states = args[0] if args else kwargs['hidden_states']
+            batch, length = hidden_states.shape[:2]
+            heads, head_size = module.num_attention_heads, module.attention_head_size
+            query = module.query(hidden_states[:, :1]).view(batch, 1, heads, head_size).transpose(1, 2)
+            key = module.key(hidden_states).view(batch, length, heads, head_size).transpose(1, 2)
+
+            scores = torch.matmul(query, key.transpose(2, 3))[:, :, 0, :] * getattr(module, 'scaling', head_size ** -0.5)
+            if mask is not None:
+                scores = scores.masked_fill(mask[:, None, :] == 0, torch.finfo(scores.dtype).min)
+            captured['cls_attention'] = torch.softmax(scores, dim=-1).mean(dim=1)
+
+        handle = module.register_forward_pre_hook(cls_row, with_kwargs=True)
+        try:
+            with torch.no_grad(), self.attention_implementation('sdpa'):
+                logits = self.model(**model_inputs, output_attentions=False).logits
+        finally:
+            handle.remove()
+
+        return captured['cls_attention'].cpu().numpy(), logits
+
+    def sentiment_from_logits(self, logits):
+        """분류 logits (1개 문서) → {'method', 'sentiment', 'confidence'} (파이프라인 결과와 같은 형식)"""
+        probs = torch.softmax(logits[0], dim=-1)
+        label_id = int(probs.argmax())
+        return {'method': 'bert', 'sentiment': self.label_name(label_id), 'confidence': round(float(probs[label_id]), 3)}
+
+    def analyze(self, text):
+        """
+        forward 한 번으로 감정 결과와 마지막 층 CLS Attention 을 함께 반환
+        - 반환: (감정 결과 dict, 토큰 목록, CLS Attention 배열)
+        """
+        inputs, outputs = self.forward(text, output_attentions=True)
+        cls_attention = outputs.attentions[-1][0].mean(dim=0)[0, :].cpu().numpy()
+        tokens = self.tokenizer.convert_ids_to_tokens(inputs['input_ids'][0])
+        return self.sentiment_from_logits(outputs.logits), tokens, cls_attention
+
+
+class BackendPipeline:
+    """sentiment-analysis 파이프라인과 같은 호출 형식으로 추론 백엔드 실행"""
+
+    def __init__(self, service):
+        self.service = service
+        self.tokenizer = service.tokenizer
+        self.config = service.config
+
+    def __call__(self, inputs, batch_size=None):
+        texts = [inputs] if isinstance(inputs, str) else list(inputs)
+        batch_size = batch_size or 1
+
+        results = []
+        for start in range(0, len(texts), batch_size):
+            encoded = self.tokenizer(texts[start:start + batch_size], truncation=True, padding=True,
+                                     return_tensors="pt")
+            probs = torch.softmax(self.service.logits(encoded).float(), dim=-1)
+            scores, label_ids = probs.max(dim=-1)
+            results.extend({'label': self.config.id2label[int(label_id)], 'score': float(score)}
+                           for score, label_id in zip(scores, label_ids))
+        return results
@@ -0,0 +1,162 @@
+"""
+코퍼스 단어 빈도 색인 (SQLite)
+- 품사 버킷(명사/동사/형용사/부사/감탄사)별 단어의 전체 빈도(TF)와 문서 빈도(DF)를 누적
+- 문서 분석이 끝날 때마다 바로 갱신 (같은 파일을 다시 넣으면 이전 빈도를 빼고 교체)
+- 실행 사이에 유지되므로 _morpheme.json 을 다시 읽지 않고 상위 단어/문서별 빈도/DF 조회 가능
+- 전체 분석 후 현재 파일 목록에 없는 문서(삭제된 TXT)는 prune 으로 제거
+"""
+
+import os
+import time
+import sqlite3
+
+
+class CorpusIndex:
+    """문서별 / 코퍼스 전체 단어 빈도 색인"""
+
+    def __init__(self, path):
+        """path: SQLite 파일 경로"""
+        self.path = path
+
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        self.conn = sqlite3.connect(path, timeout=30)
+        self.conn.executescript(
+            'CREATE TABLE IF NOT EXISTS documents ('
+            ' filename TEXT PRIMARY KEY,'
+            ' token_count INTEGER NOT NULL,'
+            ' updated INTEGER NOT NULL);'
+            'CREATE TABLE IF NOT EXISTS doc_terms ('
+            ' filename TEXT NOT NULL,'
+            ' bucket TEXT NOT NULL,'
+            ' term TEXT NOT NULL,'
+            ' count INTEGER NOT NULL,'
+            ' PRIMARY KEY (filename, bucket, term));'
+            'CREATE TABLE IF NOT EXISTS terms ('
+            ' bucket TEXT NOT NULL,'
+            ' term TEXT NOT NULL,'
+            ' tf INTEGER NOT NULL,'
+            ' df INTEGER NOT NULL,'
+            ' PRIMARY KEY (bucket, term));'
+            'CREATE INDEX IF NOT EXISTS terms_tf ON terms (bucket, tf DESC);'
+            'CREATE INDEX IF NOT EXISTS terms_df ON terms (bucket, df DESC);'
+            'CREATE INDEX IF NOT EXISTS doc_terms_term ON doc_terms (term);'
+        )
+        self.conn.commit()
+
+    def add_document(self, filename, bucket_counts):
+        """
+        문서 한 개의 버킷별 빈도를 반영
+        bucket_counts: {버킷 이름: {단어: 빈도}} (Counter 등)
+        """
+        rows = [(filename, bucket, term, count)
+                for bucket, counts in bucket_counts.items()
+                for term, count in counts.items() if count > 0]
+
+        with self.conn:
+            self._remove(filename)
+            self.conn.executemany(
+                'INSERT INTO doc_terms (filename, bucket, term, count) VALUES (?, ?, ?, ?)', rows)
+            self.conn.executemany(
+                'INSERT INTO terms (bucket, term, tf, df) VALUES (?, ?, ?, 1) '
+                'ON CONFLICT (bucket, term) DO UPDATE SET tf = tf + excluded.tf, df = df + 1',
+                [(bucket, term, count) for _, bucket, term, count in rows])
+            self.conn.execute(
+                'INSERT INTO documents (filename, token_count, updated) VALUES (?, ?, ?)',
+                (filename, sum(row[3] for row in rows), time.time_ns()))
+
+    def remove_document(self, filename):
+        """문서 한 개의 빈도를 색인에서 제거"""
+        with self.conn:
+            self._remove(filename)
+
+    def _remove(self, filename):
+        old_rows = self.conn.execute(
+            'SELECT bucket, term, count FROM doc_terms WHERE filename = ?', (filename,)).fetchall()
+        if old_rows:
+            self.conn.executemany(
+                'UPDATE terms SET tf = tf - ?, df = df - 1 WHERE bucket = ? AND term = ?',
+                [(count, bucket, term) for bucket, term, count in old_rows])
+            self.conn.execute('DELETE FROM terms WHERE df <= 0')
+            self.conn.execute('DELETE FROM doc_terms WHERE filename = ?', (filename,))
+        self.conn.execute('DELETE FROM documents WHERE filename = ?', (filename,))
+
+    def top_terms(self, bucket='nouns', k=20, by='tf'):
+        """코퍼스 전체 상위 k개 단어 [(단어, TF, DF)] (by: 'tf' 또는 'df' 기준 정렬)"""
+        if by not in ('tf', 'df'):
+            raise ValueError(f"정렬 기준은 'tf' 또는 'df' 여야 합니다: {by}")
+        other = 'df' if by == 'tf' else 'tf'
+        return self.conn.execute(
+            f'SELECT term, tf, df FROM terms WHERE bucket = ? ORDER BY {by} DESC, {other} DESC, term LIMIT ?',
+            (bucket, k)).fetchall()
+
+    def document_terms(self, filename, bucket=None, k=None):
+        """
+        문서 한 개의 단어 빈도 (빈도 내림차순)
+        - bucket 지정 시 [(단어, 빈도)], 미지정 시 {버킷: [(단어, 빈도)]}
+        """
+        limit = -1 if k is None else k
+        if bucket is not None:
+            return self.conn.execute(
+                'SELECT term, count FROM doc_terms WHERE filename = ? AND bucket = ? '
+                'ORDER BY count DESC, term LIMIT ?', (filename, bucket, limit)).fetchall()
+
+        result = {}
+        for (name,) in self.conn.execute(
+                'SELECT DISTINCT bucket FROM doc_terms WHERE filename = ? ORDER BY bucket', (filename,)).fetchall():
+            result[name] = self.document_terms(filename, name, k)
+        return result
+
+    def document_frequency(self, term, bucket=None):
+        """단어가 나온 문서 수 (bucket 미지정 시 어느 버킷이든 나온 문서 수)"""
+        if bucket is not None:
+            row = self.conn.execute(
+                'SELECT df FROM terms WHERE bucket = ? AND term = ?', (bucket, term)).fetchone()
+            return row[0] if row else 0
+        return self.conn.execute(
+            'SELECT COUNT(DISTINCT filename) FROM doc_terms WHERE term = ?', (term,)).fetchone()[0]
+
+    def documents_with(self, term, bucket=None):
+        """단어가 나온 문서 파일명 목록"""
+        if bucket is not None:
+            rows = self.conn.execute(
+                'SELECT filename FROM doc_terms WHERE term = ? AND bucket = ? ORDER BY filename', (term, bucket))
+        else:
+            rows = self.conn.execute(
+                'SELECT DISTINCT filename FROM doc_terms WHERE term = ? ORDER BY filename', (term,))
+        return [row[0] for row in rows]
+
+    def documents(self):
+        """색인된 문서 파일명 목록"""
+        return [row[0] for row in self.conn.execute('SELECT filename FROM documents ORDER BY filename')]
+
+    def prune(self, filenames):
+        """filenames 에 없는 문서를 색인에서 제거하고 제거한 파일명 목록 반환 (원본이 삭제된 문서 정리용)"""
+        keep = set(filenames)
+        removed = [filename for filename in self.documents() if filename not in keep]
+        with self.conn:
+            for filename in removed:
+                self._remove(filename)
+        return removed
+
+    def document_count(self):
+        return self.conn.execute('SELECT COUNT(*) FROM documents').fetchone()[0]
+
+    def stats(self):
+        """문서 수와 버킷별 (고유 단어 수, 전체 빈도)"""
+        buckets = {
+            bucket: {'unique_terms': unique_terms, 'total_count': total_count}
+            for bucket, unique_terms, total_count in self.conn.execute(
+                'SELECT bucket, COUNT(*), SUM(tf) FROM terms GROUP BY bucket ORDER BY bucket')
+        }
+        return {'documents': self.document_count(), 'buckets': buckets}
+
+    def clear(self):
+        with self.conn:
+            self.conn.execute('DELETE FROM doc_terms')
+            self.conn.execute('DELETE FROM terms')
+            self.conn.execute('DELETE FROM documents')
+
+    def close(self):
+        self.conn.close()
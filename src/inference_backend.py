@@ -0,0 +1,147 @@
+"""
+BERT 분류 추론 백엔드 (CPU 가속용)
+- torch      : 기본 PyTorch fp32 (기존과 동일)
+- torch_int8 : torch.ao 동적 양자화 (Linear 층 가중치 int8)
+- onnx       : ONNX 로 내보낸 뒤 ONNX Runtime 실행
+- onnx_int8  : ONNX + ONNX Runtime 동적 int8 양자화
+- 모든 백엔드는 토크나이저 출력(텐서 dict) → logits(torch.Tensor) 를 같은 형식으로 반환
+- ONNX 파일은 output/onnx/<모델 이름>/ 에 한 번만 내보내고 재사용 (onnx, onnxruntime 필요)
+  내보낸 원본 모델 버전을 source_revision.json 에 기록해 두고, 버전이 바뀌면 다시 내보냄
+"""
+
+import os
+import re
+import json
+
+import torch
+
+BACKENDS = ('torch', 'torch_int8', 'onnx', 'onnx_int8')
+
+ONNX_FOLDER = "output/onnx"
+
+
+def create_backend(name, load_model, tokenizer, model_name, onnx_folder=None, revision=None):
+    """
+    백엔드 이름으로 추론 백엔드 생성 (onnx_folder 기본값: ONNX_FOLDER)
+    - load_model: fp32 분류 모델을 반환하는 함수 (필요할 때만 호출, onnx 백엔드는 내보낼 때만 로드하고 버림)
+    - revision: 원본 모델 버전 (ONNX 백엔드가 내보낸 파일이 최신인지 확인할 때 사용, bert_model_service.model_revision)
+    """
+    if name not in BACKENDS:
+        raise ValueError(f"알 수 없는 추론 백엔드: {name} (선택: {', '.join(BACKENDS)})")
+
+    if name == 'torch':
+        return TorchBackend(load_model())
+    if name == 'torch_int8':
+        return TorchBackend(quantize_torch_model(load_model()))
+    return OnnxBackend(load_model, tokenizer, model_name, quantize=(name == 'onnx_int8'),
+                       onnx_folder=onnx_folder or ONNX_FOLDER, revision=revision)
+
+
+def quantize_torch_model(model):
+    """Linear 층을 int8 동적 양자화 (복사본을 만들지 않고 넘겨받은 모델을 바로 바꿈 → fp32 모델을 따로 남기지 않음)"""
+    return torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8, inplace=True)
+
+
+class TorchBackend:
+    """PyTorch 모듈 실행 (fp32 또는 동적 양자화 모델)"""
+
+    def __init__(self, model):
+        self.model = model
+        self.model.eval()
+
+    def logits(self, encoded):
+        device = next(self.model.parameters()).device
+        with torch.no_grad():
+            return self.model(**{k: v.to(device) for k, v in encoded.items()}).logits
+
+
+class _LogitsOnly(torch.nn.Module):
+    """ONNX 내보내기용: 위치 인자를 입력 이름에 맞춰 넘기고 logits 만 반환"""
+
+    def __init__(self, model, input_names):
+        super().__init__()
+        self.model = model
+        self.input_names = input_names
+
+    def forward(self, *inputs):
+        return self.model(**dict(zip(self.input_names, inputs))).logits
+
+
+def read_revision(path):
+    """내보낸 ONNX 파일의 원본 모델 버전 (기록이 없으면 None)"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)['revision']
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def write_revision(path, revision):
+    """원본 모델 버전 기록"""
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'revision': revision}, f, ensure_ascii=False)
+
+
+class OnnxBackend:
+    """ONNX Runtime 실행 (필요하면 내보내기 + int8 동적 양자화)"""
+
+    def __init__(self, load_model, tokenizer, model_name, quantize=False, onnx_folder=ONNX_FOLDER, revision=None):
+        try:
+            import onnxruntime
+        except ImportError:
+            raise ImportError("❌ onnxruntime 이 설치되지 않았습니다. 설치: pip install onnx onnxruntime")
+
+        folder = os.path.join(onnx_folder, re.sub(r'[^0-9A-Za-z._-]+', '_', model_name.strip('/')))
+        os.makedirs(folder, exist_ok=True)
+
+        self.input_names = [name for name in tokenizer.model_input_names
+                            if name in tokenizer("준비", return_tensors="pt")]
+        self.onnx_path = os.path.join(folder, 'model.onnx')
+        quantized_path = os.path.join(folder, 'model.int8.onnx')
+        revision_path = os.path.join(folder, 'source_revision.json')
+        revision = json.loads(json.dumps(revision))  # 기록된 값과 비교하도록 튜플 → 리스트
+        if revision is None:
+            print("   ⚠️  원본 모델 버전을 알 수 없어 ONNX 파일을 다시 내보냅니다")
+        if revision is None or read_revision(revision_path) != revision:
+            # 다른 버전(또는 알 수 없는 버전)의 모델에서 내보낸 파일 → 지우고 다시 내보냄
+            for path in (self.onnx_path, quantized_path):
+                if os.path.exists(path):
+                    os.remove(path)
+        if not os.path.exists(self.onnx_path):
+            self.export(load_model(), tokenizer, self.onnx_path)
+            write_revision(revision_path, revision)
+
+        if quantize:
+            if not os.path.exists(quantized_path):
+                from onnxruntime.quantization import quantize_dynamic, QuantType
+                quantize_dynamic(self.onnx_path, quantized_path, weight_type=QuantType.QInt8)
+            self.onnx_path = quantized_path
+
+        options = onnxruntime.SessionOptions()
+        options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self.session = onnxruntime.InferenceSession(self.onnx_path, options, providers=['CPUExecutionProvider'])
+
+    def export(self, model, tokenizer, onnx_path):
+        """배치/길이가 가변인 ONNX 그래프로 내보내기 (임시 파일에 쓴 뒤 교체)"""
+        print(f"   ONNX 내보내기: {onnx_path}")
+        sample = tokenizer(["준비 문장", "길이가 다른 준비 문장입니다"], padding=True, return_tensors="pt")
+        dynamic_axes = {name: {0: 'batch', 1: 'sequence'} for name in self.input_names}
+        dynamic_axes['logits'] = {0: 'batch'}
+
+        part_path = onnx_path + '.part'
+        with torch.no_grad():
+            torch.onnx.export(
+                _LogitsOnly(model, self.input_names).eval(),
+                tuple(sample[name] for name in self.input_names),
+                part_path,
+                input_names=self.input_names,
+                output_names=['logits'],
+                dynamic_axes=dynamic_axes,
+                opset_version=17,
+                dynamo=False,
+            )
+        os.replace(part_path, onnx_path)
+
+    def logits(self, encoded):
+        feeds = {name: encoded[name].cpu().numpy() for name in self.input_names}
+        return torch.from_numpy(self.session.run(['logits'], feeds)[0])
@@ -0,0 +1,151 @@
+"""
+통합 파이프라인: HWP → 형태소 분석 → 감정 분석 → Attention 랭킹 (메모리 내 처리)
+- HWP 파일을 한 번만 파싱하고, 추출한 텍스트를 2~4단계에 바로 전달 (TXT 재읽기 없음)
+- 문서 하나씩 모든 단계를 거쳐 처리 (스트리밍)
+- 중간 결과(TXT / 형태소 JSON / 감정 JSON)는 요청한 경우에만 저장, Attention 결과는 항상 저장
+- BERT 모델은 한 번만 로드해 3/4단계가 공유하고, single_pass 면 forward 한 번으로 감정 + Attention 계산
+"""
+
+import os
+from pathlib import Path
+
+from step1_hwp_to_txt_olefile import HWPParser
+from step2_morpheme_analysis import QAMorphemeAnalyzer
+from step3_sentiment_analysis import SentimentAnalyzer
+from step4_keyword_extraction import BertAttentionRanker
+from bert_model_service import get_model_service
+
+
+class InMemoryPipeline:
+    """HWP 파일을 1~4단계에 연속으로 통과시키는 파이프라인"""
+
+    ARTIFACTS = ('txt', 'morpheme', 'sentiment')
+
+    def __init__(self, input_folder="data/hwp_files",
+                 txt_folder="data/txt_files",
+                 morpheme_folder="output/morpheme",
+                 sentiment_folder="output/sentiment",
+                 attention_folder="output/attention",
+                 persist=(), mode='qa_only', section_workers=None, single_pass=True, backend='torch'):
+        """
+        persist: 저장할 중간 결과 ('txt', 'morpheme', 'sentiment' 중 선택)
+        mode: 형태소 분석 모드 ('qa_only' / 'questions_only' / 'answers_only' / 'all')
+        single_pass: True 면 감정과 Attention 을 forward 한 번으로 계산
+                     (감정 입력이 앞 500자 대신 4단계와 같은 모델 최대 길이 토큰이 됨)
+        backend: 감정 분류 추론 백엔드 (torch 외 백엔드는 Attention 에 쓸 수 없으므로 single_pass 를 끔)
+        """
+        unknown = set(persist) - set(self.ARTIFACTS)
+        if unknown:
+            raise ValueError(f"알 수 없는 중간 결과: {', '.join(sorted(unknown))}")
+
+        self.input_folder = input_folder
+        self.txt_folder = txt_folder
+        self.persist = set(persist)
+        self.mode = mode
+        self.section_workers = section_workers
+        self.single_pass = single_pass and backend == 'torch'
+
+        if 'txt' in self.persist:
+            os.makedirs(txt_folder, exist_ok=True)
+
+        self.morpheme_analyzer = QAMorphemeAnalyzer(txt_folder=txt_folder, output_folder=morpheme_folder)
+        model_service = get_model_service(SentimentAnalyzer.MODEL_NAME, backend)
+        self.sentiment_analyzer = SentimentAnalyzer(morpheme_folder=morpheme_folder, output_folder=sentiment_folder,
+                                                    model_service=model_service)
+        self.ranker = BertAttentionRanker(morpheme_folder=morpheme_folder,
+                                          sentiment_folder=sentiment_folder,
+                                          output_folder=attention_folder,
+                                          model_service=model_service)
+
+    def extract_text(self, hwp_filename):
+        """HWP 파일 한 개에서 텍스트 추출 (유효한 텍스트가 없으면 None)"""
+        parser = HWPParser(os.path.join(self.input_folder, hwp_filename), verbose=False)
+        if not parser.open():
+            print(f"  ❌ {hwp_filename}: {parser.error}")
+            return None
+
+        try:
+            text = parser.extract_all_text(workers=self.section_workers)
+        finally:
+            parser.close()
+
+        if not text or len(text.strip()) < 10:
+            print(f"  ❌ {hwp_filename}: 유효한 텍스트를 찾을 수 없습니다")
+            return None
+        return text
+
+    def iter_documents(self):
+        """(txt 파일명, 텍스트) 를 HWP 파일 순서대로 하나씩 반환"""
+        hwp_files = sorted([f for f in os.listdir(self.input_folder) if f.endswith('.hwp')])
+        for hwp_file in hwp_files:
+            text = self.extract_text(hwp_file)
+            if text:
+                yield Path(hwp_file).stem + '.txt', text
+
+    def process_text(self, txt_filename, text):
+        """텍스트 한 개를 2~4단계에 통과시키고 각 단계 결과를 반환 (실패 시 None)"""
+        if 'txt' in self.persist:
+            with open(os.path.join(self.txt_folder, txt_filename), 'w', encoding='utf-8') as f:
+                f.write(text)
+
+        morpheme_data = self.morpheme_analyzer.analyze_text(text, txt_filename, mode=self.mode)
+        if 'morpheme' in self.persist:
+            self.morpheme_analyzer.save_result(morpheme_data)
+
+        if self.single_pass:
+            bert_result, attention_data = self.ranker.analyze_and_rank(text, morpheme_data)
+            sentiment_data = self.sentiment_analyzer.build_output(txt_filename, text, bert_result)
+        else:
+            sentiment_data = self.sentiment_analyzer.analyze_text(text, txt_filename)
+            attention_data = None
+
+        if not sentiment_data:
+            print(f"  ❌ {txt_filename}: BERT 분석 실패")
+            return None
+        if 'sentiment' in self.persist:
+            self.sentiment_analyzer.save_result(sentiment_data)
+
+        if attention_data is None:
+            attention_data = self.ranker.rank_document(text, morpheme_data, sentiment_data)
+        self.ranker.save_result(attention_data)
+
+        return {
+            'morpheme': morpheme_data,
+            'sentiment': sentiment_data,
+            'attention': attention_data,
+        }
+
+    def run(self):
+        """전체 HWP 파일 처리"""
+        results = []
+        for txt_filename, text in self.iter_documents():
+            print(f"\n 처리 중: {txt_filename}")
+            result = self.process_text(txt_filename, text)
+            if result:
+                attention = result['attention']
+                print(f"   감정: {attention['bert_sentiment']} (신뢰도 {attention['bert_confidence']})")
+                results.append(result)
+
+        print(f"\n✅ 처리 완료: {len(results)}개 문서")
+        return results
+
+
+def main():
+    print("\n 통합 파이프라인: HWP → 형태소 → 감정 → Attention (메모리 내 처리)")
+    try:
+        mode_choice = input("형태소 분석 모드: 1. Q&A 패턴만 / 2. 전체 텍스트 (1-2): ").strip()
+        mode = 'qa_only' if mode_choice == '1' else 'all'
+
+        persist = input("저장할 중간 결과 (txt,morpheme,sentiment / 엔터: 저장 안 함): ").strip()
+        persist = [p.strip() for p in persist.split(',') if p.strip()]
+
+        single_pass = input("감정/Attention 을 forward 한 번으로 계산 (Y/n): ").strip().lower() != 'n'
+
+        pipeline = InMemoryPipeline(persist=persist, mode=mode, single_pass=single_pass)
+        pipeline.run()
+
+    except Exception as e:
+        print(f"\n❌ 오류 발생: {e}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,193 @@
+"""
+분석 결과 캐시 (SQLite)
+- 입력 텍스트/설정의 해시를 키로, 결과를 JSON 으로 저장
+- 전체 크기 제한을 넘으면 가장 오래 사용하지 않은 항목부터 제거 (LRU)
+- 적중/미스 횟수 집계
+- WAL 모드 + 조회 시각(last_used) 갱신은 모아 두었다가 저장할 때 함께 기록 (여러 프로세스가 조회만 할 때 쓰기 잠금 경쟁 없음)
+"""
+
+import os
+import json
+import time
+import hashlib
+import sqlite3
+import threading
+
+# 조회 시각을 이만큼 모으면 쓰기가 없어도 기록
+TOUCH_FLUSH_SIZE = 1000
+
+
+def make_cache_key(*parts):
+    """키 구성 요소(JSON 직렬화 가능한 값들)를 SHA-256 해시 문자열로 변환"""
+    digest = hashlib.sha256()
+    for part in parts:
+        if isinstance(part, str):
+            data = part.encode('utf-8')
+        else:
+            data = json.dumps(part, ensure_ascii=False, sort_keys=True).encode('utf-8')
+        # 구성 요소 경계가 섞이지 않도록 길이를 함께 넣음
+        digest.update(len(data).to_bytes(8, 'little'))
+        digest.update(data)
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """SQLite 기반 LRU 결과 캐시"""
+
+    def __init__(self, path, max_bytes=256 * 1024 * 1024, max_entries=None):
+        """
+        path: SQLite 파일 경로
+        max_bytes: 저장된 결과 JSON 크기 합의 상한
+        max_entries: 항목 수 상한 (None 이면 제한 없음)
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._touched = {}  # 조회된 키 → 조회 시각 (다음 쓰기 때 last_used 로 기록)
+
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        # 여러 프로세스가 같은 파일을 쓸 수 있으므로 잠금 대기 시간을 넉넉히 둠
+        # 다른 스레드(예: 감정 분석 서비스의 추론 스레드)에서도 쓸 수 있도록 연결을 공유하고 잠금으로 보호
+        self.conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._lock = threading.RLock()
+        # WAL: 읽기와 쓰기가 서로 막지 않음 (작업 프로세스 여러 개가 같은 파일을 열어도 조회는 잠금 대기 없음)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute(
+            'CREATE TABLE IF NOT EXISTS cache ('
+            ' key TEXT PRIMARY KEY,'
+            ' value TEXT NOT NULL,'
+            ' size INTEGER NOT NULL,'
+            ' last_used INTEGER NOT NULL)'
+        )
+        self.conn.execute('CREATE INDEX IF NOT EXISTS cache_last_used ON cache (last_used)')
+        self.conn.commit()
+
+    def get(self, key):
+        """캐시 조회 (없으면 None), 조회된 항목은 최근 사용으로 표시 (기록은 다음 쓰기 때)"""
+        with self._lock:
+            row = self.conn.execute('SELECT value FROM cache WHERE key = ?', (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            self._touch([key])
+            return json.loads(row[0])
+
+    def get_many(self, keys):
+        """여러 키를 한 번에 조회해 {키: 결과} 반환 (없는 키는 빠짐)"""
+        with self._lock:
+            found = {}
+            keys = list(dict.fromkeys(keys))
+            # SQLite 변수 개수 제한을 넘지 않도록 나눠서 조회
+            for start in range(0, len(keys), 500):
+                chunk = keys[start:start + 500]
+                placeholders = ','.join('?' * len(chunk))
+                for key, value in self.conn.execute(
+                        f'SELECT key, value FROM cache WHERE key IN ({placeholders})', chunk):
+                    found[key] = json.loads(value)
+
+            self.hits += len(found)
+            self.misses += len(keys) - len(found)
+            self._touch(found)
+            return found
+
+    def _touch(self, keys):
+        """조회된 키의 사용 시각을 모아 둠 (너무 많이 쌓이면 바로 기록)"""
+        now = time.time_ns()
+        for key in keys:
+            self._touched[key] = now
+        if len(self._touched) >= TOUCH_FLUSH_SIZE:
+            with self.conn:
+                self._flush_touched()
+
+    def _flush_touched(self):
+        """모아 둔 사용 시각을 last_used 에 기록 (쓰기 트랜잭션 안에서 호출)"""
+        if self._touched:
+            self.conn.executemany('UPDATE cache SET last_used = ? WHERE key = ?',
+                                  [(now, key) for key, now in self._touched.items()])
+            self._touched = {}
+
+    def put(self, key, value):
+        """결과 저장 후 크기 제한을 넘으면 오래된 항목 제거"""
+        with self._lock:
+            data = json.dumps(value, ensure_ascii=False)
+            size = len(data.encode('utf-8'))
+            if self.max_bytes is not None and size > self.max_bytes:
+                return
+
+            with self.conn:
+                self.conn.execute(
+                    'INSERT OR REPLACE INTO cache (key, value, size, last_used) VALUES (?, ?, ?, ?)',
+                    (key, data, size, time.time_ns())
+                )
+                self._flush_touched()
+                self._evict()
+
+    def put_many(self, items):
+        """여러 (키, 결과) 를 한 트랜잭션으로 저장"""
+        with self._lock:
+            now = time.time_ns()
+            rows = []
+            for key, value in items:
+                data = json.dumps(value, ensure_ascii=False)
+                size = len(data.encode('utf-8'))
+                if self.max_bytes is None or size <= self.max_bytes:
+                    rows.append((key, data, size, now))
+
+            with self.conn:
+                self.conn.executemany(
+                    'INSERT OR REPLACE INTO cache (key, value, size, last_used) VALUES (?, ?, ?, ?)', rows)
+                self._flush_touched()
+                self._evict()
+
+    def _evict(self):
+        total_bytes, total_entries = self.conn.execute(
+            'SELECT COALESCE(SUM(size), 0), COUNT(*) FROM cache').fetchone()
+
+        over_bytes = self.max_bytes is not None and total_bytes > self.max_bytes
+        over_entries = self.max_entries is not None and total_entries > self.max_entries
+        if not (over_bytes or over_entries):
+            return
+
+        evict_keys = []
+        for key, size in self.conn.execute('SELECT key, size FROM cache ORDER BY last_used'):
+            if not over_bytes and not over_entries:
+                break
+            evict_keys.append((key,))
+            total_bytes -= size
+            total_entries -= 1
+            over_bytes = self.max_bytes is not None and total_bytes > self.max_bytes
+            over_entries = self.max_entries is not None and total_entries > self.max_entries
+
+        self.conn.executemany('DELETE FROM cache WHERE key = ?', evict_keys)
+
+    def stats(self):
+        """적중/미스 횟수와 현재 저장 상태"""
+        with self._lock:
+            total_bytes, total_entries = self.conn.execute(
+                'SELECT COALESCE(SUM(size), 0), COUNT(*) FROM cache').fetchone()
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0,
+                'entries': total_entries,
+                'bytes': total_bytes,
+            }
+
+    def clear(self):
+        with self._lock:
+            with self.conn:
+                self.conn.execute('DELETE FROM cache')
+            self._touched = {}
+
+    def close(self):
+        with self._lock:
+            with self.conn:
+                self._flush_touched()
+            self.conn.close()
@@ -0,0 +1,293 @@
+"""
+실시간 감정 분석 서비스 (asyncio HTTP, 로컬용)
+- 모델을 서버 시작 시 한 번만 로드하고, 세션 중 인터뷰 발화를 바로 감정 분석
+- 동시에 들어온 요청을 마이크로 배치로 묶어 추론 (최대 배치 크기 / 첫 요청 후 최대 대기 시간)
+- 추론은 전용 스레드 하나에서 실행 (이벤트 루프는 요청 수신/배치 구성만 담당)
+- 대기열이 가득 차면 바로 503 으로 거절 (backpressure)
+- 응답은 analyze_bert_based 와 같은 {'method', 'sentiment', 'confidence'}
+- 엔드포인트
+    POST /analyze  {"text": "..."}       → 감정 결과
+    GET  /stats                          → 지연 시간 백분위수(ms), 배치 크기, 대기열 상태
+    GET  /health                         → {"status": "ok"}
+"""
+
+import json
+import time
+import asyncio
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from step3_sentiment_analysis import SentimentAnalyzer
+
+# HTTP 상태 코드 → 이유 문구
+STATUS_TEXT = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+               413: 'Payload Too Large', 500: 'Internal Server Error', 503: 'Service Unavailable'}
+
+# 요청 본문 최대 크기 (바이트)
+MAX_BODY_BYTES = 1024 * 1024
+
+
+class MicroBatcher:
+    """요청을 모아 배치 추론하는 대기열 (이벤트 루프 안에서 사용)"""
+
+    def __init__(self, analyzer, max_batch_size=16, max_wait_ms=10, max_queue=256, latency_window=10000):
+        """
+        analyzer: 모델을 로드한 SentimentAnalyzer
+        max_batch_size: 한 번에 추론할 최대 요청 수
+        max_wait_ms: 첫 요청이 들어온 뒤 배치를 더 채우기 위해 기다리는 최대 시간
+        max_queue: 대기열 최대 길이 (넘으면 submit 이 asyncio.QueueFull 발생)
+        latency_window: 백분위수 계산에 쓰는 최근 요청 수
+        """
+        self.analyzer = analyzer
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.queue = asyncio.Queue(maxsize=max_queue)
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='inference')
+
+        self.latencies = deque(maxlen=latency_window)
+        self.batch_sizes = deque(maxlen=latency_window)
+        self.completed = 0
+        self.rejected = 0
+        self.failed = 0
+        self._worker = None
+
+    def start(self):
+        self._worker = asyncio.ensure_future(self._run())
+
+    async def stop(self):
+        if self._worker:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+        self.executor.shutdown(wait=True)
+
+    def submit(self, text):
+        """
+        텍스트를 대기열에 넣고 결과 Future 반환
+        - 대기열이 가득 차면 asyncio.QueueFull (기다리지 않고 바로 거절)
+        """
+        future = asyncio.get_running_loop().create_future()
+        try:
+            self.queue.put_nowait((text, future, time.perf_counter()))
+        except asyncio.QueueFull:
+            self.rejected += 1
+            raise
+        return future
+
+    async def _collect(self):
+        """첫 요청을 기다린 뒤 max_wait 동안(또는 max_batch_size 까지) 요청을 더 모음"""
+        batch = [await self.queue.get()]
+        deadline = time.perf_counter() + self.max_wait
+
+        while len(batch) < self.max_batch_size:
+            # 이미 쌓여 있는 요청은 기다리지 않고 바로 가져옴
+            if not self.queue.empty():
+                batch.append(self.queue.get_nowait())
+                continue
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self.queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self):
+        """배치 구성 → 추론 스레드 실행 → 요청별 결과 전달 (추론 중 도착한 요청은 다음 배치로)"""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._collect()
+            # 대기 중 연결이 끊긴 요청은 제외
+            batch = [item for item in batch if not item[1].done()]
+            if not batch:
+                continue
+
+            texts = [text for text, _, _ in batch]
+            try:
+                results = await loop.run_in_executor(self.executor, self.analyzer.analyze_bert_batch,
+                                                     texts, len(texts))
+            except Exception as e:
+                results = [None] * len(batch)
+                print(f"   ⚠️  배치 추론 실패: {e}")
+
+            now = time.perf_counter()
+            self.batch_sizes.append(len(batch))
+            for (_, future, started), result in zip(batch, results):
+                if future.done():
+                    continue
+                if result is None:
+                    self.failed += 1
+                    future.set_exception(RuntimeError("BERT 분석 실패"))
+                else:
+                    self.completed += 1
+                    self.latencies.append(now - started)
+                    future.set_result(result)
+
+    def stats(self):
+        """최근 요청의 지연 시간 백분위수(ms)와 배치/대기열 통계"""
+        stats = {
+            'completed': self.completed,
+            'rejected': self.rejected,
+            'failed': self.failed,
+            'queue_size': self.queue.qsize(),
+            'queue_limit': self.queue.maxsize,
+            'max_batch_size': self.max_batch_size,
+            'max_wait_ms': self.max_wait * 1000,
+        }
+        if self.latencies:
+            latencies = np.array(self.latencies) * 1000
+            p50, p90, p95, p99 = np.percentile(latencies, [50, 90, 95, 99])
+            stats['latency_ms'] = {'p50': round(p50, 2), 'p90': round(p90, 2), 'p95': round(p95, 2),
+                                   'p99': round(p99, 2), 'max': round(float(latencies.max()), 2),
+                                   'samples': len(latencies)}
+        if self.batch_sizes:
+            stats['mean_batch_size'] = round(float(np.mean(self.batch_sizes)), 2)
+        return stats
+
+
+class SentimentService:
+    """마이크로 배치 감정 분석 HTTP 서버"""
+
+    def __init__(self, analyzer=None, host='127.0.0.1', port=8765, max_batch_size=16, max_wait_ms=10,
+                 max_queue=256):
+        """analyzer: 모델을 로드한 SentimentAnalyzer (없으면 새로 생성)"""
+        self.analyzer = analyzer or SentimentAnalyzer()
+        self.host = host
+        self.port = port
+        self.batcher_options = {'max_batch_size': max_batch_size, 'max_wait_ms': max_wait_ms,
+                                'max_queue': max_queue}
+        self.batcher = None
+        self.server = None
+
+    async def start(self):
+        """배치 작업과 서버 시작 (port=0 이면 빈 포트를 골라 self.port 에 기록)"""
+        self.batcher = MicroBatcher(self.analyzer, **self.batcher_options)
+        self.batcher.start()
+        self.server = await asyncio.start_server(self.handle_connection, self.host, self.port)
+        self.port = self.server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        if self.server:
+            self.server.close()
+            await self.server.wait_closed()
+        if self.batcher:
+            await self.batcher.stop()
+
+    async def serve_forever(self):
+        await self.start()
+        print(f"✅ 감정 분석 서비스 시작: http://{self.host}:{self.port}  (POST /analyze, GET /stats)")
+        try:
+            await self.server.serve_forever()
+        finally:
+            await self.stop()
+
+    async def handle_connection(self, reader, writer):
+        """연결 하나에서 요청을 차례로 처리 (keep-alive 지원)"""
+        try:
+            while True:
+                request = await self.read_request(reader)
+                if request is None:
+                    break
+                method, path, headers, body = request
+                status, payload = await self.route(method, path, body)
+                keep_alive = headers.get('connection', '').lower() != 'close'
+                self.write_response(writer, status, payload, keep_alive)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except ValueError as e:
+            self.write_response(writer, 400, {'error': str(e)}, keep_alive=False)
+        finally:
+            writer.close()
+
+    async def read_request(self, reader):
+        """(메서드, 경로, 헤더 dict, 본문 bytes) 반환, 연결이 닫혔으면 None"""
+        request_line = await reader.readline()
+        if not request_line.strip():
+            return None
+        try:
+            method, path, _ = request_line.decode('latin-1').split(' ', 2)
+        except ValueError:
+            raise ValueError("잘못된 요청 줄")
+
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+
+        length = int(headers.get('content-length', 0) or 0)
+        if length > MAX_BODY_BYTES:
+            raise ValueError("요청 본문이 너무 큽니다")
+        body = await reader.readexactly(length) if length else b''
+        return method.upper(), path.split('?', 1)[0], headers, body
+
+    async def route(self, method, path, body):
+        """요청 처리 → (상태 코드, 응답 dict)"""
+        if path == '/health':
+            return 200, {'status': 'ok'}
+        if path == '/stats':
+            return 200, self.batcher.stats()
+        if path != '/analyze':
+            return 404, {'error': f"없는 경로: {path}"}
+        if method != 'POST':
+            return 405, {'error': "POST 로 요청하세요"}
+
+        try:
+            text = json.loads(body.decode('utf-8'))['text']
+            if not isinstance(text, str):
+                raise TypeError
+        except Exception:
+            return 400, {'error': '본문 형식: {"text": "..."}'}
+
+        try:
+            future = self.batcher.submit(text)
+        except asyncio.QueueFull:
+            return 503, {'error': "대기열이 가득 찼습니다. 잠시 후 다시 시도하세요"}
+
+        try:
+            return 200, await future
+        except RuntimeError as e:
+            return 500, {'error': str(e)}
+
+    def write_response(self, writer, status, payload, keep_alive=True):
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        headers = [
+            f"HTTP/1.1 {status} {STATUS_TEXT.get(status, '')}",
+            "Content-Type: application/json; charset=utf-8",
+            f"Content-Length: {len(body)}",
+            f"Connection: {'keep-alive' if keep_alive else 'close'}",
+        ]
+        if status == 503:
+            headers.append("Retry-After: 1")
+        writer.write(('\r\n'.join(headers) + '\r\n\r\n').encode('latin-1') + body)
+
+
+def main():
+    print("\n 실시간 감정 분석 서비스 (마이크로 배치)")
+    try:
+        port = input("포트 (기본 8765): ").strip()
+        max_batch_size = input("최대 배치 크기 (기본 16): ").strip()
+        max_wait_ms = input("배치 최대 대기 시간 ms (기본 10): ").strip()
+
+        service = SentimentService(port=int(port) if port else 8765,
+                                   max_batch_size=int(max_batch_size) if max_batch_size else 16,
+                                   max_wait_ms=float(max_wait_ms) if max_wait_ms else 10)
+        asyncio.run(service.serve_forever())
+
+    except KeyboardInterrupt:
+        print("\n 서비스 종료")
+    except Exception as e:
+        print(f"\n❌ 오류 발생: {e}")
+
+if __name__ == "__main__":
+    main()
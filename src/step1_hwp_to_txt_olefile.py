@@ -4,20 +4,181 @@ HWP 5.0 파일 구조를 완전히 분석하여 텍스트 추출
 """
 
 import os
+import re
+import json
+import hashlib
 import struct
+import threading
 import zlib
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from pathlib import Path
+import numpy as np
 import olefile
 
+
+# 레코드 헤더: tag_id(10bit) | level(10bit) | size(12bit)
+RECORD_HEADER = struct.Struct('<I')
+RECORD_SIZE_EXTENDED = 0xFFF
+
+# 섹션 스트림 압축 해제 시 한 번에 읽는 크기 / 스트리밍 변환 시 TXT 쓰기 버퍼 크기
+STREAM_CHUNK_SIZE = 64 * 1024
+WRITE_BUFFER_SIZE = 1024 * 1024
+
+HANGUL_PATTERN = re.compile('[\uac00-\ud7a3]')
+
+
+class _ControlCharTable(dict):
+    """str.translate 용 제어문자 제거 표 (줄바꿈/탭/공백을 제외한 출력 불가능 문자 → None)"""
+
+    KEEP = '\n\r\t '
+
+    def __missing__(self, code):
+        char = chr(code)
+        value = code if (char.isprintable() or char in self.KEEP) else None
+        self[code] = value
+        return value
+
+
+def _compile_control_char_pattern(table):
+    """BMP 범위의 제거 대상 문자를 미리 계산해 문자 클래스 정규식으로 컴파일"""
+    ranges = []
+    start = prev = None
+    for code in range(0x10000):
+        if table[code] is not None:
+            continue
+        if prev is not None and code == prev + 1:
+            prev = code
+            continue
+        if start is not None:
+            ranges.append((start, prev))
+        start = prev = code
+    ranges.append((start, prev))
+    
+    char_class = ''.join(
+        re.escape(chr(lo)) if lo == hi else f'{re.escape(chr(lo))}-{re.escape(chr(hi))}'
+        for lo, hi in ranges
+    )
+    return re.compile(f'[{char_class}]+')
+
+
+CONTROL_CHAR_TABLE = _ControlCharTable()
+CONTROL_CHAR_PATTERN = _compile_control_char_pattern(CONTROL_CHAR_TABLE)
+ASTRAL_CHAR_PATTERN = re.compile('[\U00010000-\U0010FFFF]')
+
+
+def strip_control_chars(text):
+    """HWP 제어문자 등 출력 불가능한 문자 제거 (줄바꿈/탭/공백은 유지)"""
+    text = CONTROL_CHAR_PATTERN.sub('', text)
+    # 보조 평면 문자(U+10000 이상)가 섞인 드문 경우에만 표로 한 번 더 정리
+    if ASTRAL_CHAR_PATTERN.search(text):
+        text = text.translate(CONTROL_CHAR_TABLE)
+    return text
+
+
+def scan_text_code_units(data):
+    """
+    바이트 패턴 검색: 데이터를 UTF-16LE 코드 단위(uint16 배열)로 보고 한글/ASCII/CJK 문자만 골라냄
+    - 0x000D(문단 끝)를 줄 경계로 사용, 앞뒤 공백을 제거한 비어있지 않은 줄 목록 반환
+    - 마스크/경계 계산은 NumPy 로 한 번에 처리
+    """
+    codes = np.frombuffer(data, dtype='<u2', count=len(data) // 2)
+    
+    is_cr = codes == 0x000D
+    keep = (((codes >= 0xAC00) & (codes <= 0xD7A3)) |
+            ((codes >= 0x0020) & (codes <= 0x007E)) |
+            ((codes >= 0x3000) & (codes <= 0x9FFF)))
+    selected = keep | is_cr
+    codes = codes[selected]
+    is_cr = is_cr[selected]
+    
+    # 줄 번호: CR 을 만날 때마다 증가 / 공백(U+0020, U+3000)이 아닌 글자 위치만 남김
+    line_ids = np.cumsum(is_cr)
+    content = np.flatnonzero(~is_cr & (codes != 0x0020) & (codes != 0x3000))
+    if content.size == 0:
+        return []
+    
+    # 줄이 바뀌는 지점 → 각 줄의 첫/마지막 글자 위치 (= strip 결과 범위)
+    content_line_ids = line_ids[content]
+    boundaries = np.flatnonzero(content_line_ids[1:] != content_line_ids[:-1]) + 1
+    starts = content[np.concatenate(([0], boundaries))]
+    ends = content[np.concatenate((boundaries - 1, [content.size - 1]))] + 1
+    
+    # 선택된 코드 단위는 모두 BMP 문자라 문자열 인덱스와 배열 인덱스가 일치
+    text = codes.tobytes().decode('utf-16le')
+    return [text[start:end] for start, end in zip(starts.tolist(), ends.tolist())]
+
+
+def iter_records(data):
+    """
+    HWP 레코드를 순서대로 순회
+    - (tag_id, level, payload) 반환, payload는 원본 버퍼를 가리키는 memoryview (복사 없음)
+    - 크기가 버퍼를 넘는 레코드를 만나면 중단
+    """
+    view = memoryview(data)
+    for tag_id, level, start, end in _walk_records(view):
+        yield tag_id, level, view[start:end]
+
+
+class RecordStream:
+    """
+    조각 단위로 들어오는 섹션 데이터의 HWP 레코드 순회 (iter_records 와 같은 레코드)
+    - 완전히 들어온 레코드만 반환하고, 아직 끝나지 않은 마지막 레코드 조각(꼬리)만 보관
+    """
+    
+    def __init__(self):
+        self.tail = bytearray()
+    
+    def feed(self, chunk):
+        """조각을 이어 붙이고 완성된 레코드 (tag_id, level, payload bytes) 반환"""
+        self.tail += chunk
+        consumed = 0
+        with memoryview(self.tail) as view:
+            for tag_id, level, start, end in _walk_records(view):
+                consumed = end
+                yield tag_id, level, bytes(view[start:end])
+        del self.tail[:consumed]
+
+
+def _walk_records(view):
+    """(tag_id, level, payload 시작, payload 끝) 순회 - 버퍼 안에 다 들어오지 않은 레코드에서 멈춤"""
+    end = len(view)
+    unpack_from = RECORD_HEADER.unpack_from
+    pos = 0
+    
+    while pos + 4 <= end:
+        header, = unpack_from(view, pos)
+        tag_id = header & 0x3FF
+        level = (header >> 10) & 0x3FF
+        size = (header >> 20) & 0xFFF
+        pos += 4
+        
+        if size == RECORD_SIZE_EXTENDED:
+            if pos + 4 > end:
+                return
+            size, = unpack_from(view, pos)
+            pos += 4
+        
+        if pos + size > end:
+            return
+        
+        yield tag_id, level, pos, pos + size
+        pos += size
+
+
 class HWPParser:
     """HWP 5.0 파일 구조 파서"""
     
     HWPTAG_BEGIN = 0x10
     HWPTAG_TEXT = 67
     
-    def __init__(self, hwp_path):
+    def __init__(self, hwp_path, verbose=True):
         self.hwp_path = hwp_path
+        self.verbose = verbose
         self.ole = None
+        self.error = None
+        self._ole_lock = threading.Lock()
+        self._compressed = None
         
     def open(self):
         """HWP 파일 열기"""
@@ -25,7 +186,9 @@ class HWPParser:
             self.ole = olefile.OleFileIO(self.hwp_path)
             return True
         except Exception as e:
-            print(f"  ❌ 파일 열기 실패: {e}")
+            self.error = f"파일 열기 실패: {e}"
+            if self.verbose:
+                print(f"  ❌ {self.error}")
             return False
     
     def close(self):
@@ -41,177 +204,442 @@ class HWPParser:
         except:
             return data
     
+    def decompress_file_stream(self, stream, chunk_size=STREAM_CHUNK_SIZE):
+        """
+        파일 형태의 스트림을 조각 단위로 읽으며 압축 해제 (decompress_stream 과 결과 동일)
+        - 압축 해제 결과 전체를 bytearray 로 모아 반환 (압축되지 않은 스트림이면 원본 그대로)
+        - olefile 스트림은 열 때 이미 압축 원본 전체를 메모리에 읽어 두므로,
+          이 함수가 끝날 때까지 압축 원본과 압축 해제 결과가 함께 메모리에 있음
+          (텍스트 추출은 꼬리만 보관하는 iter_section_stream 사용, 이 함수는 대체 경로용)
+        """
+        decompressor = zlib.decompressobj(-zlib.MAX_WBITS)
+        output = bytearray()
+        try:
+            while True:
+                chunk = stream.read(chunk_size)
+                if not chunk:
+                    break
+                output += decompressor.decompress(chunk)
+                if decompressor.eof:
+                    break
+            output += decompressor.flush()
+        except zlib.error:
+            pass
+        
+        if decompressor.eof:
+            return output
+        
+        stream.seek(0)
+        return stream.read()
+    
     def extract_text_from_section(self, section_data):
         """섹션 데이터에서 텍스트 추출"""
-        data = self.decompress_stream(section_data)
-        texts = []
+        return self.extract_text_from_records(self.decompress_stream(section_data))
+    
+    def extract_text_from_records(self, data):
+        """압축 해제된 섹션 데이터에서 텍스트 추출"""
+        return '\n'.join(self.iter_section_paragraphs(data))
+    
+    def iter_section_paragraphs(self, data):
+        """압축 해제된 섹션 데이터에서 문단을 추출되는 대로 하나씩 반환"""
+        found = False
         
         # 방법 1: HWP 레코드 구조 파싱
-        pos = 0
-        while pos < len(data) - 4:
-            try:
-                header = struct.unpack('<I', data[pos:pos+4])[0]
-                tag_id = header & 0x3FF
-                size = (header >> 20) & 0xFFF
-                pos += 4
-                
-                if size == 0xFFF:
-                    if pos + 4 <= len(data):
-                        size = struct.unpack('<I', data[pos:pos+4])[0]
-                        pos += 4
-                
-                if tag_id == self.HWPTAG_TEXT or tag_id == 67:
-                    if pos + size <= len(data):
-                        text_data = data[pos:pos+size]
-                        try:
-                            text = text_data.decode('utf-16le', errors='ignore')
-                            text = ''.join(c for c in text if c.isprintable() or c in '\n\r\t ')
-                            if text.strip():
-                                texts.append(text.strip())
-                        except:
-                            pass
-                
-                pos += size
-            except:
-                pos += 1
-                continue
+        for tag_id, level, payload in iter_records(data):
+            if tag_id == self.HWPTAG_TEXT:
+                text = self.record_text(payload)
+                if text:
+                    found = True
+                    yield text
+        if found:
+            return
         
         # 방법 2: UTF-16LE 디코딩
-        if not texts:
-            try:
-                decoded = data.decode('utf-16le', errors='ignore')
-                cleaned = ''.join(c for c in decoded if c.isprintable() or c in '\n\r\t ')
-                if cleaned.strip():
-                    texts.append(cleaned.strip())
-            except:
-                pass
+        cleaned = strip_control_chars(data.decode('utf-16le', errors='ignore')).strip()
+        if cleaned:
+            yield cleaned
+            return
         
         # 방법 3: 바이트 패턴 검색
-        if not texts:
-            text_parts = []
-            i = 0
-            while i < len(data) - 1:
-                try:
-                    char_code = struct.unpack('<H', data[i:i+2])[0]
-                    if (0xAC00 <= char_code <= 0xD7A3) or \
-                       (0x0020 <= char_code <= 0x007E) or \
-                       (0x3000 <= char_code <= 0x9FFF):
-                        try:
-                            char = chr(char_code)
-                            text_parts.append(char)
-                        except:
-                            pass
-                    elif char_code == 0x000D:
-                        text_parts.append('\n')
-                    i += 2
-                except:
-                    i += 1
-            
-            if text_parts:
-                text = ''.join(text_parts)
-                lines = [line.strip() for line in text.split('\n') if line.strip()]
-                if lines:
-                    texts.extend(lines)
+        yield from scan_text_code_units(data)
+    
+    def list_sections(self):
+        """BodyText/Section0..N 스트림 이름 목록"""
+        section_names = []
+        while self.ole.exists(f'BodyText/Section{len(section_names)}'):
+            section_names.append(f'BodyText/Section{len(section_names)}')
+        return section_names
+    
+    def record_text(self, payload):
+        """텍스트 레코드 payload → 제어문자를 제거한 문단"""
+        return strip_control_chars(str(payload, 'utf-16le', 'ignore')).strip()
+    
+    def is_compressed(self):
+        """FileHeader 속성의 압축 플래그 (FileHeader 를 읽을 수 없으면 HWP 기본값인 압축으로 간주)"""
+        if self._compressed is None:
+            try:
+                with self._ole_lock:
+                    header = self.ole.openstream('FileHeader').read(40)
+                self._compressed = bool(header[36] & 1) if len(header) >= 40 else True
+            except Exception:
+                self._compressed = True
+        return self._compressed
+    
+    def iter_section_stream(self, section_name, chunk_size=STREAM_CHUNK_SIZE):
+        """
+        섹션 스트림 하나의 문단을 레코드가 완성되는 대로 반환 (스레드에서 호출 가능, iter_section_paragraphs 와 결과 동일)
+        - 압축 해제 조각(비압축 문서는 원본 조각)을 바로 RecordStream 에 넣어 텍스트 레코드만 추출
+        - 메모리: olefile 이 스트림을 열 때 압축 원본 전체를 읽어 두므로 섹션당
+          압축 원본 + 끝나지 않은 레코드 꼬리 + 문단 하나 (스레드 N 개면 동시에 최대 N 섹션)
+        - 텍스트 레코드가 하나도 없거나 처음부터 압축 해제에 실패하면 섹션 전체를 다시 읽어
+          기존 방법 2/3 (UTF-16LE 디코딩, 바이트 패턴 검색) 으로 추출
+        - 중간에 압축 해제가 실패한 손상 스트림은 그때까지 추출한 문단만 사용
+        """
+        decompressor = zlib.decompressobj(-zlib.MAX_WBITS) if self.is_compressed() else None
+        with self._ole_lock:
+            stream = self.ole.openstream(section_name)
+        
+        found = False
+        records = RecordStream()
+        try:
+            while not (decompressor and decompressor.eof):
+                chunk = stream.read(chunk_size)
+                if not chunk:
+                    break
+                if decompressor:
+                    try:
+                        chunk = decompressor.decompress(chunk)
+                    except zlib.error:
+                        break
+                for tag_id, level, payload in records.feed(chunk):
+                    if tag_id == self.HWPTAG_TEXT:
+                        text = self.record_text(payload)
+                        if text:
+                            found = True
+                            yield text
+        finally:
+            stream.close()
         
-        return '\n'.join(texts)
+        if not found:
+            yield from self.iter_section_paragraphs(self.read_section_data(section_name))
+    
+    def read_section_data(self, section_name):
+        """섹션 스트림 하나를 열어 압축 해제 (스레드에서 호출 가능, 전체 데이터가 필요한 대체 경로용)"""
+        # olefile 은 파일 핸들 하나를 공유하므로 스트림을 여는 동안만 잠금
+        with self._ole_lock:
+            stream = self.ole.openstream(section_name)
+        try:
+            return self.decompress_file_stream(stream)
+        finally:
+            stream.close()
+    
+    def read_section_text(self, section_name):
+        """섹션 스트림 하나를 열어 압축 해제 후 텍스트 추출 (스레드에서 호출 가능)"""
+        return '\n'.join(self.iter_section_stream(section_name))
+    
+    def _read_section_safe(self, section_name):
+        try:
+            return self.read_section_text(section_name), None
+        except Exception as e:
+            return None, e
     
-    def extract_all_text(self):
-        """HWP 파일에서 모든 텍스트 추출"""
+    def extract_all_text(self, workers=None):
+        """
+        HWP 파일에서 모든 텍스트 추출
+        - workers 가 2 이상이면 섹션들을 스레드 풀에서 동시에 압축 해제/파싱 (결과는 섹션 순서대로 합침)
+        - 동시에 메모리에 있는 압축 원본은 최대 workers 개 섹션분 (iter_section_stream 참고)
+        """
         if not self.ole:
             return None
         
-        all_texts = []
-        section_num = 0
+        section_names = self.list_sections()
         
-        while True:
-            section_name = f'BodyText/Section{section_num}'
-            if not self.ole.exists(section_name):
-                break
+        if workers and workers > 1 and len(section_names) > 1:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                section_results = list(executor.map(self._read_section_safe, section_names))
+        else:
+            section_results = map(self._read_section_safe, section_names)
+        
+        all_texts = []
+        for section_num, (text, error) in enumerate(section_results):
+            if error is not None:
+                if self.verbose:
+                    print(f"  ⚠️  Section{section_num} 오류: {error}")
+                continue
             
-            try:
-                stream = self.ole.openstream(section_name)
-                section_data = stream.read()
-                text = self.extract_text_from_section(section_data)
-                
-                if text and text.strip():
-                    all_texts.append(text.strip())
+            if text and text.strip():
+                all_texts.append(text.strip())
+                if self.verbose:
                     print(f"  ✓ Section{section_num}: {len(text)} 문자 추출")
+        
+        return '\n\n'.join(all_texts) if all_texts else None
+    
+    def iter_paragraphs(self):
+        """
+        섹션 순서대로 (section_num, 문단) 을 레코드가 완성되는 대로 반환
+        - 한 번에 섹션 하나의 압축 원본, 끝나지 않은 레코드 꼬리, 문단 하나만 메모리에 유지 (iter_section_stream)
+        - 섹션 도중 오류가 나면 그 섹션의 나머지는 건너뜀
+        """
+        if not self.ole:
+            return
+        
+        for section_num, section_name in enumerate(self.list_sections()):
+            section_length = -1
+            try:
+                for paragraph in self.iter_section_stream(section_name):
+                    section_length += len(paragraph) + 1
+                    yield section_num, paragraph
             except Exception as e:
-                print(f"  ⚠️  Section{section_num} 오류: {e}")
+                if self.verbose:
+                    print(f"  ⚠️  Section{section_num} 오류: {e}")
+                continue
             
-            section_num += 1
+            if section_length > 0 and self.verbose:
+                print(f"  ✓ Section{section_num}: {section_length} 문자 추출")
+
+
+class StreamingTextWriter:
+    """
+    문단을 받는 대로 TXT 파일에 버퍼 쓰기 (extract_all_text 결과와 같은 형식)
+    - 섹션 사이는 빈 줄, 문단 사이는 줄바꿈
+    - 텍스트 길이, 한글 문자 수, 미리보기를 쓰면서 함께 계산
+    - 임시 파일에 쓰고 commit() 시 최종 경로로 교체 (실패 시 기존 TXT 유지)
+    """
+    
+    def __init__(self, txt_path, buffer_size=WRITE_BUFFER_SIZE):
+        self.txt_path = txt_path
+        self.tmp_path = txt_path + '.part'
+        self.file = open(self.tmp_path, 'w', encoding='utf-8', buffering=buffer_size)
+        self.text_length = 0
+        self.korean_count = 0
+        self._section_num = None
+        self._head = []
+        self._head_lines = 0
+    
+    def write(self, section_num, paragraph):
+        if self._section_num is None:
+            chunk = paragraph
+        elif section_num != self._section_num:
+            chunk = '\n\n' + paragraph
+        else:
+            chunk = '\n' + paragraph
+        self._section_num = section_num
         
-        return '\n\n'.join(all_texts) if all_texts else None
+        self.file.write(chunk)
+        self.text_length += len(chunk)
+        self.korean_count += HANGUL_PATTERN.subn('', chunk)[1]
+        
+        # 미리보기는 앞부분 8줄만 보므로 그만큼만 모아둠
+        if self._head_lines < 8:
+            self._head.append(chunk)
+            self._head_lines += chunk.count('\n')
+    
+    def preview(self):
+        return make_preview(''.join(self._head))
+    
+    def commit(self):
+        self.file.close()
+        os.replace(self.tmp_path, self.txt_path)
+    
+    def discard(self):
+        self.file.close()
+        if os.path.exists(self.tmp_path):
+            os.remove(self.tmp_path)
+
+
+def grade_quality(korean_count):
+    """한글 문자 개수 기반 변환 품질 등급 (good / partial / poor)"""
+    if korean_count > 50:
+        return 'good'
+    elif korean_count > 10:
+        return 'partial'
+    return 'poor'
+
+
+def make_preview(text, max_lines=5, width=70):
+    """앞부분 8줄 중 비어있지 않은 최대 5줄 미리보기"""
+    preview_lines = []
+    for line in text.split('\n')[:8]:
+        if line.strip():
+            preview_lines.append(line.strip()[:width])
+            if len(preview_lines) >= max_lines:
+                break
+    return preview_lines
+
+
+def convert_hwp_file(hwp_path, output_folder, verbose=False, section_workers=None, streaming=False):
+    """
+    HWP 파일 한 개를 TXT로 변환하고 결과를 dict 로 반환
+    - 출력 없이 결과만 돌려주므로 프로세스 풀 작업 함수로 사용 가능
+    - section_workers: 문서 내부 섹션 병렬 처리 스레드 수 (HWPParser.extract_all_text 참고)
+    - streaming: 전체 텍스트를 메모리에 모으지 않고 문단 단위로 바로 TXT에 기록 (section_workers 무시)
+    """
+    hwp_filename = os.path.basename(hwp_path)
+    result = {
+        'filename': hwp_filename,
+        'success': False,
+        'txt_path': None,
+        'text_length': 0,
+        'korean_count': 0,
+        'quality': None,
+        'failure_reason': None,
+        'preview': [],
+    }
+    
+    if not os.path.exists(hwp_path):
+        result['failure_reason'] = 'not_found'
+        return result
+    
+    parser = HWPParser(hwp_path, verbose=verbose)
+    if not parser.open():
+        result['failure_reason'] = parser.error
+        return result
+    
+    txt_filename = Path(hwp_filename).stem + '.txt'
+    txt_path = os.path.join(output_folder, txt_filename)
+    
+    if streaming:
+        return _convert_streaming(parser, txt_path, result)
+    
+    try:
+        text = parser.extract_all_text(workers=section_workers)
+    finally:
+        parser.close()
+    
+    if not text or len(text.strip()) < 10:
+        result['failure_reason'] = 'no_text'
+        return result
+    
+    korean_count = sum(1 for c in text if '\uac00' <= c <= '\ud7a3')
+    
+    with open(txt_path, 'w', encoding='utf-8') as f:
+        f.write(text)
+    
+    return _finish_result(result, txt_path, len(text), korean_count, make_preview(text))
+
+
+def _convert_streaming(parser, txt_path, result):
+    """
+    문단 단위 스트리밍 변환 (통계/미리보기도 같은 흐름에서 계산)
+    - 쓰기 오류 등은 다른 경로처럼 실패 결과로 반환 (기존 TXT 는 그대로 유지)
+    """
+    writer = None
+    try:
+        writer = StreamingTextWriter(txt_path)
+        for section_num, paragraph in parser.iter_paragraphs():
+            writer.write(section_num, paragraph)
+    except Exception as e:
+        if writer:
+            writer.discard()
+        result['failure_reason'] = f"변환 실패: {e}"
+        return result
+    except BaseException:
+        if writer:
+            writer.discard()
+        raise
+    finally:
+        parser.close()
+    
+    if writer.text_length < 10:
+        writer.discard()
+        result['failure_reason'] = 'no_text'
+        return result
+    
+    writer.commit()
+    return _finish_result(result, txt_path, writer.text_length, writer.korean_count, writer.preview())
+
+
+def _finish_result(result, txt_path, text_length, korean_count, preview):
+    quality = grade_quality(korean_count)
+    result.update({
+        'success': quality != 'poor',
+        'txt_path': txt_path,
+        'text_length': text_length,
+        'korean_count': korean_count,
+        'quality': quality,
+        'failure_reason': 'low_korean' if quality == 'poor' else None,
+        'preview': preview,
+    })
+    return result
+
+
+def file_sha256(path, chunk_size=STREAM_CHUNK_SIZE):
+    """파일 내용의 SHA-256 해시"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
 
 
 class HWPConverter:
-    def __init__(self, input_folder="data/hwp_files", output_folder="data/txt_files"):
+    REPORT_FILENAME = 'conversion_report.json'
+    MANIFEST_FILENAME = 'conversion_manifest.json'
+    
+    def __init__(self, input_folder="data/hwp_files", output_folder="data/txt_files", section_workers=None,
+                 incremental=False, streaming=False):
+        """
+        incremental: True 면 manifest(원본 해시 + 크기/수정시각)를 기준으로 변경되지 않은 파일은 건너뜀
+        streaming: True 면 문단 단위로 바로 TXT에 기록 (대용량 문서 메모리 절약)
+        """
         self.input_folder = input_folder
         self.output_folder = output_folder
+        self.section_workers = section_workers
+        self.incremental = incremental
+        self.streaming = streaming
+        self.manifest_path = os.path.join(output_folder, self.MANIFEST_FILENAME)
         os.makedirs(output_folder, exist_ok=True)
     
     def convert_single_file(self, hwp_filename):
         """단일 HWP 파일을 TXT로 변환"""
+        return self._convert_with_log(hwp_filename)['success']
+    
+    def _convert_with_log(self, hwp_filename):
+        """단일 파일 변환 + 진행 상황/미리보기 출력 (결과 dict 반환)"""
         hwp_path = os.path.join(self.input_folder, hwp_filename)
         
         if not os.path.exists(hwp_path):
             print(f"❌ 파일을 찾을 수 없습니다: {hwp_path}")
-            return False
+            return convert_hwp_file(hwp_path, self.output_folder)
         
         print(f"\n{'='*60}")
         print(f" 변환 중: {hwp_filename}")
         print('='*60)
         
-        parser = HWPParser(hwp_path)
-        if not parser.open():
-            return False
-        
-        text = parser.extract_all_text()
-        parser.close()
-        
-        if not text or len(text.strip()) < 10:
-            print(f"\n❌ 변환 실패: 유효한 텍스트를 찾을 수 없습니다")
-            return False
-        
-        korean_count = sum(1 for c in text if '\uac00' <= c <= '\ud7a3')
-        
-        txt_filename = Path(hwp_filename).stem + '.txt'
-        txt_path = os.path.join(self.output_folder, txt_filename)
+        result = convert_hwp_file(hwp_path, self.output_folder, verbose=True,
+                                  section_workers=self.section_workers, streaming=self.streaming)
         
-        with open(txt_path, 'w', encoding='utf-8') as f:
-            f.write(text)
+        if result['txt_path'] is None:
+            if result['failure_reason'] == 'no_text':
+                print(f"\n❌ 변환 실패: 유효한 텍스트를 찾을 수 없습니다")
+            return result
         
         print(f"\n✅ 변환 완료!")
-        print(f"    저장 위치: {txt_path}")
-        print(f"    텍스트 길이: {len(text)} 문자")
-        print(f"    한글 문자: {korean_count}개")
-        
-        preview_lines = []
-        for line in text.split('\n')[:8]:
-            if line.strip():
-                preview_lines.append(line.strip()[:70])
-                if len(preview_lines) >= 5:
-                    break
+        print(f"    저장 위치: {result['txt_path']}")
+        print(f"    텍스트 길이: {result['text_length']} 문자")
+        print(f"    한글 문자: {result['korean_count']}개")
         
-        if preview_lines:
+        if result['preview']:
             print(f"\n    미리보기:")
             print("   " + "-"*56)
-            for line in preview_lines:
+            for line in result['preview']:
                 print(f"   {line}")
             print("   " + "-"*56)
         
-        if korean_count > 50:
+        if result['quality'] == 'good':
             print(f"\n   정상적으로 변환되었습니다!")
-            return True
-        elif korean_count > 10:
+        elif result['quality'] == 'partial':
             print(f"\n   ⚠️  일부만 변환되었을 수 있습니다.")
-            return True
         else:
             print(f"\n   ❌ 한글이 거의 없습니다.")
-            return False
+        return result
     
-    def convert_all_files(self):
-        """모든 HWP 파일 변환"""
+    def convert_all_files(self, workers=None, force=False):
+        """
+        모든 HWP 파일 변환
+        - workers 가 2 이상이면 ProcessPoolExecutor 로 파일을 나눠 병렬 변환 (출력 TXT는 순차 모드와 동일)
+        - incremental 모드에서는 변경된 파일만 변환, force=True 면 전체 재변환
+        """
         hwp_files = sorted([f for f in os.listdir(self.input_folder) if f.endswith('.hwp')])
         
         if not hwp_files:
@@ -220,15 +648,38 @@ class HWPConverter:
         
         print(f"\n 총 {len(hwp_files)}개의 HWP 파일을 찾았습니다.")
         
-        success_count = 0
-        failed_files = []
+        cached_results = {}
+        fingerprints = {}
+        if self.incremental:
+            manifest = self.load_manifest()
+            for hwp_file in hwp_files:
+                entry = None if force else self._check_manifest_entry(manifest.get(hwp_file), hwp_file)
+                if entry:
+                    cached_results[hwp_file] = dict(entry['result'], cached=True)
+                else:
+                    fingerprints[hwp_file] = self._fingerprint(hwp_file)
+            print(f" 변경 없음(건너뜀): {len(cached_results)}개 / 변환 대상: {len(hwp_files) - len(cached_results)}개")
+        
+        pending_files = [f for f in hwp_files if f not in cached_results]
         
-        for i, hwp_file in enumerate(hwp_files, 1):
-            print(f"\n[{i}/{len(hwp_files)}]", end=" ")
-            if self.convert_single_file(hwp_file):
-                success_count += 1
-            else:
-                failed_files.append(hwp_file)
+        if workers and workers > 1:
+            converted = self._convert_parallel(pending_files, workers) if pending_files else []
+        else:
+            converted = []
+            for i, hwp_file in enumerate(pending_files, 1):
+                print(f"\n[{i}/{len(pending_files)}]", end=" ")
+                converted.append(self._convert_with_log(hwp_file))
+        
+        converted_results = dict(zip(pending_files, converted))
+        if self.incremental:
+            self._update_manifest(manifest, converted_results, fingerprints)
+        
+        results = [cached_results.get(f) or converted_results[f] for f in hwp_files]
+        
+        success_count = sum(1 for r in results if r['success'])
+        failed_files = [r for r in results if not r['success']]
+        
+        self.write_report(results, workers=workers or 1)
         
         print(f"\n\n{'='*60}")
         print(f" 변환 결과 요약")
@@ -237,11 +688,124 @@ class HWPConverter:
         
         if failed_files:
             print(f"\n❌ 실패한 파일 ({len(failed_files)}개):")
-            for f in failed_files:
-                print(f"   - {f}")
+            for r in failed_files:
+                print(f"   - {r['filename']} ({r['failure_reason']})")
         
         print('='*60)
         return success_count
+    
+    def _convert_parallel(self, hwp_files, workers):
+        """프로세스 풀 병렬 변환 (결과는 파일명 순서로 반환)"""
+        print(f" 병렬 변환 모드: 워커 {workers}개")
+        
+        results = {}
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(convert_hwp_file, os.path.join(self.input_folder, hwp_file), self.output_folder,
+                                section_workers=self.section_workers, streaming=self.streaming): hwp_file
+                for hwp_file in hwp_files
+            }
+            for done, future in enumerate(as_completed(futures), 1):
+                hwp_file = futures[future]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    result = {'filename': hwp_file, 'success': False, 'failure_reason': f"작업 실패: {e}"}
+                results[hwp_file] = result
+                
+                mark = '✓' if result['success'] else '❌'
+                print(f"  [{done}/{len(hwp_files)}] {mark} {hwp_file}")
+        
+        return [results[hwp_file] for hwp_file in hwp_files]
+    
+    def _fingerprint(self, hwp_filename):
+        """원본 HWP 파일의 크기/수정시각/내용 해시 (파일이 없으면 None)"""
+        hwp_path = os.path.join(self.input_folder, hwp_filename)
+        if not os.path.exists(hwp_path):
+            return None
+        stat = os.stat(hwp_path)
+        return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'sha256': file_sha256(hwp_path)}
+    
+    def _check_manifest_entry(self, entry, hwp_filename):
+        """manifest 항목이 여전히 유효한지 확인 (유효하면 항목 반환)"""
+        if not entry:
+            return None
+        
+        hwp_path = os.path.join(self.input_folder, hwp_filename)
+        txt_path = entry['result'].get('txt_path')
+        if not txt_path or not os.path.exists(hwp_path) or not os.path.exists(txt_path):
+            return None
+        
+        # 출력 TXT가 기록 이후 변경/삭제되었으면 재변환
+        txt_stat = os.stat(txt_path)
+        if txt_stat.st_size != entry['txt_size'] or txt_stat.st_mtime_ns != entry['txt_mtime_ns']:
+            return None
+        
+        # 크기/수정시각이 같으면 해시 계산 생략, 수정시각만 바뀐 경우 해시로 최종 확인
+        source = entry['source']
+        stat = os.stat(hwp_path)
+        if stat.st_size != source['size']:
+            return None
+        if stat.st_mtime_ns != source['mtime_ns']:
+            if file_sha256(hwp_path) != source['sha256']:
+                return None
+            source['mtime_ns'] = stat.st_mtime_ns
+        
+        return entry
+    
+    def load_manifest(self):
+        """conversion_manifest.json 로드 (없거나 손상되면 빈 manifest)"""
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+    
+    def _update_manifest(self, manifest, converted_results, fingerprints):
+        """새로 변환한 파일을 manifest 에 반영하고 저장"""
+        for hwp_file, result in converted_results.items():
+            source = fingerprints.get(hwp_file)
+            if not result.get('txt_path') or not source:
+                manifest.pop(hwp_file, None)
+                continue
+            
+            txt_stat = os.stat(result['txt_path'])
+            manifest[hwp_file] = {
+                'source': source,
+                'txt_size': txt_stat.st_size,
+                'txt_mtime_ns': txt_stat.st_mtime_ns,
+                'result': {k: v for k, v in result.items() if k != 'preview'},
+            }
+        
+        # 입력 폴더에서 사라진 파일 정리
+        for hwp_file in list(manifest):
+            if not os.path.exists(os.path.join(self.input_folder, hwp_file)):
+                del manifest[hwp_file]
+        
+        tmp_path = self.manifest_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.manifest_path)
+    
+    def write_report(self, results, workers=1):
+        """변환 결과 집계 리포트 저장 (conversion_report.json)"""
+        quality_counts = Counter(r.get('quality') or 'failed' for r in results)
+        report = {
+            'total_files': len(results),
+            'success_count': sum(1 for r in results if r['success']),
+            'workers': workers,
+            'total_text_length': sum(r.get('text_length', 0) for r in results),
+            'total_korean_count': sum(r.get('korean_count', 0) for r in results),
+            'quality_distribution': dict(quality_counts),
+            'files': [{k: v for k, v in r.items() if k != 'preview'} for r in results],
+        }
+        
+        report_path = os.path.join(self.output_folder, self.REPORT_FILENAME)
+        with open(report_path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        
+        print(f"\n 변환 리포트 저장: {report_path}")
+        return report
 
 
 def main():
@@ -251,22 +815,29 @@ def main():
     
     converter = HWPConverter(
         input_folder="data/hwp_files",
-        output_folder="data/txt_files"
+        output_folder="data/txt_files",
+        incremental=True
     )
     
     print("\n변환 모드를 선택하세요:")
     print("1. 모든 HWP 파일 변환")
-    print("2. 특정 파일만 변환")
-    print("3. 종료")
+    print("2. 모든 HWP 파일 병렬 변환")
+    print("3. 특정 파일만 변환")
+    print("4. 종료")
     
-    choice = input("\n선택 (1, 2, 3): ").strip()
+    choice = input("\n선택 (1, 2, 3, 4): ").strip()
     
-    if choice == '1':
-        converter.convert_all_files()
-    elif choice == '2':
+    if choice in ('1', '2'):
+        force = input("\n변경되지 않은 파일도 모두 다시 변환할까요? (y/N): ").strip().lower() == 'y'
+        if choice == '1':
+            converter.convert_all_files(force=force)
+        else:
+            workers = input(f"\n워커 수 (기본 {os.cpu_count()}): ").strip()
+            converter.convert_all_files(workers=int(workers) if workers else os.cpu_count(), force=force)
+    elif choice == '3':
         filename = input("\nHWP 파일명 입력 (예: EG_001.hwp): ").strip()
         converter.convert_single_file(filename)
-    elif choice == '3':
+    elif choice == '4':
         print("프로그램을 종료합니다.")
     else:
         print("❌ 잘못된 선택입니다.")
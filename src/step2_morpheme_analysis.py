@@ -4,10 +4,205 @@ Q) A) 패턴이 있는 문장만 추출해서 분석
 """
 
 import os
+import sys
 import json
 import re
+import subprocess
 from pathlib import Path
 from collections import Counter
+from itertools import islice
+from multiprocessing.util import Finalize
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from concurrent.futures.process import BrokenProcessPool
+
+import numpy as np
+
+from result_cache import ResultCache, make_cache_key
+from corpus_index import CorpusIndex
+
+
+# 품사 태그 접두사 → 결과 버킷 (extract_morphemes 의 분류 순서와 동일)
+POS_BUCKETS = (
+    ('NN', 'nouns'),          # 명사
+    ('VV', 'verbs'),          # 동사
+    ('VA', 'adjectives'),     # 형용사
+    ('MA', 'adverbs'),        # 부사
+    ('IC', 'interjections'),  # 감탄사
+)
+BUCKET_NAMES = tuple(bucket for _, bucket in POS_BUCKETS)
+
+# mecab-ko-dic 품사 태그 목록 (복합 태그 'VV+EC' 등은 처음 만날 때 표에 추가)
+MECAB_KO_TAGS = (
+    'NNG', 'NNP', 'NNB', 'NNBC', 'NR', 'NP', 'VV', 'VA', 'VX', 'VCP', 'VCN',
+    'MM', 'MAG', 'MAJ', 'IC', 'JKS', 'JKC', 'JKG', 'JKO', 'JKB', 'JKV', 'JKQ',
+    'JX', 'JC', 'EP', 'EF', 'EC', 'ETN', 'ETM', 'XPN', 'XSN', 'XSV', 'XSA', 'XR',
+    'SF', 'SE', 'SSO', 'SSC', 'SC', 'SY', 'SL', 'SH', 'SN', 'UNKNOWN',
+)
+
+
+def _bucket_of(tag):
+    for prefix, bucket in POS_BUCKETS:
+        if tag.startswith(prefix):
+            return bucket
+    return None
+
+
+TAG_TO_BUCKET = {tag: _bucket_of(tag) for tag in MECAB_KO_TAGS}
+
+
+def tag_bucket(tag):
+    """품사 태그의 버킷 이름 (해당 없으면 None) - 미리 계산된 표 조회"""
+    try:
+        return TAG_TO_BUCKET[tag]
+    except KeyError:
+        bucket = TAG_TO_BUCKET[tag] = _bucket_of(tag)
+        return bucket
+
+
+# 배치 태깅 시 문서 사이에 넣는 구분 토큰 (같은 기호가 이어지면 Mecab 이 토큰 하나로 묶음)
+BATCH_SEPARATOR = '■' * 8
+
+
+# Q/A 구간 추출 패턴 (모듈 로드 시 한 번만 컴파일)
+# - QA_LABEL_PATTERN: Q/A 로 시작하는 줄 판별 (대소문자 무시, 'Q)' 'Q:' 'Q：' 등은 모두 'Q' 로 시작)
+# - QA_LABEL_STRIP: 줄 앞 라벨 제거 (기존 동작과 같이 대소문자 구분, 'Q' 가 먼저 맞으므로 'Q)' 는 'Q' 만 제거)
+# - QA_MARKER_PATTERN: 통계용 Q/A 표시 'Q)' 'Q:' '질문' / 'A)' 'A:' '답변' (줄 어디에 있어도 셈)
+QA_LABEL_PATTERN = re.compile(r'\s*([QqAa]|질문|답변)')
+QA_LABEL_STRIP = re.compile(r'[\s]*(Q|Q\)|Q:|질문|Q：|A|A\)|A:|답변|A：)\s*')
+QA_MARKER_PATTERN = re.compile(r'[QqAa][):]|질문|답변')
+
+# 분석 모드 → 분석할 발화자 (None 이면 Q/A 모두)
+QA_MODE_SPEAKERS = {
+    'qa_only': None,
+    'questions_only': ('Q',),
+    'answers_only': ('A',),
+}
+
+QA_MODE_NAMES = {
+    'qa_only': 'Q&A 패턴만',
+    'questions_only': '질문(Q)만',
+    'answers_only': '답변(A)만',
+}
+
+
+def extract_qa_turns(text):
+    """
+    Q/A 발화 목록과 통계를 함께 반환 (줄 단위 한 번 + 표시 검색 한 번)
+    - turns: Q/A 라벨로 시작하는 줄마다
+      {'speaker': 'Q'/'A', 'line': 줄 번호, 'span': (시작, 끝) 문자 위치, 'raw': 원문 줄, 'text': 라벨 제거 텍스트}
+    - statistics: get_qa_statistics 와 같은 형식
+    """
+    turns = []
+    label_match = QA_LABEL_PATTERN.match
+    strip_match = QA_LABEL_STRIP.match
+    
+    offset = 0
+    for line_no, line in enumerate(text.split('\n')):
+        end = offset + len(line)
+        
+        label = label_match(line)
+        if label:
+            stripped = strip_match(line)
+            turns.append({
+                'speaker': 'Q' if label.group(1)[0] in 'Qq질' else 'A',
+                'line': line_no,
+                'span': (offset, end),
+                'raw': line,
+                'text': line[stripped.end():] if stripped else line,
+            })
+        
+        offset = end + 1
+    
+    q_count = a_count = 0
+    for marker in QA_MARKER_PATTERN.findall(text):
+        if marker[0] in 'Qq질':
+            q_count += 1
+        else:
+            a_count += 1
+    
+    return {
+        'turns': turns,
+        'statistics': {
+            'q_count': q_count,
+            'a_count': a_count,
+            'total_qa_sections': q_count + a_count
+        }
+    }
+
+
+def join_qa_turns(turns, include_qa_label=False, speakers=None):
+    """발화 목록을 분석용 텍스트로 합침 (speakers 로 Q 또는 A 발화만 선택 가능)"""
+    if speakers is not None:
+        turns = [turn for turn in turns if turn['speaker'] in speakers]
+    if include_qa_label:
+        return '\n'.join(turn['raw'] for turn in turns)
+    return '\n'.join(turn['text'] for turn in turns if turn['text'].strip())
+
+
+def count_buckets(output_data):
+    """분석 결과의 all_* 단어 목록을 버킷별 Counter 로 변환"""
+    return {bucket: Counter(output_data[f'all_{bucket}']) for bucket in BUCKET_NAMES}
+
+
+# compact 형식 (.npz): 문서 단위 어휘표 + 버킷별 단어 ID 배열 + 버킷별 빈도
+COMPACT_FORMAT_VERSION = 1
+
+
+def compact_path_for(morpheme_json_path):
+    """<이름>_morpheme.json 옆에 두는 compact 파일 경로 (<이름>_morpheme.npz)"""
+    return str(Path(morpheme_json_path).with_suffix('.npz'))
+
+
+def save_compact_morphemes(output_data, npz_path):
+    """
+    형태소 결과를 compact 형식으로 저장
+    - vocabulary: 등장 순서대로의 고유 단어 배열
+    - <버킷>_ids: 버킷별 단어 ID 배열 (원래 순서 유지)
+    - counts: [버킷 수, 어휘 수] 빈도 행렬 (BUCKET_NAMES 순서)
+    """
+    word_ids = {}
+    bucket_ids = {}
+    for bucket in BUCKET_NAMES:
+        words = output_data[f'all_{bucket}']
+        bucket_ids[bucket] = np.fromiter(
+            (word_ids.setdefault(word, len(word_ids)) for word in words),
+            dtype=np.int32, count=len(words)
+        )
+    
+    vocabulary = np.array(list(word_ids), dtype=str)
+    counts = np.stack([
+        np.bincount(bucket_ids[bucket], minlength=len(word_ids)).astype(np.int32)
+        for bucket in BUCKET_NAMES
+    ])
+    
+    np.savez(
+        npz_path,
+        format_version=np.int32(COMPACT_FORMAT_VERSION),
+        filename=np.array(output_data['filename']),
+        vocabulary=vocabulary,
+        counts=counts,
+        **{f'{bucket}_ids': ids for bucket, ids in bucket_ids.items()}
+    )
+
+
+def load_compact_morphemes(npz_path, include_words=True):
+    """
+    compact 형식 로드
+    - 'filename', 'vocabulary', 'counts'(버킷 → 단어별 빈도 배열) 를 담은 dict 반환
+    - include_words=True 면 JSON 과 같은 all_<버킷> 단어 목록도 ID 배열에서 복원
+    """
+    with np.load(npz_path, allow_pickle=False) as data:
+        vocabulary = data['vocabulary']
+        counts = data['counts']
+        result = {
+            'filename': str(data['filename']),
+            'vocabulary': vocabulary.tolist(),
+            'counts': {bucket: counts[i] for i, bucket in enumerate(BUCKET_NAMES)},
+        }
+        if include_words:
+            for bucket in BUCKET_NAMES:
+                result[f'all_{bucket}'] = vocabulary[data[f'{bucket}_ids']].tolist()
+    return result
 
 
 def init_mecab():
@@ -29,6 +224,7 @@ def init_mecab():
             
             mecab.morphs("테스트")
             print(f"✅ Mecab 초기화 성공 (경로: {path or '기본'})")
+            mecab.dictionary_path = path
             return mecab
         except:
             continue
@@ -36,21 +232,85 @@ def init_mecab():
     raise Exception("Mecab 초기화 실패!")
 
 
+def default_mecab_dicdir(mecab=None):
+    """
+    경로 없이 만든 Mecab 이 실제로 쓰는 사전 폴더 (sys.dic 이 있는 폴더, 못 찾으면 None)
+    - 태거의 사전 정보(sys.dic 경로) → konlpy Mecab 기본 dicpath → mecab-config --dicdir 순서로 확인
+    """
+    candidates = []
+    try:
+        candidates.append(os.path.dirname(mecab.tagger.dictionary_info().filename))
+    except Exception:
+        pass
+    
+    try:
+        import inspect
+        from konlpy.tag import Mecab
+        candidates.append(inspect.signature(Mecab.__init__).parameters['dicpath'].default)
+    except Exception:
+        pass
+    
+    try:
+        dicdir = subprocess.run(['mecab-config', '--dicdir'], capture_output=True, text=True,
+                                timeout=5).stdout.strip()
+        if dicdir:
+            candidates += [os.path.join(dicdir, 'mecab-ko-dic'), dicdir]
+    except (OSError, subprocess.SubprocessError):
+        pass
+    
+    for candidate in candidates:
+        if isinstance(candidate, str) and os.path.exists(os.path.join(candidate, 'sys.dic')):
+            return candidate
+    return None
+
+
+def mecab_dictionary_id(path, mecab=None):
+    """
+    캐시 키에 넣을 Mecab 사전 식별자 (경로 + sys.dic 크기/수정시각)
+    - 기본 사전(path 없음)이면 실제 사전 폴더를 찾아 같은 방식으로 식별 (default_mecab_dicdir)
+    """
+    if not path:
+        path = default_mecab_dicdir(mecab)
+        if not path:
+            return 'default'
+    
+    sys_dic = os.path.join(path, 'sys.dic')
+    if os.path.exists(sys_dic):
+        stat = os.stat(sys_dic)
+        return f"{path}:{stat.st_size}:{int(stat.st_mtime)}"
+    return path
+
+
 class QAMorphemeAnalyzer:
     """Q&A 패턴 필터링 형태소 분석기"""
     
-    def __init__(self, txt_folder="data/txt_files", output_folder="output/morpheme"):
+    def __init__(self, txt_folder="data/txt_files", output_folder="output/morpheme",
+                 cache_path=None, cache_max_bytes=256 * 1024 * 1024, compact_output=False,
+                 index_path=None):
+        """
+        cache_path: 형태소 분석 결과 캐시(SQLite) 경로 - 지정하면 같은 텍스트/설정은 다시 분석하지 않음
+        cache_max_bytes: 캐시 크기 상한 (넘으면 오래 사용하지 않은 결과부터 제거)
+        compact_output: True 면 JSON 옆에 compact 형식(.npz)도 저장 (save_compact_morphemes 참고)
+        index_path: 코퍼스 빈도 색인(SQLite) 경로 - 지정하면 파일 분석이 끝날 때마다 버킷별 TF/DF 갱신
+        """
         self.txt_folder = txt_folder
         self.output_folder = output_folder
+        self.compact_output = compact_output
         os.makedirs(output_folder, exist_ok=True)
         
         print("Mecab 형태소 분석기 초기화 중...")
         self.mecab = init_mecab()
+        self.dictionary_id = mecab_dictionary_id(getattr(self.mecab, 'dictionary_path', None), self.mecab)
         
         self.stopwords = {
             '것', '수', '등', '및', '약', '또', '이', '그', '저', '제',
             '안', '밖', '위', '아래', '좀', '더', '때', '거', '나', '내'
         }
+        
+        self.cache_path = cache_path
+        self.cache_max_bytes = cache_max_bytes
+        self.cache = ResultCache(cache_path, max_bytes=cache_max_bytes) if cache_path else None
+        self.index = CorpusIndex(index_path) if index_path else None
     
     def load_text_file(self, txt_path):
         try:
@@ -60,70 +320,70 @@ class QAMorphemeAnalyzer:
             print(f"  ❌ 파일 읽기 실패: {e}")
             return None
     
-    def extract_qa_sections(self, text, include_qa_label=False):
-        # ... (Q&A 섹션 추출 로직 생략) ...
-        lines = text.split('\n')
-        qa_lines = []
-        qa_pattern = re.compile(r'^[\s]*(Q|Q\)|Q:|질문|Q：|A|A\)|A:|답변|A：)', re.IGNORECASE)
-        for line in lines:
-            if qa_pattern.match(line.strip()):
-                qa_lines.append(line)
-        
-        if include_qa_label:
-            return '\n'.join(qa_lines)
-        else:
-            cleaned_lines = []
-            for line in qa_lines:
-                cleaned = re.sub(r'^[\s]*(Q|Q\)|Q:|질문|Q：|A|A\)|A:|답변|A：)\s*', '', line)
-                if cleaned.strip():
-                    cleaned_lines.append(cleaned)
-            return '\n'.join(cleaned_lines)
+    def extract_qa_sections(self, text, include_qa_label=False, speakers=None):
+        """Q/A 라벨로 시작하는 줄만 추출 (speakers=('A',) 처럼 발화자 선택 가능)"""
+        return join_qa_turns(extract_qa_turns(text)['turns'], include_qa_label, speakers)
     
     def get_qa_statistics(self, text):
-        # ... (Q&A 통계 로직 생략) ...
-        q_count = len(re.findall(r'(Q\)|Q:|질문)', text, re.IGNORECASE))
-        a_count = len(re.findall(r'(A\)|A:|답변)', text, re.IGNORECASE))
-        
-        return {
-            'q_count': q_count,
-            'a_count': a_count,
-            'total_qa_sections': q_count + a_count
-        }
+        """Q/A 표시 개수 (Q&A 구간과 함께 필요하면 extract_qa_turns 를 한 번만 호출)"""
+        return extract_qa_turns(text)['statistics']
 
     
     def extract_morphemes(self, text):
         """형태소 추출 (명사, 동사, 형용사, 부사, 감탄사 포함)"""
         pos_tags = self.mecab.pos(text)
         
-        nouns = []
-        verbs = []
-        adjectives = []
-        adverbs = []
-        interjections = []
+        result = self.classify_pos_tags(pos_tags)
+        result['all_pos'] = pos_tags
+        return result
+    
+    def classify_pos_tags(self, pos_tags):
+        """(단어, 품사) 목록을 버킷별 단어 목록으로 분류 (불용어/한 글자 제외)"""
+        buckets = {bucket: [] for bucket in BUCKET_NAMES}
+        stopwords = self.stopwords
         
         for word, pos in pos_tags:
-            if word in self.stopwords or len(word) <= 1:
+            bucket = tag_bucket(pos)
+            if bucket is None or len(word) <= 1 or word in stopwords:
                 continue
-            
-            if pos.startswith('NN'):  # 명사
-                nouns.append(word)
-            elif pos.startswith('VV'):  # 동사
-                verbs.append(word)
-            elif pos.startswith('VA'):  # 형용사
-                adjectives.append(word)
-            elif pos.startswith('MA'):  # 부사 (추가)
-                adverbs.append(word)
-            elif pos.startswith('IC'):  # 감탄사 (추가)
-                interjections.append(word)
+            buckets[bucket].append(word)
         
-        return {
-            'all_pos': pos_tags,
-            'nouns': nouns,
-            'verbs': verbs,
-            'adjectives': adjectives,
-            'adverbs': adverbs,
-            'interjections': interjections
-        }
+        return buckets
+    
+    def pos_batch(self, texts):
+        """
+        여러 텍스트를 한 번의 Mecab 호출로 품사 태깅해 텍스트별 (단어, 품사) 목록 반환
+        - 텍스트 사이에 BATCH_SEPARATOR 줄을 넣어 태깅한 뒤 구분 토큰 위치로 다시 나눔
+        - 구분 토큰이 본문에 있거나 개수가 맞지 않으면 텍스트별로 따로 태깅
+        """
+        if len(texts) <= 1 or any(BATCH_SEPARATOR in text for text in texts):
+            return [self.mecab.pos(text) for text in texts]
+        
+        tagged = self.mecab.pos(f'\n{BATCH_SEPARATOR}\n'.join(texts))
+        
+        results = [[]]
+        for word, pos in tagged:
+            if word == BATCH_SEPARATOR:
+                results.append([])
+            else:
+                results[-1].append((word, pos))
+        
+        if len(results) != len(texts):
+            return [self.mecab.pos(text) for text in texts]
+        return results
+    
+    def extract_morphemes_batch(self, texts, batch_size=64):
+        """
+        여러 텍스트(문서 또는 Q/A 줄)의 형태소를 배치 단위로 추출
+        - batch_size 개씩 묶어 Mecab 호출 횟수를 줄임
+        - 텍스트별로 버킷 → 단어 튜플 dict 반환 (all_pos 는 포함하지 않음)
+        """
+        results = []
+        for start in range(0, len(texts), batch_size):
+            for pos_tags in self.pos_batch(texts[start:start + batch_size]):
+                buckets = self.classify_pos_tags(pos_tags)
+                results.append({bucket: tuple(words) for bucket, words in buckets.items()})
+        return results
     
     def get_frequency(self, words, top_n=20):
         counter = Counter(words)
@@ -141,16 +401,46 @@ class QAMorphemeAnalyzer:
         
         print(f"\n{'='*60}")
         print(f" 분석 중: {txt_filename}")
-        print(f"   모드: {'Q&A 패턴만' if mode == 'qa_only' else '전체 텍스트'}")
+        print(f"   모드: {QA_MODE_NAMES.get(mode, '전체 텍스트')}")
         print('='*60)
         
         text = self.load_text_file(txt_path)
         if not text:
             return None
         
-        # ... (분석 텍스트 선택 로직 생략) ...
-        if mode == 'qa_only':
-            analyze_text = self.extract_qa_sections(text, include_qa_label=False)
+        output_data = self.analyze_text(text, txt_filename, mode=mode)
+        output_path = self.save_result(output_data)
+        if self.index is not None:
+            self.index.add_document(txt_filename, count_buckets(output_data))
+        
+        print(f"\n    결과 저장: {output_path}")
+        return output_data
+    
+    def analyze_text(self, text, txt_filename, mode='qa_only'):
+        """
+        텍스트를 바로 분석해 결과 dict 반환 (파일 읽기/저장 없음)
+        - txt_filename 은 결과의 'filename' 항목과 저장 파일명에 사용
+        - 캐시가 켜져 있으면 (텍스트, 모드, 불용어, Mecab 사전) 이 같은 결과를 재사용
+        """
+        if self.cache is None:
+            return self._analyze_text(text, txt_filename, mode)
+        
+        key = make_cache_key('morpheme', text, mode, sorted(self.stopwords), self.dictionary_id)
+        cached = self.cache.get(key)
+        if cached is not None:
+            cached['filename'] = txt_filename
+            return cached
+        
+        output_data = self._analyze_text(text, txt_filename, mode)
+        self.cache.put(key, output_data)
+        return output_data
+    
+    def _analyze_text(self, text, txt_filename, mode):
+        # Q/A 발화 추출과 통계를 한 번에 계산
+        qa = extract_qa_turns(text)
+        
+        if mode in QA_MODE_SPEAKERS:
+            analyze_text = join_qa_turns(qa['turns'], speakers=QA_MODE_SPEAKERS[mode])
             if len(analyze_text) == 0:
                 analyze_text = text
                 mode = 'all'
@@ -161,13 +451,13 @@ class QAMorphemeAnalyzer:
         
         # ... (분석 결과 출력 로직 생략) ...
         
-        output_data = {
+        return {
             'filename': txt_filename,
             'analyzer': 'mecab_extended',
             'analysis_mode': mode,
             'original_text_length': len(text),
             'analyzed_text_length': len(analyze_text),
-            'qa_statistics': self.get_qa_statistics(text),
+            'qa_statistics': qa['statistics'],
             'noun_count': len(result['nouns']),
             'verb_count': len(result['verbs']),
             'adjective_count': len(result['adjectives']),
@@ -180,61 +470,254 @@ class QAMorphemeAnalyzer:
             'all_adverbs': result['adverbs'],
             'all_interjections': result['interjections']
         }
-        
-        output_filename = Path(txt_filename).stem + '_morpheme.json'
-        output_path = os.path.join(self.output_folder, output_filename)
+    
+    def result_path(self, txt_filename):
+        """분석 결과 JSON 경로 (<파일명>_morpheme.json)"""
+        return os.path.join(self.output_folder, Path(txt_filename).stem + '_morpheme.json')
+    
+    def load_result(self, txt_filename):
+        """저장된 분석 결과 JSON 읽기 (없거나 읽을 수 없으면 None)"""
+        try:
+            with open(self.result_path(txt_filename), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+    
+    def save_result(self, output_data):
+        """분석 결과를 <파일명>_morpheme.json 으로 저장하고 경로 반환"""
+        output_path = self.result_path(output_data['filename'])
         
         with open(output_path, 'w', encoding='utf-8') as f:
             json.dump(output_data, f, ensure_ascii=False, indent=2)
         
-        print(f"\n    결과 저장: {output_path}")
-        return output_data
+        # compact 파일은 JSON 과 항상 같은 내용이어야 하므로 끈 경우 이전 파일 삭제
+        npz_path = compact_path_for(output_path)
+        if self.compact_output:
+            save_compact_morphemes(output_data, npz_path)
+        elif os.path.exists(npz_path):
+            os.remove(npz_path)
+        
+        return output_path
     
-    def analyze_all_files(self, mode='qa_only'):
-        # ... (전체 파일 분석 및 요약 로직 생략) ...
+    def analyze_all_files(self, mode='qa_only', workers=None):
+        """
+        전체 파일 분석 + morpheme_summary.json 저장
+        - workers 가 2 이상이면 프로세스 풀로 나눠 분석 (각 프로세스는 Mecab 을 한 번만 초기화)
+          작업 프로세스는 결과를 JSON 으로 저장하고, 부모 프로세스가 저장된 JSON 을 읽어 순차 분석과 같은 결과를 반환
+        - 코퍼스 색인이 켜져 있으면 파일이 끝날 때마다 색인 갱신 (병렬 모드에서는 부모 프로세스가 갱신)
+          분석이 끝나면 txt_folder 에 없는 문서는 색인에서 제거
+        """
         txt_files = sorted([f for f in os.listdir(self.txt_folder) if f.endswith('.txt')])
-        if not txt_files: return []
+        if not txt_files:
+            if self.index is not None:
+                self.index.prune([])
+            return []
         
-        results = []
-        total_nouns = []
-        for i, txt_file in enumerate(txt_files, 1):
-            result = self.analyze_single_file(txt_file, mode=mode)
-            if result:
-                results.append(result)
-                total_nouns.extend(result['all_nouns'])
+        if workers and workers > 1:
+            on_result = None
+            if self.index is not None:
+                on_result = lambda result: self.index.add_document(result['filename'], count_buckets(result))
+            results, cache_hits = self._analyze_parallel(txt_files, mode, workers, on_result=on_result)
+        else:
+            results = []
+            for i, txt_file in enumerate(txt_files, 1):
+                result = self.analyze_single_file(txt_file, mode=mode)
+                if result:
+                    results.append(result)
         
         if results:
+            # 문서별 Counter 를 파일 순서대로 더함 (단어 목록을 이어 붙인 뒤 Counter 한 것과 동일)
+            total_nouns = Counter()
+            for result in results:
+                total_nouns += Counter(result['all_nouns'])
+            
             summary = {
                 'total_files': len(results),
                 'analyzer': 'mecab_extended',
                 'analysis_mode': mode,
-                'total_noun_count': len(total_nouns),
-                'unique_noun_count': len(set(total_nouns)),
-                'top_nouns': self.get_frequency(total_nouns, 50)
+                'total_noun_count': sum(total_nouns.values()),
+                'unique_noun_count': len(total_nouns),
+                'top_nouns': total_nouns.most_common(50)
             }
             summary_path = os.path.join(self.output_folder, 'morpheme_summary.json')
             with open(summary_path, 'w', encoding='utf-8') as f:
                 json.dump(summary, f, ensure_ascii=False, indent=2)
+        
+        if self.index is not None:
+            # 원본 TXT 가 삭제된 문서는 색인에서 제거 (TF/DF 가 실행마다 쌓이지 않도록)
+            removed = self.index.prune(txt_files)
+            if removed:
+                print(f"\n 코퍼스 색인: 삭제된 문서 {len(removed)}개 제거")
+            stats = self.index.stats()
+            print(f"\n 코퍼스 색인: 문서 {stats['documents']}개 | " + ', '.join(
+                f"{bucket} {info['unique_terms']}" for bucket, info in stats['buckets'].items()))
+        
+        if self.cache:
+            if workers and workers > 1:
+                print(f"\n 캐시: 적중 {cache_hits} / 미스 {len(results) - cache_hits}")
+            else:
+                stats = self.cache.stats()
+                print(f"\n 캐시: 적중 {stats['hits']} / 미스 {stats['misses']} (저장 {stats['entries']}개)")
             
         return results
+    
+    def _analyze_parallel(self, txt_files, mode, workers, on_result=None):
+        """
+        프로세스 풀 분석 ((파일명 순서의 결과 목록, 캐시 적중 파일 수) 반환)
+        - 작업 프로세스가 저장한 JSON 을 부모 프로세스에서 읽어 결과로 사용 (순차 분석과 같은 형태)
+        - on_result: 파일 하나가 끝날 때마다 부모 프로세스에서 결과로 호출 (완료 순서)
+        - 한 번에 워커 수만큼만 제출하므로, 작업 프로세스가 비정상 종료되면 그때 실행 중이던 파일만
+          하나씩 별도 프로세스에서 다시 분석해 원인 파일만 실패 처리 (아직 제출하지 않은 파일은 새 풀에서 계속)
+        """
+        print(f"\n 병렬 분석 모드: 워커 {workers}개, 파일 {len(txt_files)}개")
+        initargs = (self.txt_folder, self.output_folder, self.stopwords, self.cache_path, self.cache_max_bytes,
+                    self.compact_output)
+        
+        results = {}
+        failed = {}
+        cache_hits = 0
+        pending = list(txt_files)
+        
+        def finish(txt_file, summary):
+            nonlocal cache_hits
+            result = self.load_result(txt_file)
+            if result is None:
+                failed[txt_file] = '결과 파일 읽기 실패'
+                return
+            results[txt_file] = result
+            cache_hits += summary['cache_hit']
+            if on_result:
+                on_result(result)
+            print(f"  [{len(results)}/{len(txt_files)}] ✓ {txt_file}")
+        
+        while pending:
+            crashed = []
+            unsubmitted = []
+            queue = iter(pending)
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=initargs) as executor:
+                running = {}
+                
+                def submit(txt_file):
+                    try:
+                        running[executor.submit(_analyze_in_worker, txt_file, mode)] = txt_file
+                    except BrokenProcessPool:
+                        unsubmitted.append(txt_file)
+                
+                for txt_file in islice(queue, workers):
+                    submit(txt_file)
+                
+                while running:
+                    done, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        txt_file = running.pop(future)
+                        try:
+                            summary = future.result()
+                        except BrokenProcessPool:
+                            crashed.append(txt_file)
+                            continue
+                        except Exception as e:
+                            failed[txt_file] = str(e)
+                        else:
+                            if summary:
+                                finish(txt_file, summary)
+                            else:
+                                failed[txt_file] = '분석 결과 없음'
+                        
+                        if not crashed and not unsubmitted:
+                            for next_file in islice(queue, 1):
+                                submit(next_file)
+            
+            if crashed:
+                # 비정상 종료 당시 실행 중이던 파일만 격리해서 분석
+                print(f"  ⚠️  작업 프로세스 비정상 종료: 실행 중이던 {len(crashed)}개 파일을 하나씩 재시도")
+                for txt_file in sorted(crashed):
+                    summary, error = self._analyze_isolated(txt_file, mode, initargs)
+                    if summary:
+                        finish(txt_file, summary)
+                    else:
+                        failed[txt_file] = error
+            pending = unsubmitted + list(queue)
+        
+        for txt_file, error in sorted(failed.items()):
+            print(f"  ❌ {txt_file}: {error}")
+        
+        return [results[txt_file] for txt_file in txt_files if txt_file in results], cache_hits
+    
+    def _analyze_isolated(self, txt_file, mode, initargs):
+        """파일 하나를 단독 프로세스에서 분석 ((결과, 오류 메시지) 반환)"""
+        with ProcessPoolExecutor(max_workers=1, initializer=_init_worker, initargs=initargs) as executor:
+            try:
+                result = executor.submit(_analyze_in_worker, txt_file, mode).result()
+            except BrokenProcessPool:
+                return None, '작업 프로세스 비정상 종료'
+            except Exception as e:
+                return None, str(e)
+        return result, (None if result else '분석 결과 없음')
+
+
+# 프로세스 풀 작업용 (프로세스마다 한 번 생성)
+_worker_analyzer = None
+
+
+def _init_worker(txt_folder, output_folder, stopwords, cache_path=None, cache_max_bytes=None,
+                 compact_output=False):
+    """작업 프로세스 초기화: Mecab 한 번 로드, 진행 출력은 부모 프로세스에서만"""
+    global _worker_analyzer
+    sys.stdout = open(os.devnull, 'w')
+    _worker_analyzer = QAMorphemeAnalyzer(txt_folder=txt_folder, output_folder=output_folder,
+                                          cache_path=cache_path, cache_max_bytes=cache_max_bytes,
+                                          compact_output=compact_output)
+    _worker_analyzer.stopwords = set(stopwords)
+    if _worker_analyzer.cache is not None:
+        # 프로세스 종료 시 모아 둔 캐시 조회 시각 기록
+        Finalize(_worker_analyzer.cache, _worker_analyzer.cache.close, exitpriority=10)
+
+
+def _analyze_in_worker(txt_file, mode):
+    """파일 하나 분석 후 JSON 저장, 큰 결과 대신 파일명/캐시 적중 여부만 부모에게 반환 (부모는 JSON 을 읽음)"""
+    cache = _worker_analyzer.cache
+    hits_before = cache.hits if cache else 0
+    
+    result = _worker_analyzer.analyze_single_file(txt_file, mode=mode)
+    if not result:
+        return None
+    return {'filename': result['filename'], 'cache_hit': bool(cache) and cache.hits > hits_before}
+
+
+def show_corpus_index(index, k=10):
+    """코퍼스 색인 요약 출력 (버킷별 상위 단어, 단어 DF 조회)"""
+    stats = index.stats()
+    print(f"\n 색인된 문서: {stats['documents']}개")
+    for bucket in BUCKET_NAMES:
+        top = ', '.join(f"{term}({tf}/{df})" for term, tf, df in index.top_terms(bucket, k))
+        print(f"  {bucket:<14} {top}")
+    
+    term = input("\nDF 를 조회할 단어 (엔터: 건너뜀): ").strip()
+    if term:
+        print(f"  '{term}': {index.document_frequency(term)}개 문서 {index.documents_with(term)[:10]}")
 
 
 def main():
     print("\n🔍 2단계: 형태소 분석 (Q&A 패턴 필터링)")
     try:
-        analyzer = QAMorphemeAnalyzer()
+        analyzer = QAMorphemeAnalyzer(cache_path="output/cache/morpheme_cache.sqlite", compact_output=True,
+                                      index_path="output/morpheme/corpus_index.sqlite")
         
-        print("\n분석 모드 선택:")
-        mode_choice = input("1. Q&A 패턴만 분석 / 2. 전체 텍스트 분석 (1-2): ").strip()
-        mode = 'qa_only' if mode_choice == '1' else 'all'
+        choice = input("\n실행 모드 선택: 1. 단일 파일 분석 / 2. 전체 파일 분석 / 3. 코퍼스 색인 조회 (1-3): ").strip()
+        if choice == '3':
+            show_corpus_index(analyzer.index)
+            return
         
-        choice = input("\n실행 모드 선택: 1. 단일 파일 분석 / 2. 전체 파일 분석 (1-2): ").strip()
+        print("\n분석 모드 선택:")
+        mode_choice = input("1. Q&A 패턴만 분석 / 2. 전체 텍스트 분석 / 3. 질문(Q)만 / 4. 답변(A)만 (1-4): ").strip()
+        mode = {'1': 'qa_only', '3': 'questions_only', '4': 'answers_only'}.get(mode_choice, 'all')
         
         if choice == '1':
             filename = input("파일명 (예: EG_001.txt): ").strip()
             analyzer.analyze_single_file(filename, mode=mode)
         elif choice == '2':
-            analyzer.analyze_all_files(mode=mode)
+            workers = input(f"워커 수 (1: 순차 분석 / 기본 {os.cpu_count()}): ").strip()
+            analyzer.analyze_all_files(mode=mode, workers=int(workers) if workers else os.cpu_count())
         else:
             print("❌ 잘못된 선택")
     
@@ -10,8 +10,13 @@ from pathlib import Path
 import warnings
 warnings.filterwarnings('ignore')
 
+from step2_morpheme_analysis import compact_path_for, load_compact_morphemes
+from result_cache import ResultCache, make_cache_key
+
 try:
-    from transformers import pipeline
+    import numpy as np
+    import torch
+    from bert_model_service import MODEL_NAME, LABEL_MAP, get_model_service, model_revision
 except ImportError:
     print("❌ transformers 라이브러리가 설치되지 않았습니다. 설치: pip install transformers torch")
     exit()
@@ -20,61 +25,287 @@ except ImportError:
 class SentimentAnalyzer:
     """감정 분석기 - BERT 전용"""
     
-    MODEL_NAME = "matthewburke/korean_sentiment" 
+    MODEL_NAME = MODEL_NAME
+    LABEL_MAP = LABEL_MAP
+    
+    # 모델 입력 최대 글자 수 (앞부분만 분석)
+    MAX_TEXT_CHARS = 500
     
-    def __init__(self, morpheme_folder="output/morpheme", output_folder="output/sentiment"):
+    # 긴 문서 모드의 윈도우 점수 집계 방법
+    WINDOW_AGGREGATES = ('mean', 'max')
+    
+    def __init__(self, morpheme_folder="output/morpheme", output_folder="output/sentiment",
+                 long_document=False, window_aggregate='mean', window_overlap=None, model_service=None,
+                 backend='torch', cache_path=None, cache_max_bytes=64 * 1024 * 1024, cache_max_entries=None,
+                 lazy_load=False):
+        """
+        long_document: True 면 앞 500자 대신 문서 전체를 겹치는 토큰 윈도우로 나눠 분석 (analyze_bert_windows)
+        window_aggregate: 윈도우 점수 집계 ('mean': 신뢰도 가중 평균 / 'max': 신뢰도가 가장 높은 윈도우)
+        window_overlap: 이웃 윈도우가 겹치는 토큰 수 (기본: 최대 길이의 1/4)
+        model_service: 4단계와 공유할 BertModelService (없으면 MODEL_NAME 의 공유 서비스 사용)
+        backend: 추론 백엔드 ('torch' / 'torch_int8' / 'onnx' / 'onnx_int8', model_service 가 없을 때만 사용)
+        cache_path: 감정 결과 캐시(SQLite) 경로 - 같은 입력 텍스트 + 모델 + 레이블 맵 + 설정이면 추론하지 않음
+                    (지정하면 모델은 캐시에 없는 텍스트를 처음 분석할 때 로드)
+        cache_max_bytes / cache_max_entries: 캐시 크기 상한 (넘으면 오래 사용하지 않은 결과부터 제거)
+        lazy_load: True 면 캐시가 없어도 모델을 처음 필요할 때 로드 (호출하는 쪽이 자체 캐시를 둘 때)
+        """
+        if window_aggregate not in self.WINDOW_AGGREGATES:
+            raise ValueError(f"알 수 없는 집계 방법: {window_aggregate}")
+        
         self.morpheme_folder = morpheme_folder
         self.output_folder = output_folder
+        self.long_document = long_document
+        self.window_aggregate = window_aggregate
+        self.window_overlap = window_overlap
+        self.model_service = model_service
+        self.backend = backend
         os.makedirs(output_folder, exist_ok=True)
         
-        print("감정 분석기 초기화 중...")
-        self.bert_analyzer = self._load_bert_model()
+        self.cache = None
+        if cache_path:
+            self.cache = ResultCache(cache_path, max_bytes=cache_max_bytes, max_entries=cache_max_entries)
+        self._bert_analyzer = None
+        self._load_failed = False
+        self._cache_model_id = None
+        
+        if self.cache is not None or lazy_load:
+            print("✅ 초기화 완료! (BERT 모델은 캐시에 없는 텍스트를 분석할 때 로드)\n")
+            return
         
+        print("감정 분석기 초기화 중...")
         if not self.bert_analyzer:
             raise Exception("❌ BERT 모델 로드 실패. 분석을 진행할 수 없습니다.")
         
         print("✅ 초기화 완료! (BERT 모델만 사용)\n")
     
+    @property
+    def bert_analyzer(self):
+        """감정 분류 파이프라인 (처음 사용할 때 로드, 실패하면 None)"""
+        if self._bert_analyzer is None and not self._load_failed:
+            self._bert_analyzer = self._load_bert_model()
+            self._load_failed = self._bert_analyzer is None
+        return self._bert_analyzer
+    
+    def require_bert_analyzer(self):
+        """로드된 감정 분류 파이프라인 (로드에 실패했으면 예외)"""
+        if not self.bert_analyzer:
+            raise RuntimeError(f"❌ BERT 모델({self.MODEL_NAME}) 로드 실패. 분석을 진행할 수 없습니다.")
+        return self.bert_analyzer
+    
+    def cache_model_id(self):
+        """
+        결과 캐시 키에 넣는 모델 식별자: [모델 이름, 모델 버전, 추론 백엔드]
+        - 모델 버전은 가능하면 로드 없이 구함 (model_revision)
+        - 아직 허브 캐시에 없는 모델(처음 실행)이면 모델을 로드(다운로드)한 뒤 다시 구함
+        - 버전을 끝내 알 수 없으면 저장하지 않고 다음 호출에서 다시 구함 (None 버전으로 쌓인 캐시가 다음 실행에서 모두 빗나가지 않도록)
+        """
+        if self._cache_model_id is not None:
+            return self._cache_model_id
+        
+        revision = model_revision(self.MODEL_NAME)
+        if revision is None and self.bert_analyzer is not None:
+            revision = self.model_service.revision
+        
+        backend = self.model_service.backend_name if self.model_service else self.backend
+        model_id = [self.MODEL_NAME, revision, backend]
+        if revision is not None:
+            self._cache_model_id = model_id
+        return model_id
+    
+    def cache_key(self, kind, text):
+        """결과 캐시 키: 실제 모델 입력 텍스트 + 모델 이름/버전 + 추론 백엔드 + 레이블 맵 (+ 긴 문서 모드 설정)"""
+        settings = [self.window_aggregate, self.window_overlap] if kind == 'bert_windows' else None
+        return make_cache_key('sentiment', kind, text, self.cache_model_id(), self.LABEL_MAP, settings)
+    
     def _load_bert_model(self):
-        """BERT 모델 로드"""
-        print(f"\n🤖 BERT 모델 ({self.MODEL_NAME}) 로딩 중...")
+        """BERT 모델 로드 (공유 서비스의 모델/토크나이저로 파이프라인 구성)"""
         try:
-            # 파이프라인으로 로드
-            analyzer = pipeline(
-                "sentiment-analysis",
-                model=self.MODEL_NAME,
-                tokenizer=self.MODEL_NAME
-            )
-            return analyzer
+            if self.model_service is None:
+                self.model_service = get_model_service(self.MODEL_NAME, self.backend)
+            return self.model_service.pipeline
         except Exception as e:
             print(f"⚠️  {self.MODEL_NAME} 로드 실패: {e}")
             return None
     
     def analyze_bert_based(self, text):
-        """BERT 기반 감정 분석"""
+        """BERT 기반 감정 분석 (캐시에 있으면 모델을 실행하지 않음)"""
+        
+        text = self.prepare_text(text)
+        if self.cache is not None:
+            key = self.cache_key('bert', text)
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
         
         if not self.bert_analyzer: return None
         
         try:
-            if len(text) > 500: text = text[:500]
-            
-            result = self.bert_analyzer(text)[0]
-            
-            # 레이블 변환 맵 (LABEL_0, 1, 2 또는 POSITIVE/NEGATIVE 등 모든 경우 처리)
-            label_map = {
-                'POSITIVE': '긍정', 'NEGATIVE': '부정', 'NEUTRAL': '중립',
-                'positive': '긍정', 'negative': '부정', 'neutral': '중립',
-                'LABEL_0': '부정', 'LABEL_1': '중립', 'LABEL_2': '긍정' # <-- 원시 레이블 매핑
-            }
+            result = self.format_bert_result(self.bert_analyzer(text)[0])
+        except Exception as e:
+            print(f"   ⚠️  BERT 분석 실패: {e}")
+            return None
+        
+        if self.cache is not None:
+            self.cache.put(key, result)
+        return result
+    
+    def prepare_text(self, text):
+        """모델 입력용 텍스트 (MAX_TEXT_CHARS 글자까지)"""
+        return text[:self.MAX_TEXT_CHARS] if len(text) > self.MAX_TEXT_CHARS else text
+    
+    def format_bert_result(self, result):
+        """파이프라인 출력 {'label', 'score'} → 결과 dict"""
+        sentiment = self.LABEL_MAP.get(result['label'], result['label'])
+        return {'method': 'bert', 'sentiment': sentiment, 'confidence': round(result['score'], 3)}
+    
+    def analyze_bert_batch(self, texts, batch_size=16):
+        """
+        여러 텍스트를 배치로 BERT 감정 분석 (입력 순서대로 결과 반환, 실패한 텍스트는 None)
+        - 토큰 길이순으로 정렬해 비슷한 길이끼리 batch_size 개씩 묶음 (패딩 최소화)
+        - 배치 추론이 실패하면 그 배치만 텍스트별로 다시 분석
+        - 캐시에 있는 텍스트는 모델에 넣지 않음 (모두 캐시에 있으면 모델을 로드하지 않음)
+        """
+        prepared = [self.prepare_text(text) for text in texts]
+        results = [None] * len(prepared)
+        
+        pending = range(len(prepared))
+        if self.cache is not None:
+            keys = [self.cache_key('bert', text) for text in prepared]
+            cached = self.cache.get_many(keys)
+            for i, key in enumerate(keys):
+                results[i] = cached.get(key)
+            pending = [i for i in pending if results[i] is None]
+            if not pending: return results
+        
+        if not self.bert_analyzer: return results
+        
+        lengths = [len(ids) for ids in self.bert_analyzer.tokenizer([prepared[i] for i in pending])['input_ids']]
+        order = [pending[j] for j in sorted(range(len(pending)), key=lengths.__getitem__)]
+        
+        for start in range(0, len(order), batch_size):
+            bucket = order[start:start + batch_size]
+            try:
+                outputs = self.bert_analyzer([prepared[i] for i in bucket], batch_size=len(bucket))
+            except Exception as e:
+                print(f"   ⚠️  배치 분석 실패, 텍스트별로 재시도: {e}")
+                for i in bucket:
+                    results[i] = self.analyze_bert_based(prepared[i])
+                continue
             
-            sentiment = label_map.get(result['label'], result['label'])
-            confidence = result['score']
+            for i, output in zip(bucket, outputs):
+                results[i] = self.format_bert_result(output)
             
-            return {'method': 'bert', 'sentiment': sentiment, 'confidence': round(confidence, 3)}
+            if self.cache is not None:
+                self.cache.put_many((keys[i], results[i]) for i in bucket if results[i] is not None)
+        
+        return results
+    
+    def max_model_length(self):
+        """모델이 한 번에 받을 수 있는 토큰 수 (특수 토큰 포함)"""
+        self.require_bert_analyzer()
+        return self.model_service.max_model_length()
+    
+    def model_labels(self):
+        """모델 출력 순서대로의 레이블 이름 (LABEL_MAP 으로 변환)"""
+        self.require_bert_analyzer()
+        id2label = self.model_service.config.id2label
+        return [self.LABEL_MAP.get(id2label[i], id2label[i]) for i in range(len(id2label))]
+    
+    def _forward_probs(self, encoded, batch_size):
+        """토크나이저 출력(텐서)을 batch_size 개씩 추론 백엔드에 넣어 레이블별 확률 반환"""
+        probs = []
+        with torch.no_grad():
+            for start in range(0, len(encoded['input_ids']), batch_size):
+                batch = {k: v[start:start + batch_size] for k, v in encoded.items()}
+                probs.append(torch.softmax(self.model_service.logits(batch).float(), dim=-1).cpu())
+        return torch.cat(probs)
+    
+    def score_texts(self, texts, batch_size=16):
+        """
+        여러 짧은 텍스트(문장/발화)의 레이블별 확률 (입력 순서, shape [텍스트 수, 레이블 수])
+        - 모델 최대 길이에서 자르고, 토큰 길이순으로 batch_size 개씩 묶어 추론 (패딩 최소화)
+        """
+        if not texts:
+            return np.zeros((0, len(self.model_labels())), dtype=np.float32)
+        
+        tokenizer = self.require_bert_analyzer().tokenizer
+        max_length = self.max_model_length()
+        lengths = [len(ids) for ids in tokenizer(texts, truncation=True, max_length=max_length)['input_ids']]
+        order = sorted(range(len(texts)), key=lengths.__getitem__)
+        
+        probs = np.zeros((len(texts), len(self.model_labels())), dtype=np.float32)
+        for start in range(0, len(order), batch_size):
+            bucket = order[start:start + batch_size]
+            encoded = tokenizer([texts[i] for i in bucket], truncation=True, max_length=max_length,
+                                padding=True, return_tensors='pt')
+            probs[bucket] = self._forward_probs(encoded, len(bucket)).numpy()
+        return probs
+    
+    def analyze_bert_windows(self, text, batch_size=16):
+        """
+        긴 문서 감정 분석 (슬라이딩 윈도우)
+        - 토큰 경계에서 모델 최대 길이의 윈도우로 나누고 window_overlap 토큰씩 겹치게 함
+        - 모든 윈도우를 batch_size 개씩 배치 추론한 뒤 window_aggregate 방법으로 문서 레이블 결정
+        - (문서 결과 dict, 윈도우별 결과 목록) 반환, 실패 시 (None, [])
+        """
+        if self.cache is not None:
+            key = self.cache_key('bert_windows', text)
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached['bert_based'], cached['windows']
+        
+        if not self.bert_analyzer: return None, []
+        
+        tokenizer = self.bert_analyzer.tokenizer
+        max_length = self.max_model_length()
+        overlap = max_length // 4 if self.window_overlap is None else self.window_overlap
+        
+        try:
+            encoded = tokenizer(text, truncation=True, max_length=max_length, stride=overlap,
+                                return_overflowing_tokens=True, return_offsets_mapping=True,
+                                padding=True, return_tensors='pt')
+            offsets = encoded.pop('offset_mapping')
+            encoded.pop('overflow_to_sample_mapping', None)
+            probs = self._forward_probs(encoded, batch_size)
         
         except Exception as e:
-            print(f"   ⚠️  BERT 분석 실패: {e}")
-            return None
+            print(f"   ⚠️  BERT 윈도우 분석 실패: {e}")
+            return None, []
+        
+        labels = self.model_labels()
+        confidences, label_ids = probs.max(dim=1)
+        
+        windows = []
+        for i, (window_offsets, mask) in enumerate(zip(offsets, encoded['attention_mask'])):
+            # 특수 토큰/패딩은 (0, 0) 위치이므로 실제 토큰의 문자 범위만 사용
+            spans = window_offsets[(mask == 1) & (window_offsets[:, 1] > 0)]
+            windows.append({
+                'index': i,
+                'char_start': int(spans[:, 0].min()) if len(spans) else 0,
+                'char_end': int(spans[:, 1].max()) if len(spans) else 0,
+                'sentiment': labels[label_ids[i]],
+                'confidence': round(float(confidences[i]), 3),
+                'scores': {label: round(float(p), 3) for label, p in zip(labels, probs[i])},
+            })
+        
+        if self.window_aggregate == 'max':
+            best = int(confidences.argmax())
+            label_id, confidence = int(label_ids[best]), float(confidences[best])
+        else:
+            weighted = (confidences[:, None] * probs).sum(dim=0) / confidences.sum()
+            label_id = int(weighted.argmax())
+            confidence = float(weighted[label_id])
+        
+        bert_result = {
+            'method': 'bert_windows',
+            'sentiment': labels[label_id],
+            'confidence': round(confidence, 3),
+            'aggregate': self.window_aggregate,
+            'window_count': len(windows),
+        }
+        if self.cache is not None:
+            self.cache.put(key, {'bert_based': bert_result, 'windows': windows})
+        return bert_result, windows
     
     def load_json_file(self, file_path):
         try:
@@ -83,11 +314,32 @@ class SentimentAnalyzer:
         except:
             return None
         
+    def load_morpheme_data(self, morpheme_path):
+        """형태소 결과 로드 (compact .npz 가 있으면 JSON 대신 사용, 여기서는 파일명만 필요)"""
+        npz_path = compact_path_for(morpheme_path)
+        if os.path.exists(npz_path):
+            try:
+                return load_compact_morphemes(npz_path, include_words=False)
+            except Exception:
+                pass
+        return self.load_json_file(morpheme_path)
+        
+    def load_original_text(self, morpheme_data):
+        """형태소 결과의 파일명으로 원본 텍스트 로드 ((txt 파일명, 텍스트), 없으면 텍스트는 빈 문자열)"""
+        txt_filename = morpheme_data.get('filename', '')
+        txt_path = os.path.join('data/txt_files', txt_filename)
+        
+        original_text = ""
+        if os.path.exists(txt_path):
+            with open(txt_path, 'r', encoding='utf-8') as f:
+                original_text = f.read()
+        return txt_filename, original_text
+    
     def analyze_single_file(self, morpheme_filename):
         """단일 파일 감정 분석"""
         
         morpheme_path = os.path.join(self.morpheme_folder, morpheme_filename)
-        morpheme_data = self.load_json_file(morpheme_path)
+        morpheme_data = self.load_morpheme_data(morpheme_path)
         if not morpheme_data: return None
         
         print(f"\n{'='*60}")
@@ -95,49 +347,76 @@ class SentimentAnalyzer:
         print('='*60)
         
         # 원본 텍스트 로드
-        txt_filename = morpheme_data.get('filename', '')
-        txt_path = os.path.join('data/txt_files', txt_filename)
-        
-        original_text = ""
-        if os.path.exists(txt_path):
-            with open(txt_path, 'r', encoding='utf-8') as f:
-                original_text = f.read()
-        
+        txt_filename, original_text = self.load_original_text(morpheme_data)
         if not original_text: return None
         
-        bert_result = self.analyze_bert_based(original_text)
+        output_data = self.analyze_text(original_text, txt_filename)
         
-        if not bert_result:
+        if not output_data:
              print(f"   ❌ BERT 분석 실패. 해당 파일을 건너뜁니다.")
              return None
-             
+        
+        bert_result = output_data['bert_based']
         print(f"      감정: {bert_result['sentiment']}")
         print(f"      신뢰도: {bert_result['confidence']}")
+        if 'windows' in output_data:
+            print(f"      윈도우: {bert_result['window_count']}개 ({bert_result['aggregate']} 집계)")
+        
+        output_filename = Path(morpheme_filename).stem.replace('_morpheme', '_sentiment.json')
+        output_path = self.save_result(output_data, output_filename)
+        
+        print(f"\n    결과 저장: {output_path}")
+        return output_data
+    
+    def analyze_text(self, text, txt_filename):
+        """텍스트를 바로 감정 분석해 결과 dict 반환 (파일 읽기/저장 없음, 실패 시 None)"""
+        if self.long_document:
+            bert_result, windows = self.analyze_bert_windows(text)
+        else:
+            bert_result, windows = self.analyze_bert_based(text), None
+        
+        return self.build_output(txt_filename, text, bert_result, windows)
+    
+    def build_output(self, txt_filename, text, bert_result, windows=None):
+        """결과 dict 구성 (긴 문서 모드면 윈도우별 점수 'windows' 포함, 분석 실패 시 None)"""
+        if not bert_result:
+            return None
         
         output_data = {
             'filename': txt_filename,
             'bert_based': bert_result,
-            'text_length': len(original_text)
+            'text_length': len(text)
         }
-        
-        output_filename = Path(morpheme_filename).stem.replace('_morpheme', '_sentiment.json')
+        if windows is not None:
+            output_data['windows'] = windows
+        return output_data
+    
+    def save_result(self, output_data, output_filename=None):
+        """분석 결과 저장 (기본 파일명: <원본 이름>_sentiment.json)"""
+        if output_filename is None:
+            output_filename = Path(output_data['filename']).stem + '_sentiment.json'
         output_path = os.path.join(self.output_folder, output_filename)
         
         with open(output_path, 'w', encoding='utf-8') as f:
             json.dump(output_data, f, ensure_ascii=False, indent=2)
         
-        print(f"\n    결과 저장: {output_path}")
-        return output_data
+        return output_path
     
-    def analyze_all_files(self):
-        """전체 파일 분석"""
+    def analyze_all_files(self, batch_size=None):
+        """
+        전체 파일 분석
+        - batch_size 가 2 이상이면 모든 문서를 먼저 읽은 뒤 길이순 배치로 분석 (analyze_bert_batch)
+        """
         morpheme_files = sorted([f for f in os.listdir(self.morpheme_folder) if f.endswith('_morpheme.json')])
         if not morpheme_files: return []
         
-        results = []
-        for filename in morpheme_files:
-            result = self.analyze_single_file(filename)
-            if result: results.append(result)
+        if batch_size and batch_size > 1:
+            results = self._analyze_batched(morpheme_files, batch_size)
+        else:
+            results = []
+            for filename in morpheme_files:
+                result = self.analyze_single_file(filename)
+                if result: results.append(result)
         
         if results:
             from collections import Counter
@@ -153,13 +432,54 @@ class SentimentAnalyzer:
             with open(summary_path, 'w', encoding='utf-8') as f:
                 json.dump(summary, f, ensure_ascii=False, indent=2)
         
+        if self.cache is not None:
+            stats = self.cache.stats()
+            model_state = '로드됨' if self._bert_analyzer is not None else '로드 안 함'
+            print(f"\n 캐시: 적중 {stats['hits']} / 미스 {stats['misses']} (저장 {stats['entries']}개) | 모델 {model_state}")
+        
+        return results
+    
+    def _analyze_batched(self, morpheme_files, batch_size):
+        """배치 분석 후 파일명 순서대로 결과 저장"""
+        documents = []
+        for morpheme_filename in morpheme_files:
+            morpheme_data = self.load_morpheme_data(os.path.join(self.morpheme_folder, morpheme_filename))
+            if not morpheme_data: continue
+            
+            txt_filename, original_text = self.load_original_text(morpheme_data)
+            if original_text:
+                documents.append((morpheme_filename, txt_filename, original_text))
+        
+        print(f"\n 배치 분석 모드: 문서 {len(documents)}개, 배치 크기 {batch_size}")
+        if self.long_document:
+            # 문서마다 윈도우 전체를 배치 추론
+            analyzed = [self.analyze_bert_windows(text, batch_size=batch_size) for _, _, text in documents]
+        else:
+            bert_results = self.analyze_bert_batch([text for _, _, text in documents], batch_size=batch_size)
+            analyzed = [(bert_result, None) for bert_result in bert_results]
+        
+        results = []
+        for (morpheme_filename, txt_filename, original_text), (bert_result, windows) in zip(documents, analyzed):
+            output_data = self.build_output(txt_filename, original_text, bert_result, windows)
+            if not output_data:
+                print(f"  ❌ {morpheme_filename}: BERT 분석 실패. 해당 파일을 건너뜁니다.")
+                continue
+            
+            output_filename = Path(morpheme_filename).stem.replace('_morpheme', '_sentiment.json')
+            self.save_result(output_data, output_filename)
+            print(f"  ✓ {txt_filename}: {bert_result['sentiment']} ({bert_result['confidence']})")
+            results.append(output_data)
+        
         return results
 
 
 def main():
     print("\n 3단계: 감정 분석 (BERT 모델 전용)")
     try:
-        analyzer = SentimentAnalyzer()
+        long_document = input("문서 전체 분석 (슬라이딩 윈도우, 기본: 앞 500자만) (y/N): ").strip().lower() == 'y'
+        backend = input("추론 백엔드 (torch / torch_int8 / onnx / onnx_int8, 기본 torch): ").strip() or 'torch'
+        analyzer = SentimentAnalyzer(long_document=long_document, backend=backend,
+                                     cache_path="output/cache/sentiment_cache.sqlite")
         
         choice = input("\n실행 모드 선택: 1. 단일 파일 분석 / 2. 전체 파일 분석 (1-2): ").strip()
         
@@ -167,7 +487,8 @@ def main():
             filename = input("파일명 (예: EG_001_morpheme.json): ").strip()
             analyzer.analyze_single_file(filename)
         elif choice == '2':
-            analyzer.analyze_all_files()
+            batch_size = input("배치 크기 (1: 파일별 분석 / 기본 16): ").strip()
+            analyzer.analyze_all_files(batch_size=int(batch_size) if batch_size else 16)
         else:
             print("❌ 잘못된 선택")
     
@@ -0,0 +1,220 @@
+"""
+3단계 (발화 단위): Q/A 발화별 감정 타임라인
+- 2단계 extract_qa_turns 로 나눈 Q/A 발화마다 BERT 감정 점수 계산 (Q/A 라벨이 없는 문서는 문장 단위)
+- 문서 또는 전체 코퍼스의 발화를 한 번에 길이순 배치 추론
+- 같은 문장(인사말, 정형화된 질문 등)은 한 번만 추론 (중복 제거) + 결과 캐시 (SQLite)
+- 결과: <파일명>_turn_sentiment.json (발화별 위치/점수를 열 단위 배열로 저장)
+"""
+
+import os
+import re
+import json
+from pathlib import Path
+
+import numpy as np
+
+from result_cache import ResultCache, make_cache_key
+from step2_morpheme_analysis import extract_qa_turns
+from step3_sentiment_analysis import SentimentAnalyzer
+
+# Q/A 라벨이 없는 문서의 문장 분리 (줄바꿈 또는 문장 부호 뒤)
+SENTENCE_PATTERN = re.compile(r'[^\n.!?。]+[.!?。]*')
+
+
+def split_units(text):
+    """
+    분석 단위로 나눔 ('qa_turns' 또는 'sentences', 단위 목록)
+    - 단위: {'speaker': 'Q'/'A'/None, 'line': 줄 번호, 'span': (시작, 끝), 'text': 분석할 텍스트}
+    """
+    turns = [turn for turn in extract_qa_turns(text)['turns'] if turn['text'].strip()]
+    if turns:
+        return 'qa_turns', [
+            {'speaker': turn['speaker'], 'line': turn['line'], 'span': turn['span'], 'text': turn['text'].strip()}
+            for turn in turns
+        ]
+
+    units = []
+    line = 0
+    last = 0
+    for match in SENTENCE_PATTERN.finditer(text):
+        sentence = match.group().strip()
+        if not sentence:
+            continue
+        start = match.start() + match.group().index(sentence)
+        line += text.count('\n', last, start)
+        last = start
+        units.append({'speaker': None, 'line': line, 'span': (start, start + len(sentence)), 'text': sentence})
+    return 'sentences', units
+
+
+class TurnSentimentAnalyzer:
+    """Q/A 발화(문장) 단위 감정 분석기"""
+
+    def __init__(self, txt_folder="data/txt_files", output_folder="output/sentiment_turns",
+                 cache_path=None, cache_max_bytes=64 * 1024 * 1024, batch_size=32, analyzer=None):
+        """
+        cache_path: 문장 감정 점수 캐시(SQLite) 경로 - 같은 문장 + 모델(버전/백엔드) + 레이블 맵이면 추론하지 않음
+        batch_size: 한 번에 모델에 넣는 문장 수
+        analyzer: 이미 모델을 로드한 SentimentAnalyzer (없으면 새로 생성)
+        """
+        self.txt_folder = txt_folder
+        self.output_folder = output_folder
+        self.batch_size = batch_size
+        os.makedirs(output_folder, exist_ok=True)
+
+        # 캐시를 쓰면 모델은 캐시에 없는 문장을 처음 추론할 때 로드
+        self.analyzer = analyzer or SentimentAnalyzer(lazy_load=bool(cache_path))
+        self.cache = ResultCache(cache_path, max_bytes=cache_max_bytes) if cache_path else None
+        self._labels = None
+
+    @property
+    def labels(self):
+        """
+        모델 출력 순서대로의 레이블 이름
+        - 캐시에 저장해 두고, 모든 문장이 캐시에 있는 실행에서는 모델을 로드하지 않고 캐시에서 읽음
+        """
+        if self._labels is None:
+            key = make_cache_key('turn_sentiment_labels', self.analyzer.cache_model_id(), self.analyzer.LABEL_MAP)
+            if self.cache is not None:
+                self._labels = self.cache.get(key)
+            if self._labels is None:
+                self._labels = self.analyzer.model_labels()
+                if self.cache is not None:
+                    self.cache.put(key, self._labels)
+        return self._labels
+
+    def cache_key(self, sentence):
+        """캐시 키: 문장 + 모델 이름/버전 + 추론 백엔드 + 레이블 맵 (SentimentAnalyzer.cache_model_id)"""
+        return make_cache_key('turn_sentiment', sentence, self.analyzer.cache_model_id(), self.analyzer.LABEL_MAP)
+
+    def score_sentences(self, sentences):
+        """
+        문장 목록의 레이블별 확률 배열 (입력 순서, shape [문장 수, 레이블 수])
+        - 중복 문장은 한 번만 계산하고, 캐시에 있는 문장은 모델에 넣지 않음
+        """
+        unique = list(dict.fromkeys(sentences))
+        scores = {}
+
+        if self.cache is not None:
+            keys = {sentence: self.cache_key(sentence) for sentence in unique}
+            cached = self.cache.get_many(keys.values())
+            for sentence, key in keys.items():
+                if key in cached:
+                    scores[sentence] = cached[key]
+
+        missing = [sentence for sentence in unique if sentence not in scores]
+        if missing:
+            probs = self.analyzer.score_texts(missing, batch_size=self.batch_size)
+            for sentence, row in zip(missing, probs.tolist()):
+                scores[sentence] = row
+            if self.cache is not None:
+                self.cache.put_many((keys[sentence], scores[sentence]) for sentence in missing)
+
+        print(f"   문장 {len(sentences)}개 | 고유 {len(unique)}개 | 추론 {len(missing)}개")
+        return np.array([scores[sentence] for sentence in sentences], dtype=np.float32).reshape(-1, len(self.labels))
+
+    def build_output(self, txt_filename, unit_type, units, probs):
+        """발화별 결과를 열 단위 배열로 구성 (점수는 소수 3자리)"""
+        label_ids = probs.argmax(axis=1) if len(units) else np.zeros(0, dtype=int)
+        return {
+            'filename': txt_filename,
+            'model': self.analyzer.MODEL_NAME,
+            'unit': unit_type,
+            'labels': self.labels,
+            'count': len(units),
+            'speakers': ''.join(unit['speaker'] or '-' for unit in units),
+            'lines': [unit['line'] for unit in units],
+            'spans': [list(unit['span']) for unit in units],
+            'label_ids': label_ids.tolist(),
+            'scores': np.round(probs.astype(np.float64), 3).tolist(),
+        }
+
+    def analyze_documents(self, documents):
+        """
+        (txt 파일명, 텍스트) 목록을 한 번에 분석
+        - 모든 문서의 발화를 모아 중복 제거 후 배치 추론하고 문서별 결과 목록 반환
+        """
+        split = [(txt_filename, *split_units(text)) for txt_filename, text in documents]
+        sentences = [unit['text'] for _, _, units in split for unit in units]
+        probs = self.score_sentences(sentences)
+
+        results = []
+        offset = 0
+        for txt_filename, unit_type, units in split:
+            results.append(self.build_output(txt_filename, unit_type, units, probs[offset:offset + len(units)]))
+            offset += len(units)
+        return results
+
+    def analyze_text(self, text, txt_filename):
+        """텍스트 한 개 분석 (파일 읽기/저장 없음)"""
+        return self.analyze_documents([(txt_filename, text)])[0]
+
+    def save_result(self, output_data):
+        """결과를 <파일명>_turn_sentiment.json 으로 저장하고 경로 반환"""
+        output_filename = Path(output_data['filename']).stem + '_turn_sentiment.json'
+        output_path = os.path.join(self.output_folder, output_filename)
+
+        with open(output_path, 'w', encoding='utf-8') as f:
+            json.dump(output_data, f, ensure_ascii=False)
+        return output_path
+
+    def load_text_file(self, txt_filename):
+        try:
+            with open(os.path.join(self.txt_folder, txt_filename), 'r', encoding='utf-8') as f:
+                return f.read()
+        except Exception as e:
+            print(f"  ❌ 파일 읽기 실패: {e}")
+            return None
+
+    def analyze_single_file(self, txt_filename):
+        """단일 파일 분석 후 저장"""
+        text = self.load_text_file(txt_filename)
+        if not text:
+            return None
+
+        print(f"\n📄 발화 단위 감정 분석 중: {txt_filename}")
+        output_data = self.analyze_text(text, txt_filename)
+        output_path = self.save_result(output_data)
+        print(f"    결과 저장: {output_path}")
+        return output_data
+
+    def analyze_all_files(self):
+        """전체 파일을 코퍼스 단위로 한 번에 분석 (파일 사이의 중복 문장도 한 번만 추론)"""
+        txt_files = sorted([f for f in os.listdir(self.txt_folder) if f.endswith('.txt')])
+        documents = [(f, text) for f in txt_files for text in [self.load_text_file(f)] if text]
+        if not documents: return []
+
+        print(f"\n📄 발화 단위 감정 분석: 문서 {len(documents)}개")
+        results = self.analyze_documents(documents)
+        for output_data in results:
+            self.save_result(output_data)
+            counts = np.bincount(output_data['label_ids'], minlength=len(self.labels))
+            print(f"  ✓ {output_data['filename']}: 발화 {output_data['count']}개 | " +
+                  ', '.join(f"{label} {count}" for label, count in zip(self.labels, counts)))
+
+        if self.cache is not None:
+            stats = self.cache.stats()
+            print(f"\n 캐시: 적중 {stats['hits']} / 미스 {stats['misses']} (저장 {stats['entries']}개)")
+        return results
+
+
+def main():
+    print("\n 3단계 (발화 단위): Q/A 발화별 감정 타임라인")
+    try:
+        analyzer = TurnSentimentAnalyzer(cache_path="output/cache/turn_sentiment_cache.sqlite")
+
+        choice = input("\n실행 모드 선택: 1. 단일 파일 분석 / 2. 전체 파일 분석 (1-2): ").strip()
+
+        if choice == '1':
+            filename = input("파일명 (예: EG_001.txt): ").strip()
+            analyzer.analyze_single_file(filename)
+        elif choice == '2':
+            analyzer.analyze_all_files()
+        else:
+            print("❌ 잘못된 선택")
+
+    except Exception as e:
+        print(f"\n❌ 오류 발생: {e}")
+
+if __name__ == "__main__":
+    main()
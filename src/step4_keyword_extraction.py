@@ -7,43 +7,81 @@
 import os
 import json
 from pathlib import Path
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 import torch
-from transformers import AutoTokenizer, AutoModelForSequenceClassification
 from collections import Counter
 import numpy as np
 
+from step2_morpheme_analysis import compact_path_for, load_compact_morphemes
+from bert_model_service import get_model_service
+from word_attention import MorphemeIndex, morphemes_of, pool_words, morpheme_scores, top_words
+from attribution import ATTRIBUTION_METHODS, token_attributions
+
 # Step 3와 동일한 모델 이름 재사용
 MODEL_NAME = "matthewburke/korean_sentiment" 
 
 
+def txt_filename_for(morpheme_filename):
+    """형태소 결과 파일명 → 원본 TXT 파일명 (<이름>_morpheme.json → <이름>.txt)"""
+    return morpheme_filename[:-len('_morpheme.json')] + '.txt'
+
+
 class BertAttentionRanker:
     """BERT Attention Score 기반 단어 중요도 추출기"""
     
+    # 'token': WordPiece 조각(## 제거) 단위 평균 / 'word': 표층 단어 단위로 합친 뒤 형태소에 정렬 (word_attention)
+    AGGREGATIONS = ('token', 'word')
+    
     def __init__(self, morpheme_folder="output/morpheme", 
                  sentiment_folder="output/sentiment",
-                 output_folder="output/attention"):
+                 output_folder="output/attention", model_service=None, aggregation='token',
+                 long_document=False, window_overlap=None, batch_size=8, lean_attention=False,
+                 attribution=None, ig_steps=32):
+        """
+        model_service: 3단계와 공유할 BertModelService (없으면 MODEL_NAME 의 공유 서비스 사용)
+        aggregation: Attention 집계 방식 ('token' / 'word')
+        long_document: True 면 앞 512 토큰 대신 문서 전체를 겹치는 윈도우로 나눠 Attention 계산
+        window_overlap: 이웃 윈도우가 겹치는 토큰 수 (기본: 최대 길이의 1/4, 0 이상 최대 길이 - 2 미만)
+        batch_size: 한 번에 forward 하는 윈도우 수 (여러 문서의 윈도우를 함께 묶음)
+        lean_attention: True 면 모든 층의 Attention 대신 마지막 층 CLS 행만 계산 (메모리 절약, 같은 점수)
+        attribution: Attention 대신 쓸 토큰 기여도 ('grad_x_input' / 'integrated_gradients', None 이면 Attention)
+        ig_steps: integrated gradients 보간점 수 (한 배치로 계산하므로 메모리는 steps × 토큰 수에 비례)
+        """
+        if aggregation not in self.AGGREGATIONS:
+            raise ValueError(f"알 수 없는 집계 방식: {aggregation}")
+        if attribution is not None and attribution not in ATTRIBUTION_METHODS:
+            raise ValueError(f"알 수 없는 기여도 방법: {attribution}")
         
+        self.aggregation = aggregation
+        self.long_document = long_document
+        self.window_overlap = window_overlap
+        self.batch_size = batch_size
+        self.lean_attention = lean_attention
+        self.attribution = attribution
+        self.ig_steps = ig_steps
         self.morpheme_folder = morpheme_folder
         self.sentiment_folder = sentiment_folder
         self.output_folder = output_folder
         os.makedirs(output_folder, exist_ok=True)
         
-        print(f"🤖 BERT Attention 모델 ({MODEL_NAME}) 로딩 중...")
-        
         # 🚨 디버깅 코드 추가: 현재 실행 경로 확인
         #print(f"DEBUG: 현재 작업 디렉토리 (CWD): {os.getcwd()}")
         #print(f"DEBUG: 찾는 Sentiment 폴더 경로: {os.path.join(os.getcwd(), sentiment_folder)}")
 
         try:
-            self.tokenizer = AutoTokenizer.from_pretrained(MODEL_NAME)
-            self.model = AutoModelForSequenceClassification.from_pretrained(
-                MODEL_NAME, 
-                output_attentions=True
-            )
-            self.model.eval()
+            # 같은 프로세스의 3단계와 모델/토크나이저 공유 (이미 로드되어 있으면 다시 로드하지 않음)
+            self.model_service = model_service or get_model_service(MODEL_NAME)
+            self.tokenizer = self.model_service.tokenizer
+            self.model = self.model_service.model
             print("✅ BERT Attention 모델 로드 완료!")
         except Exception as e:
             raise Exception(f"❌ BERT 모델 로드 실패: {e}")
+        
+        # 겹침이 윈도우 길이 이상이면 윈도우가 한 토큰씩만 이동해 윈도우 수가 폭증함
+        content_length = self.model_service.max_model_length() - 2  # [CLS], [SEP] 자리
+        if window_overlap is not None and not 0 <= window_overlap < content_length:
+            raise ValueError(f"window_overlap 은 0 이상 {content_length} 미만이어야 합니다: {window_overlap}")
 
     def load_json_file(self, file_path):
         """파일 경로를 받아 JSON 파일을 로드"""
@@ -59,6 +97,16 @@ class BertAttentionRanker:
             print(f"❌ JSON 로드 중 심각한 오류 발생 ({file_path}): {e}")
             return None
         
+    def load_morpheme_data(self, morpheme_path):
+        """형태소 결과 로드 (compact .npz 가 있으면 JSON 을 파싱하지 않고 사용)"""
+        npz_path = compact_path_for(morpheme_path)
+        if os.path.exists(npz_path):
+            try:
+                return load_compact_morphemes(npz_path, include_words=False)
+            except Exception as e:
+                print(f"⚠️  compact 파일 로드 실패, JSON 사용 ({npz_path}): {e}")
+        return self.load_json_file(morpheme_path)
+        
     def get_document_text(self, filename):
         """원본 TXT 파일을 로드"""
         txt_path = os.path.join('data/txt_files', filename)
@@ -67,11 +115,11 @@ class BertAttentionRanker:
                 return f.read()
         return None
 
-    def extract_and_rank(self, morpheme_filename):
-        """단일 파일 Attention Score 추출 및 랭킹"""
+    def load_inputs(self, morpheme_filename):
+        """랭킹에 필요한 (형태소 결과, 감정 결과, 원본 텍스트) 로드 (하나라도 없으면 None)"""
         
         # 1. 필수 데이터 로드
-        morpheme_data = self.load_json_file(os.path.join(self.morpheme_folder, morpheme_filename))
+        morpheme_data = self.load_morpheme_data(os.path.join(self.morpheme_folder, morpheme_filename))
         if not morpheme_data: 
             print(f"⚠️  {morpheme_filename} 파일이 없습니다. Step 2를 먼저 실행하세요.")
             return None
@@ -92,24 +140,192 @@ class BertAttentionRanker:
 
         original_text = self.get_document_text(morpheme_data['filename'])
         if not original_text: return None
+        
+        return morpheme_data, sentiment_data, original_text
+
+    def extract_and_rank(self, morpheme_filename):
+        """단일 파일 Attention Score 추출 및 랭킹"""
+        
+        inputs = self.load_inputs(morpheme_filename)
+        if not inputs: return None
+        morpheme_data, sentiment_data, original_text = inputs
 
         print(f"\n{'='*60}")
         print(f"✨ Attention Score 추출 중: {morpheme_filename}")
         print('='*60)
 
+        output_data = self.rank_document(original_text, morpheme_data, sentiment_data)
+        return self.save_and_report(morpheme_filename, output_data)
+    
+    def save_and_report(self, morpheme_filename, output_data):
+        """랭킹 결과를 <원본 이름>_attention_rank.json 으로 저장하고 상위 10개 출력"""
+        output_filename = Path(morpheme_filename).stem.replace('_morpheme', '_attention_rank.json')
+        output_path = self.save_result(output_data, output_filename)
+        
+        print(f"\n    ✅ Top 10 기여 단어:")
+        for word, score in output_data['top_attention_words'][:10]:
+             print(f"       {word}: {score:.4f}")
+        print(f"\n    결과 저장: {output_path}")
+
+        return output_data
+    
+    def rank_document(self, original_text, morpheme_data, sentiment_data):
+        """원본 텍스트 + Step 2/3 결과로 Attention 랭킹 계산 (파일 읽기/저장 없음)"""
+
+        if self.long_document:
+            return self.rank_documents_windows([(original_text, morpheme_data, sentiment_data['bert_based'])])[0]
+
+        if self.aggregation == 'word':
+            return self.rank_document_words(original_text, morpheme_data, sentiment_data['bert_based'])
+
         # 2. 토큰화 및 Attention 추출 (모델 실행)
         inputs = self.tokenizer(original_text, return_tensors="pt", truncation=True, padding=True)
         
-        with torch.no_grad():
-            outputs = self.model(**inputs)
-        
-        # 3. Attention Score 계산 
-        attentions = outputs.attentions 
-        last_layer_att = attentions[-1][0].mean(dim=0)
-        cls_attention = last_layer_att[0, :].cpu().numpy()
+        # 3. Attention Score 계산 (마지막 층, 헤드 평균, CLS 행)
+        cls_attention = self.token_scores_batch(inputs)[0]
 
         tokens = self.tokenizer.convert_ids_to_tokens(inputs['input_ids'][0])
         
+        return self.rank_tokens(tokens, cls_attention, morpheme_data, sentiment_data['bert_based'])
+    
+    def rank_document_words(self, original_text, morpheme_data, bert_result):
+        """
+        단어 단위 집계: 서브워드 Attention 을 표층 단어로 합친 뒤 형태소별 평균으로 랭킹
+        - 같은 형태소가 여러 번 나오면 등장마다의 단어 점수를 평균
+        """
+        encoded = self.tokenizer(original_text, return_tensors="pt", truncation=True,
+                                 return_offsets_mapping=True)
+        offsets = encoded.pop('offset_mapping')[0].numpy()
+        word_ids = encoded.word_ids(0)
+        cls_attention = self.token_scores_batch(encoded)[0]
+
+        words, scores = pool_words(original_text, offsets, word_ids, cls_attention)
+        terms, sums, counts = morpheme_scores(words, scores, MorphemeIndex(morphemes_of(morpheme_data)))
+        return self.build_output(morpheme_data, bert_result, top_words(terms, sums, counts),
+                                 len(word_ids))
+    
+    def encode_windows(self, text):
+        """
+        문서를 특수 토큰 없이 한 번만 토큰화하고 겹치는 윈도우 범위를 나눔
+        - 반환: {'input_ids', 'offsets', 'word_ids', 'windows': [(시작, 끝) 토큰 위치]}
+        """
+        encoded = self.tokenizer(text, add_special_tokens=False, return_offsets_mapping=True)
+        content_length = self.model_service.max_model_length() - 2  # [CLS], [SEP] 자리
+        overlap = content_length // 4 if self.window_overlap is None else self.window_overlap
+        step = content_length - overlap
+
+        token_count = len(encoded['input_ids'])
+        starts = list(range(0, max(token_count - content_length, 0), step)) + [max(token_count - content_length, 0)]
+        return {
+            'input_ids': encoded['input_ids'],
+            'offsets': np.array(encoded['offset_mapping'], dtype=np.int64).reshape(-1, 2),
+            'word_ids': encoded.word_ids(),
+            'windows': [(start, min(start + content_length, token_count)) for start in starts],
+        }
+
+    def window_attention(self, documents):
+        """
+        여러 문서의 윈도우를 batch_size 개씩 묶어 forward 하고, 문서별 토큰 위치의 평균 CLS Attention 반환
+        - 겹치는 위치는 윈도우별 값을 합계/횟수로 모아 평균 (윈도우 수와 무관하게 정확한 평균)
+        """
+        tokenizer = self.tokenizer
+        sums = [np.zeros(len(doc['input_ids'])) for doc in documents]
+        counts = [np.zeros(len(doc['input_ids'])) for doc in documents]
+        windows = [(d, start, end) for d, doc in enumerate(documents) for start, end in doc['windows']]
+
+        for i in range(0, len(windows), self.batch_size):
+            batch = windows[i:i + self.batch_size]
+            model_inputs = self.pad_batch([
+                [tokenizer.cls_token_id] + documents[d]['input_ids'][start:end] + [tokenizer.sep_token_id]
+                for d, start, end in batch
+            ])
+            cls_attention = self.token_scores_batch(model_inputs)
+
+            for row, (d, start, end) in enumerate(batch):
+                sums[d][start:end] += cls_attention[row, 1:1 + end - start]
+                counts[d][start:end] += 1
+
+        return [total / np.maximum(count, 1) for total, count in zip(sums, counts)]
+
+    def pad_batch(self, sequences):
+        """토큰 id 목록들을 가장 긴 길이에 맞춰 [PAD] 로 채운 모델 입력 (attention_mask 로 패딩 표시)"""
+        width = max(len(ids) for ids in sequences)
+        input_ids = torch.full((len(sequences), width), self.tokenizer.pad_token_id, dtype=torch.long)
+        attention_mask = torch.zeros((len(sequences), width), dtype=torch.long)
+        for row, ids in enumerate(sequences):
+            input_ids[row, :len(ids)] = torch.tensor(ids, dtype=torch.long)
+            attention_mask[row, :len(ids)] = 1
+
+        model_inputs = {'input_ids': input_ids, 'attention_mask': attention_mask}
+        if 'token_type_ids' in self.tokenizer.model_input_names:
+            model_inputs['token_type_ids'] = torch.zeros_like(input_ids)
+        return model_inputs
+
+    def rank_documents_windows(self, items):
+        """
+        긴 문서 모드 랭킹: (원본 텍스트, 형태소 결과, bert_based 감정 결과) 목록 → 문서별 랭킹 결과
+        - 모든 문서의 윈도우를 함께 배치 forward 한 뒤 문서 전체 토큰의 Attention 으로 랭킹
+        """
+        documents = [self.encode_windows(text) for text, _, _ in items]
+        attentions = self.window_attention(documents)
+
+        results = []
+        for (text, morpheme_data, bert_result), doc, attention in zip(items, documents, attentions):
+            total_tokens = len(doc['input_ids']) + 2
+            if self.aggregation == 'word':
+                words, scores = pool_words(text, doc['offsets'], doc['word_ids'], attention)
+                terms, sums, counts = morpheme_scores(words, scores, MorphemeIndex(morphemes_of(morpheme_data)))
+                output_data = self.build_output(morpheme_data, bert_result, top_words(terms, sums, counts),
+                                                total_tokens)
+            else:
+                # rank_tokens 형식에 맞춰 양 끝에 [CLS]/[SEP] 자리를 둠
+                tokens = [self.tokenizer.cls_token] + self.tokenizer.convert_ids_to_tokens(doc['input_ids']) + \
+                         [self.tokenizer.sep_token]
+                output_data = self.rank_tokens(tokens, np.r_[0.0, attention, 0.0], morpheme_data, bert_result)
+            output_data['window_count'] = len(doc['windows'])
+            results.append(output_data)
+        return results
+
+    def build_output(self, morpheme_data, bert_result, ranked_words, total_tokens):
+        """랭킹 결과 dict (top_attention_words: [(단어, 점수)] 상위 30개, 기여도 방법을 쓰면 'attribution' 포함)"""
+        output_data = {
+            'filename': morpheme_data['filename'],
+            'bert_sentiment': bert_result['sentiment'],
+            'bert_confidence': bert_result['confidence'], # 신뢰도 저장
+            'top_attention_words': ranked_words[:30],
+            'total_tokens_analyzed': total_tokens
+        }
+        if self.attribution:
+            output_data['attribution'] = self.attribution
+        return output_data
+    
+    def token_scores_batch(self, model_inputs):
+        """
+        배치 입력의 토큰별 점수 (numpy [배치, 길이])
+        - 기본: 마지막 층 CLS Attention (헤드 평균)
+        - attribution 지정 시: 예측 레이블에 대한 gradient × input / integrated gradients 기여도
+        """
+        if self.attribution:
+            return token_attributions(self.model, self.tokenizer, model_inputs, self.attribution, self.ig_steps)
+        if self.lean_attention:
+            return self.model_service.cls_attention(model_inputs)[0]
+        
+        with torch.no_grad():
+            outputs = self.model(**model_inputs, output_attentions=True)
+        return outputs.attentions[-1].mean(dim=1)[:, 0, :].cpu().numpy()
+    
+    def analyze_and_rank(self, original_text, morpheme_data):
+        """
+        forward 한 번으로 감정 결과와 Attention 랭킹을 함께 계산 (3단계 + 4단계 통합 실행용)
+        - 반환: (3단계 bert_based 형식의 감정 결과, 4단계 랭킹 결과)
+        - 감정은 4단계와 같은 입력 (모델 최대 길이까지의 토큰) 으로 계산됨
+        """
+        bert_result, tokens, cls_attention = self.model_service.analyze(original_text)
+        return bert_result, self.rank_tokens(tokens, cls_attention, morpheme_data, bert_result)
+    
+    def rank_tokens(self, tokens, cls_attention, morpheme_data, bert_result):
+        """토큰별 CLS Attention 을 단어 점수로 모아 형태소에 있는 단어만 랭킹"""
+        
         # 4. 단어별 점수 매핑 및 랭킹
         token_importance = {}
         for i, token in enumerate(tokens[1:-1]):
@@ -122,7 +338,11 @@ class BertAttentionRanker:
 
         # 5. 최종 랭킹
         ranked_words = []
-        all_morphemes = morpheme_data.get('all_nouns', []) + morpheme_data.get('all_verbs', []) + morpheme_data.get('all_adjectives', []) + morpheme_data.get('all_adverbs', []) + morpheme_data.get('all_interjections', [])
+        if 'vocabulary' in morpheme_data:
+            # compact 형식: 어휘표 = 전체 형태소 목록의 고유 단어
+            all_morphemes = set(morpheme_data['vocabulary'])
+        else:
+            all_morphemes = morpheme_data.get('all_nouns', []) + morpheme_data.get('all_verbs', []) + morpheme_data.get('all_adjectives', []) + morpheme_data.get('all_adverbs', []) + morpheme_data.get('all_interjections', [])
         
         for word, scores in token_importance.items():
             avg_score = np.mean(scores)
@@ -132,47 +352,135 @@ class BertAttentionRanker:
 
         ranked_words.sort(key=lambda x: x[1], reverse=True)
         
-        # 6. 결과 저장
-        bert_result = sentiment_data['bert_based']
-        
-        output_data = {
-            'filename': morpheme_data['filename'],
-            'bert_sentiment': bert_result['sentiment'],
-            'bert_confidence': bert_result['confidence'], # 신뢰도 저장
-            'top_attention_words': ranked_words[:30],
-            'total_tokens_analyzed': len(tokens)
-        }
-        
-        output_filename = Path(morpheme_filename).stem.replace('_morpheme', '_attention_rank.json')
+        # 6. 결과 정리
+        return self.build_output(morpheme_data, bert_result, ranked_words, len(tokens))
+    
+    def save_result(self, output_data, output_filename=None):
+        """랭킹 결과 저장 (기본 파일명: <원본 이름>_attention_rank.json)"""
+        if output_filename is None:
+            output_filename = Path(output_data['filename']).stem + '_attention_rank.json'
         output_path = os.path.join(self.output_folder, output_filename)
         
         with open(output_path, 'w', encoding='utf-8') as f:
             json.dump(output_data, f, ensure_ascii=False, indent=2)
         
-        print(f"\n    ✅ Top 10 기여 단어:")
-        for word, score in ranked_words[:10]:
-             print(f"       {word}: {score:.4f}")
-        print(f"\n    결과 저장: {output_path}")
-
-        return output_data
+        return output_path
     
-    def rank_all_files(self):
-        """전체 파일 Attention Score 추출"""
+    def rank_all_files(self, batch_size=None):
+        """
+        전체 파일 Attention Score 추출
+        - 긴 문서 모드: 모든 문서의 윈도우를 함께 배치 처리
+        - batch_size 가 2 이상이면 토큰 길이가 비슷한 문서끼리 묶어 배치 forward (_rank_batched)
+        """
         morpheme_files = sorted([f for f in os.listdir(self.morpheme_folder) if f.endswith('_morpheme.json')])
         if not morpheme_files: return []
         
+        if self.long_document:
+            return self._rank_all_windows(morpheme_files)
+        if batch_size and batch_size > 1:
+            return self._rank_batched(morpheme_files, batch_size)
+        
         results = []
         for filename in morpheme_files:
             result = self.extract_and_rank(filename)
             if result: results.append(result)
         
         return results
+    
+    def _rank_all_windows(self, morpheme_files):
+        loaded = [(filename, inputs) for filename in morpheme_files for inputs in [self.load_inputs(filename)] if inputs]
+        if not loaded: return []
+        
+        print(f"\n✨ 긴 문서 Attention 랭킹: 문서 {len(loaded)}개, 윈도우 배치 {self.batch_size}")
+        outputs = self.rank_documents_windows([(text, morpheme_data, sentiment_data['bert_based'])
+                                               for _, (morpheme_data, sentiment_data, text) in loaded])
+        return [self.save_and_report(filename, output_data) for (filename, _), output_data in zip(loaded, outputs)]
+    
+    def _rank_batched(self, morpheme_files, batch_size, prefetch_workers=4):
+        """
+        배치 랭킹: 전체 문서를 토큰 길이순으로 한 번 정렬한 뒤 batch_size * 4 개씩 그룹으로 나눠 처리
+        - 길이가 비슷한 문서끼리 배치가 되도록 그룹 나누기 전에 코퍼스 전체를 정렬 (결과는 파일명 순서로 반환)
+        - 형태소/감정 JSON 과 TXT 는 스레드 풀에서 미리 읽음 (현재 그룹을 계산하는 동안 다음 그룹 로드)
+        """
+        group_size = batch_size * 4
+        pending = deque()
+        ranked = {}
+        
+        with ThreadPoolExecutor(max_workers=prefetch_workers, thread_name_prefix='prefetch') as executor:
+            # TXT 읽기는 스레드 풀, 토큰화는 (토크나이저를 스레드 간에 공유하지 않도록) 현재 스레드에서
+            texts = executor.map(self.get_document_text, [txt_filename_for(f) for f in morpheme_files])
+            lengths = {filename: self.token_length(text) for filename, text in zip(morpheme_files, texts)}
+            files = iter(sorted(morpheme_files, key=lambda filename: (lengths[filename], filename)))
+            
+            def prefetch():
+                while len(pending) < 2 * group_size:
+                    filename = next(files, None)
+                    if filename is None: break
+                    pending.append((filename, executor.submit(self.load_inputs, filename)))
+            
+            prefetch()
+            while pending:
+                group = [pending.popleft() for _ in range(min(group_size, len(pending)))]
+                prefetch()
+                loaded = [(filename, inputs) for filename, future in group for inputs in [future.result()] if inputs]
+                if loaded:
+                    outputs = self._rank_group(loaded, batch_size)
+                    ranked.update((filename, output) for (filename, _), output in zip(loaded, outputs))
+        
+        return [ranked[filename] for filename in morpheme_files if filename in ranked]
+    
+    def token_length(self, text):
+        """문서의 토큰 수 (특수 토큰 포함, 모델 최대 길이에서 자름, 텍스트가 없으면 0)"""
+        if not text:
+            return 0
+        return len(self.tokenizer(text, truncation=True)['input_ids'])
+    
+    def _rank_group(self, loaded, batch_size):
+        """
+        그룹 안에서 토큰 길이순으로 batch_size 개씩 묶어 forward 한 뒤 문서별 랭킹
+        - 패딩 위치는 attention_mask 로 골라내 점수 집계에서 제외
+        """
+        texts = [text for _, (_, _, text) in loaded]
+        encoded = self.tokenizer(texts, truncation=True, return_offsets_mapping=True)
+        lengths = [len(ids) for ids in encoded['input_ids']]
+        order = sorted(range(len(loaded)), key=lengths.__getitem__)
+        print(f"\n✨ 배치 Attention 랭킹: 문서 {len(loaded)}개, 배치 크기 {batch_size}")
+        
+        outputs = [None] * len(loaded)
+        for start in range(0, len(order), batch_size):
+            bucket = order[start:start + batch_size]
+            model_inputs = self.pad_batch([encoded['input_ids'][i] for i in bucket])
+            scores = self.token_scores_batch(model_inputs)
+            valid = model_inputs['attention_mask'].numpy().astype(bool)
+            
+            for row, i in enumerate(bucket):
+                _, (morpheme_data, sentiment_data, text) = loaded[i]
+                outputs[i] = self.rank_encoded(text, encoded['input_ids'][i], encoded['offset_mapping'][i],
+                                               encoded.word_ids(i), scores[row][valid[row]],
+                                               morpheme_data, sentiment_data['bert_based'])
+        
+        return [self.save_and_report(filename, output_data) for (filename, _), output_data in zip(loaded, outputs)]
+    
+    def rank_encoded(self, text, input_ids, offsets, word_ids, scores, morpheme_data, bert_result):
+        """토큰화 결과 (특수 토큰 포함, 패딩 제외) 와 토큰별 점수로 랭킹 (집계 방식에 따라 토큰/단어 단위)"""
+        if self.aggregation == 'word':
+            words, word_scores = pool_words(text, np.array(offsets, dtype=np.int64).reshape(-1, 2), word_ids, scores)
+            terms, sums, counts = morpheme_scores(words, word_scores, MorphemeIndex(morphemes_of(morpheme_data)))
+            return self.build_output(morpheme_data, bert_result, top_words(terms, sums, counts), len(input_ids))
+        
+        tokens = self.tokenizer.convert_ids_to_tokens(input_ids)
+        return self.rank_tokens(tokens, scores, morpheme_data, bert_result)
 
 
 def main():
     print("\n 4단계: BERT Attention Score 추출 및 랭킹")
     try:
-        ranker = BertAttentionRanker()
+        aggregation = input("집계 방식: 1. 토큰 단위 / 2. 단어 단위 (형태소 정렬) (기본 1): ").strip()
+        attribution = input("점수: 1. CLS Attention / 2. gradient × input / 3. integrated gradients (기본 1): ").strip()
+        attribution = {'2': 'grad_x_input', '3': 'integrated_gradients'}.get(attribution)
+        long_document = input("문서 전체 분석 (슬라이딩 윈도우, 기본: 앞 512 토큰만) (y/N): ").strip().lower() == 'y'
+        ranker = BertAttentionRanker(aggregation='word' if aggregation == '2' else 'token',
+                                     long_document=long_document, lean_attention=True, attribution=attribution)
         
         choice = input("\n실행 모드 선택: 1. 단일 파일 분석 / 2. 전체 파일 분석 (1-2): ").strip()
         
@@ -181,7 +489,8 @@ def main():
             filename = input("파일명 (예: EG_001_morpheme.json): ").strip()
             ranker.extract_and_rank(filename)
         elif choice == '2':
-            ranker.rank_all_files()
+            batch_size = input("배치 크기 (1: 파일별 분석 / 기본 8): ").strip()
+            ranker.rank_all_files(batch_size=int(batch_size) if batch_size else 8)
         else:
             print("❌ 잘못된 선택")
     
@@ -17,8 +17,10 @@ class EmotionVisualizer:
     
     def __init__(self, 
                  attention_folder="output/attention", # Step 4 결과 (Attention)
-                 output_folder="output/visualization"):
+                 output_folder="output/visualization",
+                 sentiment_folder="output/sentiment"): # Step 3 결과 (윈도우별 감정 점수가 있으면 타임라인)
         self.attention_folder = attention_folder
+        self.sentiment_folder = sentiment_folder
         self.output_folder = output_folder
         
         os.makedirs(output_folder, exist_ok=True)
@@ -152,6 +154,29 @@ class EmotionVisualizer:
         
         print(f"  ✅ 단일 파일 파이 차트 저장: {output_path}")
 
+    def create_sentiment_timeline(self, windows: list, bert_sentiment: str, filename: str):
+        """문서 진행에 따른 감정 변화 (Step 3 윈도우별 점수, 극성 = 긍정 확률 - 부정 확률)"""
+        if not windows: return
+        
+        positions = [(w['char_start'] + w['char_end']) / 2 for w in windows]
+        polarity = [w['scores'].get('긍정', 0.0) - w['scores'].get('부정', 0.0) for w in windows]
+        colors = ['#90EE90' if p > 0 else '#FFB6C6' if p < 0 else '#B0C4DE' for p in polarity]
+        
+        plt.figure(figsize=(14, 6))
+        plt.plot(positions, polarity, color='#555555', linewidth=1.5, zorder=1)
+        plt.scatter(positions, polarity, c=colors, s=60, edgecolors='black', zorder=2)
+        plt.axhline(0, color='gray', linestyle='--', linewidth=1)
+        plt.ylim(-1.05, 1.05)
+        plt.xlabel('문서 위치 (문자)', fontsize=12, fontweight='bold')
+        plt.ylabel('극성 (긍정 - 부정)', fontsize=12, fontweight='bold')
+        plt.title(f'BERT 감정 타임라인 (문서 극성: {bert_sentiment})', fontsize=14, fontweight='bold', pad=20)
+        plt.tight_layout()
+        output_path = os.path.join(self.output_folder, f"{filename}_sentiment_timeline.png")
+        plt.savefig(output_path, dpi=300, bbox_inches='tight')
+        plt.close()
+        
+        print(f"  ✅ 감정 타임라인 저장: {output_path}")
+
     def create_comparison_chart_attention(self, attention_rankings: list, bert_sentiment: str, filename: str, top_n: int = 7):
         """BERT 문서 감성 기반 긍정/부정 단어 비교 차트 (Attention Score 반영)"""
         if not attention_rankings: return
@@ -236,6 +261,11 @@ class EmotionVisualizer:
         # 4. 단일 파일 파이 차트 (신뢰도 사용)
         self.create_pie_chart_for_single_file_bert(bert_sentiment, bert_confidence, filename=filename_prefix)
         
+        # 5. 감정 타임라인 (Step 3 긴 문서 모드 결과가 있을 때)
+        sentiment_data = self.load_json_file(os.path.join(self.sentiment_folder, f'{filename_prefix}_sentiment.json'))
+        if sentiment_data.get('windows'):
+            self.create_sentiment_timeline(sentiment_data['windows'], bert_sentiment, filename_prefix)
+        
         print(f"\n   ✅ 시각화 완료!")
     
     def visualize_all_files(self):
@@ -0,0 +1,63 @@
+"""
+코퍼스 빈도 색인(CorpusIndex) 테스트
+- 문서 추가/교체 시 TF/DF 가 문서별 빈도의 합과 같은지 확인
+- prune 으로 현재 파일 목록에 없는 문서를 제거하면 TF/DF, documents_with 에서도 빠지는지 확인
+- 실행: python src/test_corpus_index.py  (또는 pytest src/test_corpus_index.py)
+"""
+
+import os
+import tempfile
+from collections import Counter
+
+from corpus_index import CorpusIndex
+
+DOCUMENTS = {
+    'a.txt': {'nouns': Counter({'사랑': 2, '행복': 1}), 'verbs': Counter({'먹다': 1})},
+    'b.txt': {'nouns': Counter({'사랑': 1, '여행': 3})},
+    'c.txt': {'nouns': Counter({'행복': 4}), 'verbs': Counter({'먹다': 2})},
+}
+
+
+def make_index(temp_dir):
+    index = CorpusIndex(os.path.join(temp_dir, 'index.sqlite'))
+    for filename, bucket_counts in DOCUMENTS.items():
+        index.add_document(filename, bucket_counts)
+    return index
+
+
+def test_add_and_replace():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        index = make_index(temp_dir)
+        assert index.documents() == ['a.txt', 'b.txt', 'c.txt']
+        assert index.top_terms('nouns', k=3) == [('행복', 5, 2), ('사랑', 3, 2), ('여행', 3, 1)]
+        assert index.document_frequency('먹다') == 2
+
+        # 같은 파일을 다시 넣으면 이전 빈도를 빼고 교체
+        index.add_document('b.txt', {'nouns': Counter({'여행': 1})})
+        assert index.top_terms('nouns', k=3) == [('행복', 5, 2), ('사랑', 2, 1), ('여행', 1, 1)]
+        assert index.document_terms('b.txt', 'nouns') == [('여행', 1)]
+        index.close()
+
+
+def test_prune_removes_deleted_documents():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        index = make_index(temp_dir)
+
+        assert index.prune(['a.txt', 'b.txt']) == ['c.txt']
+        assert index.documents() == ['a.txt', 'b.txt']
+        assert index.top_terms('nouns', k=3) == [('사랑', 3, 2), ('여행', 3, 1), ('행복', 1, 1)]
+        assert index.top_terms('verbs') == [('먹다', 1, 1)]
+        assert index.documents_with('행복') == ['a.txt']
+        assert index.document_terms('c.txt') == {}
+
+        # 남은 문서가 모두 있으면 아무것도 제거하지 않음
+        assert index.prune(['a.txt', 'b.txt', 'new.txt']) == []
+        assert index.prune([]) == ['a.txt', 'b.txt']
+        assert index.stats() == {'documents': 0, 'buckets': {}}
+        index.close()
+
+
+if __name__ == "__main__":
+    test_add_and_replace()
+    test_prune_removes_deleted_documents()
+    print("✅ 코퍼스 색인 테스트 통과")
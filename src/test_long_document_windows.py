@@ -0,0 +1,167 @@
+"""
+긴 문서 윈도우 집계 테스트 (3단계 감정 / 4단계 Attention)
+- 작은 BERT 를 로컬에서 무작위 초기화해 사용 (bench_common.make_tiny_model)
+- 3단계 analyze_bert_windows: 윈도우가 문서 전체를 겹치며 덮는지, mean/max 집계가 윈도우 점수와 맞는지,
+  한 윈도우에 들어가는 문서는 analyze_bert_based 와 같은 결과인지 확인
+- 4단계 window_attention: 윈도우 나누기(encode_windows)가 모든 토큰을 덮는지, 겹치는 위치의 평균이
+  윈도우별 forward 결과의 평균과 같고 배치 크기 / lean_attention 과 무관한지,
+  한 윈도우에 들어가는 문서는 윈도우 없이 계산한 Attention 과 같은지 확인
+- 실행: python src/test_long_document_windows.py  (또는 pytest src/test_long_document_windows.py)
+"""
+
+import os
+import tempfile
+
+import numpy as np
+import pytest
+
+from bench_common import SAMPLE_LINES, make_tiny_model
+from bert_model_service import BertModelService
+from step3_sentiment_analysis import SentimentAnalyzer
+from step4_keyword_extraction import BertAttentionRanker
+
+LONG_TEXT = '\n'.join(SAMPLE_LINES[i % len(SAMPLE_LINES)] for i in range(5 * len(SAMPLE_LINES) + 1))
+SHORT_TEXT = '\n'.join(SAMPLE_LINES[:2])
+
+
+def make_service(temp_dir):
+    return BertModelService(make_tiny_model(os.path.join(temp_dir, 'model'), SAMPLE_LINES))
+
+
+def make_analyzer(temp_dir, service, **kwargs):
+    analyzer_class = type('TinySentimentAnalyzer', (SentimentAnalyzer,), {'MODEL_NAME': service.model_name})
+    return analyzer_class(output_folder=os.path.join(temp_dir, 'sentiment'), long_document=True,
+                          model_service=service, **kwargs)
+
+
+def make_ranker(temp_dir, service, **kwargs):
+    return BertAttentionRanker(output_folder=os.path.join(temp_dir, 'attention'), model_service=service,
+                               long_document=True, **kwargs)
+
+
+def test_sentiment_windows_cover_document():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        service = make_service(temp_dir)
+        # 윈도우 여러 개가 나오도록 최대 길이를 줄임
+        service.tokenizer.model_max_length = 64
+        analyzer = make_analyzer(temp_dir, service, window_overlap=16)
+
+        bert_result, windows = analyzer.analyze_bert_windows(LONG_TEXT, batch_size=3)
+        assert bert_result['window_count'] == len(windows) > 3
+        assert [window['index'] for window in windows] == list(range(len(windows)))
+        assert windows[0]['char_start'] == 0
+        assert windows[-1]['char_end'] == len(LONG_TEXT)
+        for previous, window in zip(windows, windows[1:]):
+            assert previous['char_start'] < window['char_start'] < previous['char_end']
+
+        # 배치 크기와 무관
+        assert analyzer.analyze_bert_windows(LONG_TEXT, batch_size=1) == (bert_result, windows)
+
+
+@pytest.mark.parametrize('aggregate', SentimentAnalyzer.WINDOW_AGGREGATES)
+def test_sentiment_window_aggregate(aggregate):
+    with tempfile.TemporaryDirectory() as temp_dir:
+        service = make_service(temp_dir)
+        service.tokenizer.model_max_length = 64
+        analyzer = make_analyzer(temp_dir, service, window_aggregate=aggregate)
+
+        bert_result, windows = analyzer.analyze_bert_windows(LONG_TEXT)
+        labels = analyzer.model_labels()
+        probs = np.array([[window['scores'][label] for label in labels] for window in windows])
+        confidences = np.array([window['confidence'] for window in windows])
+
+        if aggregate == 'max':
+            best = windows[int(confidences.argmax())]
+            assert (bert_result['sentiment'], bert_result['confidence']) == (best['sentiment'], best['confidence'])
+        else:
+            # 윈도우 점수는 소수 셋째 자리까지 반올림되어 있으므로 오차 허용
+            weighted = (confidences[:, None] * probs).sum(axis=0) / confidences.sum()
+            assert bert_result['sentiment'] == labels[int(weighted.argmax())]
+            assert abs(bert_result['confidence'] - weighted.max()) < 0.005
+        assert bert_result['aggregate'] == aggregate
+
+
+def test_single_sentiment_window_matches_bert_based():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        analyzer = make_analyzer(temp_dir, make_service(temp_dir))
+        for text in [SHORT_TEXT] + SAMPLE_LINES:
+            bert_result, windows = analyzer.analyze_bert_windows(text)
+            expected = analyzer.analyze_bert_based(text)
+            assert len(windows) == 1
+            assert bert_result['sentiment'] == expected['sentiment']
+            assert abs(bert_result['confidence'] - expected['confidence']) <= 0.001
+
+
+def test_encode_windows_cover_all_tokens():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        service = make_service(temp_dir)
+        service.tokenizer.model_max_length = 34
+        ranker = make_ranker(temp_dir, service, window_overlap=8)
+
+        doc = ranker.encode_windows(LONG_TEXT)
+        token_count = len(doc['input_ids'])
+        starts = [start for start, _ in doc['windows']]
+        assert starts[0] == 0 and doc['windows'][-1][1] == token_count
+        assert all(end - start == 32 for start, end in doc['windows'])
+        assert all(b - a == 24 for a, b in zip(starts[:-2], starts[1:-1]))
+        assert 0 < starts[-1] - starts[-2] <= 24
+        assert len(doc['offsets']) == len(doc['word_ids']) == token_count
+
+        short = ranker.encode_windows('짧은 문장')
+        assert short['windows'] == [(0, len(short['input_ids']))]
+
+        # 겹침이 윈도우 길이 이상이면 거부
+        with pytest.raises(ValueError):
+            make_ranker(temp_dir, service, window_overlap=32)
+        with pytest.raises(ValueError):
+            make_ranker(temp_dir, service, window_overlap=-1)
+
+
+def test_window_attention_averages_overlaps():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        service = make_service(temp_dir)
+        service.tokenizer.model_max_length = 34
+        ranker = make_ranker(temp_dir, service, window_overlap=8, batch_size=1)
+        tokenizer = ranker.tokenizer
+
+        documents = [ranker.encode_windows(text) for text in (LONG_TEXT, SHORT_TEXT, LONG_TEXT[100:])]
+
+        # 비교 기준: 윈도우마다 따로 forward 한 CLS Attention 을 위치별로 모아 평균
+        expected = []
+        for doc in documents:
+            collected = [[] for _ in doc['input_ids']]
+            for start, end in doc['windows']:
+                ids = [tokenizer.cls_token_id] + doc['input_ids'][start:end] + [tokenizer.sep_token_id]
+                scores = ranker.token_scores_batch(ranker.pad_batch([ids]))[0]
+                for position in range(start, end):
+                    collected[position].append(scores[1 + position - start])
+            expected.append(np.array([np.mean(values) for values in collected]))
+
+        for batch_size, lean_attention in ((1, False), (4, False), (5, True)):
+            ranker.batch_size = batch_size
+            ranker.lean_attention = lean_attention
+            for attention, reference in zip(ranker.window_attention(documents), expected):
+                assert np.allclose(attention, reference, atol=1e-6)
+
+
+def test_single_attention_window_matches_whole_document():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        ranker = make_ranker(temp_dir, make_service(temp_dir))
+
+        documents = [ranker.encode_windows(text) for text in [SHORT_TEXT] + SAMPLE_LINES]
+        for text, doc, attention in zip([SHORT_TEXT] + SAMPLE_LINES, documents, ranker.window_attention(documents)):
+            inputs = ranker.tokenizer(text, return_tensors='pt', truncation=True)
+            whole = ranker.token_scores_batch(inputs)[0]
+            assert len(doc['windows']) == 1
+            assert np.allclose(attention, whole[1:-1], atol=1e-6)
+
+
+if __name__ == "__main__":
+    test_sentiment_windows_cover_document()
+    for aggregate in SentimentAnalyzer.WINDOW_AGGREGATES:
+        test_sentiment_window_aggregate(aggregate)
+    test_single_sentiment_window_matches_bert_based()
+    test_encode_windows_cover_all_tokens()
+    test_window_attention_averages_overlaps()
+    test_single_attention_window_matches_whole_document()
+    print("✅ 긴 문서 윈도우 집계 테스트 통과")
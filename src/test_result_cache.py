@@ -0,0 +1,128 @@
+"""
+결과 캐시(ResultCache) 테스트
+- 저장/조회, 여러 키 조회, 적중/미스 집계, 파일을 다시 열어도 결과가 남는지 확인
+- 항목 수/크기 상한을 넘으면 가장 오래 사용하지 않은 항목부터 제거하는지 (조회도 사용으로 반영) 확인
+- 조회 시각은 모아 두었다가 저장/닫기 때 (또는 TOUCH_FLUSH_SIZE 개가 쌓이면) 기록하는지, WAL 모드인지 확인
+- 실행: python src/test_result_cache.py  (또는 pytest src/test_result_cache.py)
+"""
+
+import os
+import sqlite3
+import tempfile
+
+import result_cache
+from result_cache import ResultCache, make_cache_key
+
+
+def last_used(path, key):
+    """다른 연결에서 본 last_used (기록되지 않은 조회 시각은 보이지 않음)"""
+    with sqlite3.connect(path) as conn:
+        return conn.execute('SELECT last_used FROM cache WHERE key = ?', (key,)).fetchone()[0]
+
+
+def test_make_cache_key():
+    assert make_cache_key('ab', 'c') != make_cache_key('a', 'bc')
+    assert make_cache_key('x', {'b': 1, 'a': [1, 2]}) == make_cache_key('x', {'a': [1, 2], 'b': 1})
+    assert make_cache_key('a', 'b') != make_cache_key('b', 'a')
+
+
+def test_put_get_and_stats():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, 'cache', 'results.sqlite')
+        cache = ResultCache(path)
+        assert cache.get('a') is None
+
+        cache.put('a', {'sentiment': '긍정', 'confidence': 0.9})
+        cache.put_many([('b', [1, 2]), ('c', '부정')])
+        assert cache.get('a') == {'sentiment': '긍정', 'confidence': 0.9}
+        assert cache.get_many(['b', 'c', 'd', 'b']) == {'b': [1, 2], 'c': '부정'}
+
+        stats = cache.stats()
+        assert (stats['hits'], stats['misses'], stats['entries']) == (3, 2, 3)
+        assert stats['hit_rate'] == 0.6
+        cache.close()
+
+        cache = ResultCache(path)
+        assert cache.get('c') == '부정'
+        cache.clear()
+        assert cache.get('c') is None
+        assert cache.stats()['entries'] == 0
+        cache.close()
+
+
+def test_lru_eviction_by_entries():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        cache = ResultCache(os.path.join(temp_dir, 'cache.sqlite'), max_entries=2)
+        cache.put('a', 1)
+        cache.put('b', 2)
+        assert cache.get('a') == 1  # a 를 최근 사용으로 표시 → 다음 저장 때 b 가 제거됨
+        cache.put('c', 3)
+
+        assert cache.get_many(['a', 'b', 'c']) == {'a': 1, 'c': 3}
+        cache.close()
+
+
+def test_lru_eviction_by_bytes():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        cache = ResultCache(os.path.join(temp_dir, 'cache.sqlite'), max_bytes=30)
+        cache.put('big', 'x' * 40)  # 상한보다 큰 결과는 저장하지 않음
+        assert cache.get('big') is None
+
+        cache.put_many([('a', 'a' * 10), ('b', 'b' * 10)])
+        cache.put('c', 'c' * 10)
+        stats = cache.stats()
+        assert stats['bytes'] <= 30
+        assert cache.get_many(['a', 'b', 'c']) == {'b': 'b' * 10, 'c': 'c' * 10}
+        cache.close()
+
+
+def test_touch_is_batched():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, 'cache.sqlite')
+        cache = ResultCache(path)
+        assert cache.conn.execute('PRAGMA journal_mode').fetchone()[0] == 'wal'
+
+        cache.put_many([('a', 1), ('b', 2)])
+        stored = last_used(path, 'a')
+
+        # 조회만으로는 기록하지 않고, 다음 저장 때 함께 기록
+        cache.get('a')
+        assert last_used(path, 'a') == stored
+        cache.put('c', 3)
+        assert last_used(path, 'a') > stored
+
+        # 닫을 때 남은 조회 시각 기록
+        cache.get_many(['b'])
+        stored = last_used(path, 'b')
+        cache.close()
+        assert last_used(path, 'b') > stored
+
+
+def test_touch_flushes_when_many_keys_are_read():
+    flush_size = result_cache.TOUCH_FLUSH_SIZE
+    result_cache.TOUCH_FLUSH_SIZE = 3
+    try:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, 'cache.sqlite')
+            cache = ResultCache(path)
+            cache.put_many([(key, key) for key in 'abc'])
+            stored = last_used(path, 'a')
+
+            cache.get_many(['a', 'b'])
+            assert last_used(path, 'a') == stored
+            cache.get('c')  # 3개가 쌓이면 쓰기 없이도 기록
+            assert last_used(path, 'a') > stored
+            assert cache._touched == {}
+            cache.close()
+    finally:
+        result_cache.TOUCH_FLUSH_SIZE = flush_size
+
+
+if __name__ == "__main__":
+    test_make_cache_key()
+    test_put_get_and_stats()
+    test_lru_eviction_by_entries()
+    test_lru_eviction_by_bytes()
+    test_touch_is_batched()
+    test_touch_flushes_when_many_keys_are_read()
+    print("✅ 결과 캐시 테스트 통과")
@@ -0,0 +1,68 @@
+"""
+감정 분석 서비스 테스트 (결과 캐시 사용)
+- 작은 BERT 를 로컬에서 무작위 초기화해 서비스를 띄우고, 캐시(SQLite)를 켠 상태로 동시 요청
+- 추론 스레드에서 캐시를 읽고 써도 모든 요청이 200 이고 analyze_bert_based 와 같은 결과인지 확인
+- 두 번째 요청에서는 캐시 적중만으로 응답하는지 확인
+- 실행: python src/test_sentiment_service.py  (또는 pytest src/test_sentiment_service.py)
+"""
+
+import os
+import json
+import asyncio
+import tempfile
+
+from bench_common import SAMPLE_LINES, make_tiny_model
+from sentiment_service import SentimentService
+from step3_sentiment_analysis import SentimentAnalyzer
+
+
+async def request(port, method, path, body=None):
+    """HTTP 요청 한 번 → (상태 코드, 응답 dict)"""
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    data = json.dumps(body, ensure_ascii=False).encode('utf-8') if body is not None else b''
+    writer.write(f"{method} {path} HTTP/1.1\r\nHost: localhost\r\nContent-Length: {len(data)}\r\n"
+                 f"Connection: close\r\n\r\n".encode('latin-1') + data)
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+
+    head, _, payload = response.partition(b'\r\n\r\n')
+    return int(head.split()[1]), json.loads(payload)
+
+
+async def run_requests(service, texts):
+    return await asyncio.gather(*[request(service.port, 'POST', '/analyze', {'text': text}) for text in texts])
+
+
+def test_service_with_cache():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        model_path = make_tiny_model(os.path.join(temp_dir, 'model'), SAMPLE_LINES)
+        analyzer_class = type('TinySentimentAnalyzer', (SentimentAnalyzer,), {'MODEL_NAME': model_path})
+        analyzer = analyzer_class(output_folder=os.path.join(temp_dir, 'sentiment'),
+                                  cache_path=os.path.join(temp_dir, 'cache.sqlite'))
+        texts = [line * (1 + i % 3) for i, line in enumerate(SAMPLE_LINES * 4)]
+
+        async def scenario():
+            service = SentimentService(analyzer=analyzer, port=0, max_batch_size=8, max_wait_ms=5)
+            await service.start()
+            try:
+                cold = await run_requests(service, texts)
+                misses_before = analyzer.cache.stats()['misses']
+                warm = await run_requests(service, texts)
+                return cold, warm, analyzer.cache.stats()['misses'] - misses_before
+            finally:
+                await service.stop()
+
+        cold, warm, warm_misses = asyncio.run(scenario())
+
+        assert [status for status, _ in cold + warm] == [200] * (2 * len(texts))
+        expected = [analyzer.analyze_bert_based(text) for text in texts]
+        assert [payload for _, payload in cold] == expected
+        assert [payload for _, payload in warm] == expected
+        assert warm_misses == 0
+        analyzer.cache.close()
+
+
+if __name__ == "__main__":
+    test_service_with_cache()
+    print("✅ 감정 분석 서비스 테스트 통과")
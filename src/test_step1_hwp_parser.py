@@ -0,0 +1,114 @@
+"""
+1단계 HWP 레코드 순회 / 텍스트 추출 테스트
+- iter_records 와 RecordStream (조각 단위 입력) 이 같은 레코드를 내는지, 확장 크기 레코드와 잘린 꼬리 처리 확인
+- 섹션 텍스트 추출과 바이트 패턴 검색(scan_text_code_units)이 기존 추출기(bench_step1_hwp_parser)와 같은지 확인
+- iter_section_stream 이 압축/비압축 섹션 모두 iter_section_paragraphs 와 같은 문단을 내는지 확인
+- 실행: python src/test_step1_hwp_parser.py  (또는 pytest src/test_step1_hwp_parser.py)
+"""
+
+import io
+
+from bench_step1_hwp_parser import (HWPTAG_PARA_TEXT, compress, legacy_extract_text_from_section,
+                                    legacy_scan_byte_pattern, make_corrupted_data, make_record, make_section)
+from step1_hwp_to_txt_olefile import HWPParser, RecordStream, iter_records, scan_text_code_units
+
+
+class SectionStreams:
+    """섹션 이름 → 바이트 를 olefile 처럼 여는 객체 (openstream / exists 만 사용)"""
+
+    def __init__(self, sections):
+        self.sections = sections
+
+    def exists(self, name):
+        return name in self.sections
+
+    def openstream(self, name):
+        return io.BytesIO(self.sections[name])
+
+
+def make_parser(sections, compressed=True):
+    parser = HWPParser(None, verbose=False)
+    parser.ole = SectionStreams({f'BodyText/Section{i}': compress(data) if compressed else data
+                                 for i, data in enumerate(sections)})
+    parser._compressed = compressed
+    return parser
+
+
+def feed_in_chunks(data, chunk_size):
+    records = RecordStream()
+    result = []
+    for start in range(0, len(data), chunk_size):
+        result.extend(records.feed(data[start:start + chunk_size]))
+    return result, bytes(records.tail)
+
+
+def test_record_stream_matches_iter_records():
+    data = make_section(200)
+    expected = [(tag_id, level, bytes(payload)) for tag_id, level, payload in iter_records(data)]
+    # 마지막 레코드는 확장 크기(0xFFF) 헤더
+    assert len(expected[-1][2]) >= 0xFFF
+
+    for chunk_size in (1, 3, 7, 4096, len(data)):
+        records, tail = feed_in_chunks(data, chunk_size)
+        assert records == expected
+        assert tail == b''
+
+
+def test_incomplete_record_is_kept_as_tail():
+    complete = make_record(HWPTAG_PARA_TEXT, '첫 문단\r'.encode('utf-16le'))
+    partial = make_record(HWPTAG_PARA_TEXT, '잘린 문단\r'.encode('utf-16le'))[:-3]
+    data = complete + partial
+
+    assert [bytes(payload) for _, _, payload in iter_records(data)] == ['첫 문단\r'.encode('utf-16le')]
+    records, tail = feed_in_chunks(data, 5)
+    assert [payload for _, _, payload in records] == ['첫 문단\r'.encode('utf-16le')]
+    assert tail == partial
+
+
+def test_section_text_matches_legacy():
+    parser = HWPParser(None, verbose=False)
+    compressed = compress(make_section(300))
+    assert parser.extract_text_from_section(compressed) == \
+        legacy_extract_text_from_section(parser.decompress_stream(compressed))
+
+
+def test_byte_pattern_scan_matches_legacy():
+    for seed in range(5):
+        data = make_corrupted_data(16 * 1024, seed=seed)
+        assert scan_text_code_units(data) == legacy_scan_byte_pattern(data)
+
+    # 홀수 길이 / 공백만 있는 줄 / 빈 데이터
+    odd = ' 　\r한글 ABC\r\r'.encode('utf-16le') + b'\x00'
+    assert scan_text_code_units(odd) == legacy_scan_byte_pattern(odd) == ['한글 ABC']
+    assert scan_text_code_units(b'') == legacy_scan_byte_pattern(b'') == []
+
+
+def test_section_stream_matches_whole_section():
+    sections = [make_section(120), make_section(7)]
+    for compressed in (True, False):
+        parser = make_parser(sections, compressed)
+        for i, data in enumerate(sections):
+            expected = list(parser.iter_section_paragraphs(data))
+            for chunk_size in (7, 1024):
+                assert list(parser.iter_section_stream(f'BodyText/Section{i}', chunk_size)) == expected
+
+        paragraphs = list(parser.iter_paragraphs())
+        assert [p for s, p in paragraphs if s == 0] == list(parser.iter_section_paragraphs(sections[0]))
+        assert [p for s, p in paragraphs if s == 1] == list(parser.iter_section_paragraphs(sections[1]))
+
+
+def test_section_stream_falls_back_without_text_records():
+    # 텍스트 레코드가 없으면 섹션 전체를 다시 읽어 방법 2/3 으로 추출
+    data = make_corrupted_data(4 * 1024, seed=1)
+    parser = make_parser([data])
+    assert list(parser.iter_section_stream('BodyText/Section0', 64)) == list(parser.iter_section_paragraphs(data))
+
+
+if __name__ == "__main__":
+    test_record_stream_matches_iter_records()
+    test_incomplete_record_is_kept_as_tail()
+    test_section_text_matches_legacy()
+    test_byte_pattern_scan_matches_legacy()
+    test_section_stream_matches_whole_section()
+    test_section_stream_falls_back_without_text_records()
+    print("✅ HWP 레코드 순회 테스트 통과")
@@ -0,0 +1,104 @@
+"""
+2단계 Q/A 발화 추출 / compact 형식 테스트 (Mecab 없이 실행)
+- extract_qa_turns + join_qa_turns 가 기존 Q/A 구간 추출과 통계(bench_step2_morpheme)와 같은지 확인
+- 발화자 선택, 원문 위치(span), 라벨 포함 출력 확인
+- compact 형식(.npz) 저장 → 로드가 JSON 결과의 단어 목록/빈도를 그대로 복원하는지 확인
+- 실행: python src/test_step2_morpheme.py  (또는 pytest src/test_step2_morpheme.py)
+"""
+
+import os
+import tempfile
+from collections import Counter
+
+from bench_common import synthetic_documents
+from bench_step2_morpheme import legacy_extract_qa
+from step2_morpheme_analysis import (BUCKET_NAMES, compact_path_for, count_buckets, extract_qa_turns,
+                                     join_qa_turns, load_compact_morphemes, save_compact_morphemes)
+
+MIXED_TEXT = '\n'.join([
+    "면담 기록",
+    "Q) 오늘 VR 체험은 어떠셨나요?",
+    "  A: 처음에는 어지러웠어요.",
+    "질문 상담은 도움이 되었나요?",
+    "답변 네, 많이요.",
+    "q) 소문자 질문",
+    "a)",
+    "Q：전각 콜론",
+    "메모: Q) 가 줄 중간에 있음",
+    "",
+])
+
+
+def test_qa_turns_match_legacy():
+    for text in synthetic_documents(20, lines=3, vary=7) + [MIXED_TEXT, '', 'Q', '\n\nA) 끝']:
+        qa = extract_qa_turns(text)
+        assert (join_qa_turns(qa['turns']), qa['statistics']) == legacy_extract_qa(text)
+
+
+def test_qa_turns_fields():
+    qa = extract_qa_turns(MIXED_TEXT)
+    turns = qa['turns']
+
+    assert [turn['speaker'] for turn in turns] == ['Q', 'A', 'Q', 'A', 'Q', 'A', 'Q']
+    assert [turn['line'] for turn in turns] == [1, 2, 3, 4, 5, 6, 7]
+    for turn in turns:
+        start, end = turn['span']
+        assert MIXED_TEXT[start:end] == turn['raw']
+    # 기존 동작과 같이 라벨은 'Q'/'A' 한 글자만 제거 (뒤의 ')' ':' 는 남고, 소문자 'q)' 'a)' 는 그대로)
+    assert [turn['text'] for turn in turns[:4]] == [
+        ') 오늘 VR 체험은 어떠셨나요?', ': 처음에는 어지러웠어요.', '상담은 도움이 되었나요?', '네, 많이요.']
+    # 통계는 줄 중간의 표시('소문자 질문', '메모: Q)')도 셈, 전각 콜론 'Q：' 은 세지 않음
+    assert qa['statistics'] == {'q_count': 5, 'a_count': 3, 'total_qa_sections': 8}
+
+    assert join_qa_turns(turns, speakers=('A',)) == ': 처음에는 어지러웠어요.\n네, 많이요.\na)'
+    assert join_qa_turns(turns, include_qa_label=True, speakers=('Q',)).split('\n')[0] == \
+        "Q) 오늘 VR 체험은 어떠셨나요?"
+
+
+def make_output_data():
+    output_data = {'filename': 'sample.txt'}
+    for i, bucket in enumerate(BUCKET_NAMES):
+        output_data[f'all_{bucket}'] = ['체험', '상담', '체험', f'단어{i}', '상담', '체험'][:6 - i]
+    return output_data
+
+
+def test_compact_round_trip():
+    output_data = make_output_data()
+    with tempfile.TemporaryDirectory() as temp_dir:
+        npz_path = compact_path_for(os.path.join(temp_dir, 'sample_morpheme.json'))
+        assert npz_path.endswith('sample_morpheme.npz')
+        save_compact_morphemes(output_data, npz_path)
+
+        loaded = load_compact_morphemes(npz_path)
+        assert loaded['filename'] == 'sample.txt'
+        for bucket in BUCKET_NAMES:
+            assert loaded[f'all_{bucket}'] == output_data[f'all_{bucket}']
+
+        # 빈도 배열은 어휘표 순서, count_buckets(JSON 결과) 와 같음
+        expected = count_buckets(output_data)
+        for bucket in BUCKET_NAMES:
+            counts = Counter({word: int(n) for word, n in zip(loaded['vocabulary'], loaded['counts'][bucket]) if n})
+            assert counts == expected[bucket]
+
+        light = load_compact_morphemes(npz_path, include_words=False)
+        assert 'all_nouns' not in light
+        assert light['vocabulary'] == loaded['vocabulary'] == list(dict.fromkeys(
+            word for bucket in BUCKET_NAMES for word in output_data[f'all_{bucket}']))
+
+
+def test_compact_round_trip_empty_buckets():
+    output_data = {'filename': 'empty.txt', **{f'all_{bucket}': [] for bucket in BUCKET_NAMES}}
+    with tempfile.TemporaryDirectory() as temp_dir:
+        npz_path = os.path.join(temp_dir, 'empty_morpheme.npz')
+        save_compact_morphemes(output_data, npz_path)
+        loaded = load_compact_morphemes(npz_path)
+        assert loaded['vocabulary'] == []
+        assert all(loaded[f'all_{bucket}'] == [] for bucket in BUCKET_NAMES)
+
+
+if __name__ == "__main__":
+    test_qa_turns_match_legacy()
+    test_qa_turns_fields()
+    test_compact_round_trip()
+    test_compact_round_trip_empty_buckets()
+    print("✅ Q/A 발화 추출 / compact 형식 테스트 통과")
@@ -0,0 +1,144 @@
+"""
+단어 단위 Attention 집계(word_attention) 테스트
+- MorphemeIndex: 표층 단어를 같거나 가장 긴 접두사인 형태소에 정렬하는지 확인
+- pool_words: 서브워드 점수를 표층 단어별로 합치고 특수 토큰/패딩(None)을 빼는지, 단순 반복 구현과 같은지 확인
+- morpheme_scores + top_words: 형태소별 평균 점수와 순위(동점이면 형태소 순)가 단순 반복 구현과 같은지 확인
+- 실행: python src/test_word_attention.py  (또는 pytest src/test_word_attention.py)
+"""
+
+import random
+
+import numpy as np
+
+from word_attention import MorphemeIndex, morpheme_scores, morphemes_of, pool_words, top_words
+
+
+def reference_pool_words(text, offsets, word_ids, attention):
+    """단어 번호가 바뀔 때마다 새 단어를 시작하는 단순 반복 구현 (비교 기준)"""
+    words, scores = [], []
+    previous = None
+    for (start, end), word_id, score in zip(offsets, word_ids, attention):
+        if word_id is None:
+            continue
+        if word_id != previous:
+            words.append([start, end])
+            scores.append(0.0)
+            previous = word_id
+        words[-1][1] = end
+        scores[-1] += score
+    return [text[s:e] for s, e in words], scores
+
+
+def reference_top_words(words, scores, morphemes, k=30):
+    """형태소별 평균 점수 (단순 반복 구현, 비교 기준)"""
+    index = MorphemeIndex(morphemes)
+    collected = {}
+    for word, score in zip(words, scores):
+        morpheme = index.align(word)
+        if morpheme is not None:
+            collected.setdefault(morpheme, []).append(score)
+    means = sorted((-np.mean(values), term) for term, values in collected.items())
+    return [(term, -mean) for mean, term in means[:k]]
+
+
+def test_morpheme_index_align():
+    index = MorphemeIndex(['체험', '체', 'VR', '상담사', '상담'])
+    assert index.align('체험은') == '체험'
+    assert index.align('상담사와') == '상담사'
+    assert index.align('상담을') == '상담'
+    assert index.align('VR') == 'VR'
+    assert index.align('오늘') is None
+    assert index.align('') is None
+    assert MorphemeIndex([]).align('체험') is None
+
+
+def test_morphemes_of():
+    assert morphemes_of({'all_nouns': ['체험', '상담'], 'all_verbs': ['하']}) == ['체험', '상담', '하']
+    assert morphemes_of({'vocabulary': ['체험'], 'all_nouns': ['무시']}) == ['체험']
+
+
+def test_pool_words_merges_subwords():
+    text = '체험은 좋았어요'
+    # [CLS] 체험 ##은 좋 ##았어요 [SEP] [PAD]
+    offsets = [(0, 0), (0, 2), (2, 3), (4, 5), (5, 8), (0, 0), (0, 0)]
+    word_ids = [None, 0, 0, 1, 1, None, None]
+    attention = [0.5, 0.1, 0.2, 0.3, 0.4, 0.5, 0.9]
+
+    words, scores = pool_words(text, offsets, word_ids, attention)
+    assert words == ['체험은', '좋았어요']
+    assert np.allclose(scores, [0.3, 0.7])
+
+    words, scores = pool_words(text, [(0, 0)], [None], [1.0])
+    assert words == [] and len(scores) == 0
+
+
+def test_pool_words_matches_reference():
+    rng = random.Random(0)
+    for _ in range(20):
+        words = [''.join(rng.choice('가나다라마바사') for _ in range(rng.randrange(1, 6)))
+                 for _ in range(rng.randrange(1, 30))]
+        text = ' '.join(words)
+
+        offsets, word_ids = [(0, 0)], [None]
+        position = 0
+        for word_id, word in enumerate(words):
+            # 단어를 1~3 글자씩 서브워드로 자름
+            start = position
+            while start < position + len(word):
+                end = min(start + rng.randrange(1, 4), position + len(word))
+                offsets.append((start, end))
+                word_ids.append(word_id)
+                start = end
+            position += len(word) + 1
+        offsets.append((0, 0))
+        word_ids.append(None)
+        attention = [rng.random() for _ in offsets]
+
+        pooled_words, pooled_scores = pool_words(text, offsets, word_ids, attention)
+        expected_words, expected_scores = reference_pool_words(text, offsets, word_ids, attention)
+        assert pooled_words == expected_words == words
+        assert np.allclose(pooled_scores, expected_scores)
+
+
+def test_morpheme_scores_and_top_words():
+    morphemes = ['체험', '상담', '마음', '편안']
+    words = ['체험은', '상담', '마음이', '체험', '오늘', '상담사와', '편안해요']
+    scores = [0.75, 0.5, 0.5, 0.25, 0.9, 0.5, 0.5]
+
+    terms, sums, counts = morpheme_scores(words, scores, MorphemeIndex(morphemes))
+    assert list(terms) == ['마음', '상담', '체험', '편안']
+    assert np.allclose(sums, [0.5, 1.0, 1.0, 0.5])
+    assert list(counts) == [1, 2, 2, 1]
+
+    ranked = top_words(terms, sums, counts)
+    assert [term for term, _ in ranked] == ['마음', '상담', '체험', '편안']  # 모두 평균 0.5 → 형태소 순
+    assert np.allclose([score for _, score in ranked], [0.5] * 4)
+    assert top_words(terms, sums, counts, k=2) == ranked[:2]
+
+    terms, sums, counts = morpheme_scores(['오늘'], [1.0], MorphemeIndex(morphemes))
+    assert top_words(terms, sums, counts) == []
+
+
+def test_top_words_matches_reference():
+    rng = random.Random(1)
+    morphemes = ['체험', '상담', '마음', '편안', '불안', '적응']
+    for _ in range(20):
+        words = [rng.choice(morphemes + ['오늘', '정말']) + rng.choice(['', '은', '이', '해요'])
+                 for _ in range(rng.randrange(1, 40))]
+        scores = [round(rng.random(), 2) for _ in words]
+
+        terms, sums, counts = morpheme_scores(words, scores, MorphemeIndex(morphemes))
+        ranked = top_words(terms, sums, counts, k=4)
+        expected = reference_top_words(words, scores, morphemes, k=4)
+        assert [term for term, _ in ranked] == [term for term, _ in expected]
+        assert np.allclose([score for _, score in ranked], [score for _, score in expected])
+
+
+if __name__ == "__main__":
+    test_morpheme_index_align()
+    test_morphemes_of()
+    test_pool_words_merges_subwords()
+    test_pool_words_matches_reference()
+    test_morpheme_scores_and_top_words()
+    test_top_words_matches_reference()
+    print("✅ 단어 단위 Attention 집계 테스트 통과")
@@ -0,0 +1,88 @@
+"""
+단어 단위 Attention 집계 (4단계용)
+- fast 토크나이저의 word_ids / offset_mapping 으로 서브워드(##) Attention 을 원문 표층 단어(어절) 단위로 합침
+- 표층 단어를 2단계 형태소에 정렬: 해시 집합으로 가장 긴 접두사 형태소 조회 ('체험은' → '체험')
+- 형태소별 합계/등장 횟수는 NumPy 구간 연산 (np.add.reduceat, np.bincount) 으로 계산
+- 형태소별 결과는 (형태소, 점수 합, 등장 횟수) 로 보관하고 마지막에 평균
+"""
+
+import numpy as np
+
+from step2_morpheme_analysis import BUCKET_NAMES
+
+
+def morphemes_of(morpheme_data):
+    """형태소 결과의 전체 형태소 목록 (compact 형식이면 어휘표)"""
+    if 'vocabulary' in morpheme_data:
+        return morpheme_data['vocabulary']
+    return [word for bucket in BUCKET_NAMES for word in morpheme_data.get(f'all_{bucket}', [])]
+
+
+class MorphemeIndex:
+    """형태소 해시 집합 - 표층 단어를 형태소로 정렬"""
+
+    def __init__(self, morphemes):
+        self.morphemes = set(morphemes)
+        self.max_length = max((len(m) for m in self.morphemes), default=0)
+        self._aligned = {}
+
+    def align(self, word):
+        """단어와 같거나 단어의 가장 긴 접두사인 형태소 (없으면 None)"""
+        try:
+            return self._aligned[word]
+        except KeyError:
+            pass
+
+        morpheme = None
+        for length in range(min(len(word), self.max_length), 0, -1):
+            if word[:length] in self.morphemes:
+                morpheme = word[:length]
+                break
+        self._aligned[word] = morpheme
+        return morpheme
+
+
+def pool_words(text, offsets, word_ids, attention):
+    """
+    토큰별 Attention → 표층 단어별 Attention 합 (단어 목록, 점수 배열)
+    - offsets: [토큰 수, 2] 원문 문자 범위, word_ids: 토큰별 단어 번호 (특수 토큰/패딩은 None)
+    - 한 단어의 서브워드는 연속해 있으므로 단어 시작 위치에서 구간 합
+    """
+    word_ids = np.array([-1 if w is None else w for w in word_ids], dtype=np.int64)
+    keep = word_ids >= 0
+    if not keep.any():
+        return [], np.zeros(0, dtype=np.float64)
+
+    word_ids = word_ids[keep]
+    offsets = np.asarray(offsets)[keep]
+    attention = np.asarray(attention, dtype=np.float64)[keep]
+
+    starts = np.flatnonzero(np.r_[True, word_ids[1:] != word_ids[:-1]])
+    scores = np.add.reduceat(attention, starts)
+    char_starts = np.minimum.reduceat(offsets[:, 0], starts)
+    char_ends = np.maximum.reduceat(offsets[:, 1], starts)
+    return [text[s:e] for s, e in zip(char_starts.tolist(), char_ends.tolist())], scores
+
+
+def morpheme_scores(words, scores, index):
+    """표층 단어 점수를 형태소별로 모음 → (형태소 배열, 점수 합 배열, 등장 횟수 배열)"""
+    aligned = [index.align(word) for word in words]
+    keep = np.array([m is not None for m in aligned], dtype=bool)
+    if not keep.any():
+        return np.array([], dtype=object), np.zeros(0), np.zeros(0, dtype=np.int64)
+
+    terms, inverse = np.unique(np.array([m for m in aligned if m is not None], dtype=object),
+                               return_inverse=True)
+    sums = np.bincount(inverse, weights=np.asarray(scores, dtype=np.float64)[keep], minlength=len(terms))
+    counts = np.bincount(inverse, minlength=len(terms))
+    return terms, sums, counts
+
+
+def top_words(terms, sums, counts, k=30):
+    """평균 점수 내림차순 상위 k 개 [(형태소, 평균 점수)] (동점이면 형태소 순)"""
+    if not len(terms):
+        return []
+    means = sums / counts
+    # terms 는 np.unique 결과라 이미 정렬되어 있으므로 안정 정렬로 동점 순서 유지
+    order = np.argsort(-means, kind='stable')[:k]
+    return [(terms[i], float(means[i])) for i in order]